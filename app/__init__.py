@@ -5,26 +5,36 @@ Aplicação Flask profissional para agendamento de shows musicais.
 """
 import os
 import logging
+import threading
+import time
 from logging.handlers import RotatingFileHandler
 from flask import Flask, render_template
 from flask_moment import Moment
 from flask_migrate import Migrate
 
 from app.models import db
+from app.cache import (
+    init_cache, init_response_cache, init_cache_invalidation, init_singleflight, register_snapshot,
+    init_page_publisher, init_negative_cache, init_document_store, FragmentCacheExtension
+)
 from app.utils.formatters import format_datetime
+from app.utils.compression import init_compression
+from app.utils.json_provider import FastJSONProvider
 
 
-def create_app(config_name='development'):
+def create_app(config_name='development', warm_up=None):
     """
     Application factory pattern.
 
     Args:
         config_name: Configuration environment ('development', 'testing', 'production')
+        warm_up: Run the worker warm-up (default: WARMUP_ENABLED, never under the flask CLI)
 
     Returns:
         Configured Flask application
     """
     app = Flask(__name__, template_folder='../templates', static_folder='../static')
+    app.json = FastJSONProvider(app)
     
     # Load configuration
     app.config.from_object(f'config.{config_name.capitalize()}Config')
@@ -33,6 +43,12 @@ def create_app(config_name='development'):
     db.init_app(app)
     migrate = Migrate(app, db, directory='migrations')
     moment = Moment(app)
+    init_cache(app)
+    init_response_cache(app)
+    init_cache_invalidation(app)
+    init_singleflight(app)
+    init_negative_cache(app)
+    init_compression(app)
     
     # Register blueprints
     register_blueprints(app)
@@ -40,12 +56,31 @@ def create_app(config_name='development'):
     # Register error handlers
     register_error_handlers(app)
     
+    # Register background-refreshed data snapshots
+    register_snapshots(app)
+    init_page_publisher(app)
+    init_document_store(app)
+    
+    # Register periodic maintenance
+    register_background_tasks(app)
+    
     # Register filters
     register_filters(app)
     
+    # Register CLI commands
+    from scripts.db_utils import register_commands
+    register_commands(app)
+    
     # Setup logging
     setup_logging(app)
     
+    # Pay first-request costs at boot
+    if warm_up is None:
+        warm_up = app.config.get('WARMUP_ENABLED', False) and os.environ.get('FLASK_RUN_FROM_CLI') != 'true'
+    if warm_up:
+        from app.warmup import warm_up as run_warm_up
+        run_warm_up(app)
+    
     return app
 
 
@@ -73,9 +108,54 @@ def register_error_handlers(app):
         return render_template('errors/500.html'), 500
 
 
+def register_snapshots(app):
+    """Register data snapshots served from memory."""
+    from app.services import HomepageService
+    
+    if app.config.get('HOMEPAGE_SNAPSHOT_ENABLED', False):
+        register_snapshot(
+            app,
+            'homepage',
+            lambda: HomepageService().get_homepage_data(),
+            tags=('venues:list', 'artists:list', 'shows:list'),
+            max_age=app.config.get('HOMEPAGE_SNAPSHOT_MAX_AGE', 60),
+            empty=HomepageService.EMPTY
+        )
+
+
+def register_background_tasks(app):
+    """Start periodic maintenance threads with the first request (never in CLI runs)."""
+    interval = app.config.get('SHOW_AGGREGATE_SWEEP_INTERVAL', 0)
+    if not interval:
+        return
+    
+    started = threading.Event()
+    lock = threading.Lock()
+    
+    def sweep_forever():
+        from app.services import ShowService
+        while True:
+            try:
+                with app.app_context():
+                    ShowService().sweep_show_aggregates()
+            except Exception:
+                app.logger.exception('Show aggregate sweep failed')
+            time.sleep(interval)
+    
+    @app.before_request
+    def start_background_tasks():
+        if started.is_set():
+            return
+        with lock:
+            if not started.is_set():
+                started.set()
+                threading.Thread(target=sweep_forever, name='show-aggregate-sweeper', daemon=True).start()
+
+
 def register_filters(app):
     """Register Jinja2 filters."""
     app.jinja_env.filters['datetime'] = format_datetime
+    app.jinja_env.add_extension(FragmentCacheExtension)
 
 
 def setup_logging(app):
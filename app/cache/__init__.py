@@ -0,0 +1,117 @@
+"""
+Caching package for Fyyur application.
+"""
+from app.cache.lru import LRUCache
+from app.cache.backends import (
+    CacheBackend,
+    MemoryBackend,
+    SQLiteBackend,
+    TieredCache,
+    create_cache_backend,
+    get_cache,
+    init_cache
+)
+from app.cache.response_cache import (
+    ResponseCache,
+    CachedResponse,
+    cached_response,
+    compute_etag,
+    get_response_cache,
+    init_response_cache
+)
+from app.cache.conditional import conditional_response, is_not_modified, last_modified
+from app.cache.singleflight import (
+    MemoEntry,
+    SingleFlight,
+    coalesced,
+    get_singleflight,
+    init_singleflight,
+    should_refresh_early
+)
+from app.cache.fragments import FragmentCacheExtension, fragment_key
+from app.cache.pages import (
+    PAGE_KINDS,
+    PagePublisher,
+    PublishedPage,
+    get_page_publisher,
+    init_page_publisher,
+    publish_all
+)
+from app.cache.negative import (
+    NegativeCache,
+    get_negative_cache,
+    init_negative_cache,
+    is_known_missing,
+    remember_missing
+)
+from app.cache.documents import (
+    DOCUMENT_KINDS,
+    DocumentStore,
+    StoredDocument,
+    get_document_store,
+    init_document_store
+)
+from app.cache.snapshot import Snapshot, get_snapshot, register_snapshot
+from app.cache.invalidation import (
+    CACHE_DEPENDENCIES,
+    CacheInvalidator,
+    ChangeSet,
+    DependencyRule,
+    Related,
+    get_cache_invalidator,
+    init_cache_invalidation
+)
+
+__all__ = [
+    'LRUCache',
+    'CacheBackend',
+    'MemoryBackend',
+    'SQLiteBackend',
+    'TieredCache',
+    'create_cache_backend',
+    'get_cache',
+    'init_cache',
+    'ResponseCache',
+    'CachedResponse',
+    'cached_response',
+    'compute_etag',
+    'get_response_cache',
+    'init_response_cache',
+    'conditional_response',
+    'is_not_modified',
+    'last_modified',
+    'MemoEntry',
+    'SingleFlight',
+    'coalesced',
+    'get_singleflight',
+    'init_singleflight',
+    'should_refresh_early',
+    'FragmentCacheExtension',
+    'fragment_key',
+    'PAGE_KINDS',
+    'PagePublisher',
+    'PublishedPage',
+    'get_page_publisher',
+    'init_page_publisher',
+    'publish_all',
+    'NegativeCache',
+    'get_negative_cache',
+    'init_negative_cache',
+    'is_known_missing',
+    'remember_missing',
+    'DOCUMENT_KINDS',
+    'DocumentStore',
+    'StoredDocument',
+    'get_document_store',
+    'init_document_store',
+    'Snapshot',
+    'get_snapshot',
+    'register_snapshot',
+    'CACHE_DEPENDENCIES',
+    'CacheInvalidator',
+    'ChangeSet',
+    'DependencyRule',
+    'Related',
+    'get_cache_invalidator',
+    'init_cache_invalidation'
+]
@@ -0,0 +1,441 @@
+"""
+Cache storage backends.
+
+Every backend stores opaque values under string keys with an optional TTL and
+a set of tags. Tags are the invalidation unit: commit-driven invalidation
+evicts by the same names the dependency rules produce (e.g. 'artists:list').
+
+- MemoryBackend: per-process LRU, the fastest but private to one worker.
+- SQLiteBackend: a local SQLite file in WAL mode shared by every worker
+  process on the host, with TTL and size-bounded LRU eviction. Values are
+  pickled, so the file must be private to the app's user: it defaults to
+  the instance folder, is created 0600 and is refused when another user
+  owns it or can write to it. Each payload also carries an HMAC keyed by
+  the app's SECRET_KEY and is never unpickled when that does not match.
+- TieredCache: a MemoryBackend L1 in front of a shared L2, reporting hit
+  ratios per layer.
+"""
+import hashlib
+import hmac
+import os
+import pickle
+import sqlite3
+import stat
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional, Set, Union
+
+from flask import current_app
+
+from app.cache.lru import LRUCache
+
+
+class CacheBackend:
+    """Interface shared by all cache backends."""
+    
+    def get(self, key: str) -> Optional[Any]:
+        """Return the stored value or None."""
+        raise NotImplementedError
+    
+    def set(self, key: str, value: Any, ttl: Optional[float] = None, tags: Iterable[str] = ()) -> None:
+        """Store a value; ttl=None uses the backend default, ttl=0 never expires."""
+        raise NotImplementedError
+    
+    def delete(self, key: str) -> bool:
+        """Remove one key; returns True if it was present."""
+        raise NotImplementedError
+    
+    def invalidate_tags(self, tags: Iterable[str]) -> int:
+        """Remove every key carrying any of the tags; returns how many were removed."""
+        raise NotImplementedError
+    
+    def clear(self) -> None:
+        """Remove every entry."""
+        raise NotImplementedError
+    
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and size."""
+        raise NotImplementedError
+
+
+class MemoryBackend(CacheBackend):
+    """Per-process backend built on LRUCache."""
+    
+    def __init__(self, max_entries: int = 1024, default_ttl: Optional[float] = 300):
+        self.store = LRUCache(max_entries=max_entries, default_ttl=default_ttl)
+        self._tags: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+    
+    def get(self, key: str) -> Optional[Any]:
+        return self.store.get(key)
+    
+    def set(self, key: str, value: Any, ttl: Optional[float] = None, tags: Iterable[str] = ()) -> None:
+        self.store.set(key, value, ttl=ttl)
+        if tags:
+            with self._lock:
+                for tag in tags:
+                    self._tags.setdefault(tag, set()).add(key)
+                # Drop index entries for keys the LRU has already evicted
+                if sum(len(keys) for keys in self._tags.values()) > 4 * self.store.max_entries:
+                    live = set(self.store.keys())
+                    self._tags = {
+                        tag: keys & live for tag, keys in self._tags.items() if keys & live
+                    }
+    
+    def delete(self, key: str) -> bool:
+        return self.store.delete(key)
+    
+    def invalidate_tags(self, tags: Iterable[str]) -> int:
+        with self._lock:
+            doomed = set()
+            for tag in tags:
+                doomed |= self._tags.pop(tag, set())
+        return sum(1 for key in doomed if self.store.delete(key))
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._tags.clear()
+        self.store.clear()
+    
+    def stats(self) -> Dict[str, Any]:
+        return {'backend': 'memory', **self.store.stats()}
+
+
+_SIGNATURE_SIZE = hashlib.sha256().digest_size
+
+
+class SQLiteBackend(CacheBackend):
+    """
+    Host-local backend shared across worker processes through one SQLite file.
+
+    WAL mode lets readers proceed while a writer commits; every operation is a
+    single statement or a short IMMEDIATE transaction, so get/set are atomic
+    across processes. Recency is tracked in `accessed_at` (refreshed at most
+    once per second per entry) and the least recently used entries are
+    pruned once the table grows past `max_entries`. Payloads are pickled and
+    HMAC-signed with `secret`; anything failing the check is never unpickled,
+    so every worker sharing the file needs the same secret.
+    """
+    
+    _SCHEMA = (
+        'CREATE TABLE IF NOT EXISTS cache_entries ('
+        ' key TEXT PRIMARY KEY, value BLOB NOT NULL,'
+        ' expires_at REAL, accessed_at REAL NOT NULL)',
+        'CREATE INDEX IF NOT EXISTS idx_cache_entries_accessed ON cache_entries (accessed_at)',
+        'CREATE TABLE IF NOT EXISTS cache_tags ('
+        ' tag TEXT NOT NULL, key TEXT NOT NULL, PRIMARY KEY (tag, key))',
+        'CREATE INDEX IF NOT EXISTS idx_cache_tags_key ON cache_tags (key)',
+        'CREATE TABLE IF NOT EXISTS cache_meta (name TEXT PRIMARY KEY, value INTEGER NOT NULL)',
+        "INSERT OR IGNORE INTO cache_meta (name, value) VALUES ('generation', 0)",
+    )
+    PRUNE_EVERY = 64
+    
+    def __init__(self, path: str, secret: Union[str, bytes], max_entries: int = 10000,
+                 default_ttl: Optional[float] = 300):
+        if not secret:
+            raise ValueError("SQLiteBackend needs a secret to sign its entries")
+        self.path = path
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._sets_since_prune = 0
+        self._local = threading.local()
+        self._secret = secret.encode() if isinstance(secret, str) else secret
+        
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        try:
+            os.close(os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o600))
+        except FileExistsError:
+            pass
+        for existing in (path, f'{path}-wal', f'{path}-shm'):
+            self._check_private(existing)
+        connection = self._connection()
+        for statement in self._SCHEMA:
+            connection.execute(statement)
+    
+    @staticmethod
+    def _check_private(path: str) -> None:
+        """Refuse a cache file another local user could have written (it is unpickled)."""
+        try:
+            info = os.lstat(path)
+        except FileNotFoundError:
+            return
+        if not stat.S_ISREG(info.st_mode):
+            raise PermissionError(f"Cache file {path} is not a regular file")
+        if hasattr(os, 'geteuid') and info.st_uid != os.geteuid():
+            raise PermissionError(f"Cache file {path} is owned by another user")
+        if info.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+            raise PermissionError(f"Cache file {path} is writable by other users")
+    
+    def _sign(self, payload: bytes) -> bytes:
+        return hmac.new(self._secret, payload, hashlib.sha256).digest()
+    
+    def _connection(self) -> sqlite3.Connection:
+        # One connection per thread, reopened after a fork (e.g. gunicorn --preload)
+        connection = getattr(self._local, 'connection', None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+    
+    def get(self, key: str) -> Optional[Any]:
+        now = time.time()
+        connection = self._connection()
+        row = connection.execute(
+            'SELECT value, expires_at, accessed_at FROM cache_entries WHERE key = ?', (key,)
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        
+        value, expires_at, accessed_at = row
+        if expires_at is not None and expires_at <= now:
+            connection.execute('DELETE FROM cache_entries WHERE key = ? AND expires_at <= ?', (key, now))
+            self.misses += 1
+            return None
+        
+        signature, payload = value[:_SIGNATURE_SIZE], value[_SIGNATURE_SIZE:]
+        if not hmac.compare_digest(signature, self._sign(payload)):
+            # Written under another SECRET_KEY (or not by this app): never unpickle it
+            connection.execute('DELETE FROM cache_entries WHERE key = ?', (key,))
+            self.misses += 1
+            return None
+        
+        if now - accessed_at > 1:
+            connection.execute('UPDATE cache_entries SET accessed_at = ? WHERE key = ?', (now, key))
+        self.hits += 1
+        return pickle.loads(payload)
+    
+    def set(self, key: str, value: Any, ttl: Optional[float] = None, tags: Iterable[str] = ()) -> None:
+        now = time.time()
+        ttl = self.default_ttl if ttl is None else ttl
+        expires_at = now + ttl if ttl else None
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        payload = self._sign(payload) + payload
+        
+        connection = self._connection()
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            connection.execute(
+                'INSERT OR REPLACE INTO cache_entries (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)',
+                (key, payload, expires_at, now)
+            )
+            connection.executemany(
+                'INSERT OR IGNORE INTO cache_tags (tag, key) VALUES (?, ?)',
+                [(tag, key) for tag in tags]
+            )
+            connection.execute('COMMIT')
+        except Exception:
+            connection.execute('ROLLBACK')
+            raise
+        
+        self._sets_since_prune += 1
+        if self._sets_since_prune >= self.PRUNE_EVERY:
+            self._sets_since_prune = 0
+            self.prune()
+    
+    def prune(self) -> int:
+        """Drop expired entries, then least recently used ones beyond max_entries."""
+        connection = self._connection()
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            removed = connection.execute(
+                'DELETE FROM cache_entries WHERE expires_at IS NOT NULL AND expires_at <= ?', (time.time(),)
+            ).rowcount
+            excess = connection.execute('SELECT COUNT(*) FROM cache_entries').fetchone()[0] - self.max_entries
+            if excess > 0:
+                removed += connection.execute(
+                    'DELETE FROM cache_entries WHERE key IN '
+                    '(SELECT key FROM cache_entries ORDER BY accessed_at LIMIT ?)', (excess,)
+                ).rowcount
+                self.evictions += excess
+            connection.execute('DELETE FROM cache_tags WHERE key NOT IN (SELECT key FROM cache_entries)')
+            connection.execute('COMMIT')
+        except Exception:
+            connection.execute('ROLLBACK')
+            raise
+        return removed
+    
+    def delete(self, key: str) -> bool:
+        connection = self._connection()
+        return connection.execute('DELETE FROM cache_entries WHERE key = ?', (key,)).rowcount > 0
+    
+    def invalidate_tags(self, tags: Iterable[str]) -> int:
+        tags = list(tags)
+        if not tags:
+            return 0
+        placeholders = ', '.join('?' for _ in tags)
+        connection = self._connection()
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            removed = connection.execute(
+                f'DELETE FROM cache_entries WHERE key IN '
+                f'(SELECT key FROM cache_tags WHERE tag IN ({placeholders}))', tags
+            ).rowcount
+            connection.execute(f'DELETE FROM cache_tags WHERE tag IN ({placeholders})', tags)
+            connection.execute("UPDATE cache_meta SET value = value + 1 WHERE name = 'generation'")
+            connection.execute('COMMIT')
+        except Exception:
+            connection.execute('ROLLBACK')
+            raise
+        return removed
+    
+    def generation(self) -> int:
+        """Counter bumped on every invalidation, used by L1 caches to detect remote evictions."""
+        row = self._connection().execute("SELECT value FROM cache_meta WHERE name = 'generation'").fetchone()
+        return row[0] if row else 0
+    
+    def clear(self) -> None:
+        connection = self._connection()
+        connection.execute('BEGIN IMMEDIATE')
+        connection.execute('DELETE FROM cache_entries')
+        connection.execute('DELETE FROM cache_tags')
+        connection.execute("UPDATE cache_meta SET value = value + 1 WHERE name = 'generation'")
+        connection.execute('COMMIT')
+    
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        size = self._connection().execute('SELECT COUNT(*) FROM cache_entries').fetchone()[0]
+        return {
+            'backend': 'sqlite',
+            'path': self.path,
+            'size': size,
+            'max_entries': self.max_entries,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0,
+            'evictions': self.evictions
+        }
+
+
+class TieredCache(CacheBackend):
+    """
+    In-process L1 in front of a shared L2.
+
+    Other workers' invalidations only reach the shared L2, so the L1 polls
+    the L2 generation counter (at most every `sync_interval` seconds) and
+    drops everything when it has moved. L1 entries also carry a short TTL.
+    """
+    
+    def __init__(self, l1: MemoryBackend, l2: CacheBackend, l1_ttl: float = 5, sync_interval: float = 0.5):
+        self.l1 = l1
+        self.l2 = l2
+        self.l1_ttl = l1_ttl
+        self.sync_interval = sync_interval
+        self._generation = self._l2_generation()
+        self._synced_at = time.monotonic()
+        self.hits = 0
+        self.misses = 0
+    
+    def _l2_generation(self) -> Optional[int]:
+        generation = getattr(self.l2, 'generation', None)
+        return generation() if generation else None
+    
+    def generation(self) -> Optional[int]:
+        """The shared L2's invalidation counter."""
+        return self._l2_generation()
+    
+    def _sync(self) -> None:
+        now = time.monotonic()
+        if now - self._synced_at < self.sync_interval:
+            return
+        self._synced_at = now
+        generation = self._l2_generation()
+        if generation != self._generation:
+            self._generation = generation
+            self.l1.clear()
+    
+    def get(self, key: str) -> Optional[Any]:
+        self._sync()
+        value = self.l1.get(key)
+        if value is None:
+            value = self.l2.get(key)
+            if value is not None:
+                self.l1.set(key, value, ttl=self.l1_ttl)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+    
+    def set(self, key: str, value: Any, ttl: Optional[float] = None, tags: Iterable[str] = ()) -> None:
+        self.l2.set(key, value, ttl=ttl, tags=tags)
+        l1_ttl = min(ttl, self.l1_ttl) if ttl else self.l1_ttl
+        self.l1.set(key, value, ttl=l1_ttl, tags=tags)
+    
+    def delete(self, key: str) -> bool:
+        removed_l1 = self.l1.delete(key)
+        return self.l2.delete(key) or removed_l1
+    
+    def invalidate_tags(self, tags: Iterable[str]) -> int:
+        tags = list(tags)
+        self.l1.invalidate_tags(tags)
+        removed = self.l2.invalidate_tags(tags)
+        self._generation = self._l2_generation()
+        return removed
+    
+    def clear(self) -> None:
+        self.l1.clear()
+        self.l2.clear()
+        self._generation = self._l2_generation()
+    
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        l1 = self.l1.stats()
+        return {
+            'backend': 'tiered',
+            'size': l1['size'],
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0,
+            'l1': l1,
+            'l2': self.l2.stats()
+        }
+
+
+def create_cache_backend(config, instance_path: Optional[str] = None) -> CacheBackend:
+    """Build the backend selected by CACHE_BACKEND ('memory' or 'sqlite')."""
+    backend = config.get('CACHE_BACKEND', 'memory')
+    l1 = MemoryBackend(
+        max_entries=config.get('CACHE_L1_MAX_ENTRIES', 1024),
+        default_ttl=config.get('CACHE_DEFAULT_TTL', 300)
+    )
+    if backend == 'memory':
+        return l1
+    if backend == 'sqlite':
+        path = config.get('CACHE_SQLITE_PATH')
+        if not path:
+            if instance_path is None:
+                raise ValueError("CACHE_SQLITE_PATH is required when no instance folder is given")
+            path = os.path.join(instance_path, 'fyyur_cache.sqlite3')
+        secret = config.get('SECRET_KEY')
+        if not secret or config.get('SECRET_KEY_IS_EPHEMERAL', False):
+            # A per-process random key: each worker would reject (and delete) the others' entries
+            raise ValueError("CACHE_BACKEND='sqlite' needs SECRET_KEY set in the environment, "
+                             "shared by every worker")
+        l2 = SQLiteBackend(
+            path=path,
+            secret=secret,
+            max_entries=config.get('CACHE_MAX_ENTRIES', 10000),
+            default_ttl=config.get('CACHE_DEFAULT_TTL', 300)
+        )
+        return TieredCache(l1, l2, l1_ttl=config.get('CACHE_L1_TTL', 5))
+    raise ValueError(f"Unknown CACHE_BACKEND: {backend}")
+
+
+def init_cache(app) -> CacheBackend:
+    """Create the app-wide cache backend shared by every caching layer."""
+    backend = create_cache_backend(app.config, app.instance_path)
+    app.extensions['cache'] = backend
+    return backend
+
+
+def get_cache() -> Optional[CacheBackend]:
+    """Return the current app's cache backend, if installed."""
+    return current_app.extensions.get('cache')
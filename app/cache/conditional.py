@@ -0,0 +1,87 @@
+"""
+Last-Modified / If-Modified-Since for the artist, venue and show detail routes.
+
+A view decorated with `last_modified(loader)` first asks the loader when its
+entity last changed; the detail services answer from one small indexed query
+over updated_at (see BaseRepository.latest_change). A request whose
+If-Modified-Since is not older gets a 304 without running the view, and
+successful responses carry Last-Modified.
+
+HTTP dates have one-second resolution, so Last-Modified is only sent once
+the second of the last change is over: a second write within that second
+would otherwise be hidden behind an equal date. If-None-Match takes
+precedence when both validators are sent, as RFC 9110 requires. Pages
+carrying flashed messages are never answered with a 304.
+"""
+from datetime import datetime, timezone
+from functools import wraps
+from typing import Any, Callable, Optional
+
+from flask import current_app, make_response, request, session, Response
+
+from app.exceptions import FyyurException
+
+
+def _as_http_date(stamp: datetime) -> datetime:
+    """A UTC timestamp (naive or aware) truncated to what an HTTP date can express."""
+    return stamp.replace(microsecond=0, tzinfo=timezone.utc)
+
+
+def is_not_modified(stamp: Optional[datetime]) -> bool:
+    """True when the request's If-Modified-Since covers `stamp` (and no If-None-Match was sent)."""
+    since = request.if_modified_since
+    if stamp is None or since is None or request.if_none_match:
+        return False
+    return _as_http_date(stamp) <= since
+
+
+def _has_flashes() -> bool:
+    # Only read the session when the client sent one: reading it adds Vary: Cookie
+    return current_app.config['SESSION_COOKIE_NAME'] in request.cookies and bool(session.get('_flashes'))
+
+
+def conditional_response(stamp: Optional[datetime], build: Callable[[], Any]) -> Response:
+    """
+    Answer with a 304 when If-Modified-Since covers `stamp`, else with `build()` and Last-Modified.
+
+    For views that know their stamp without a query (see PagePublisher.respond).
+    """
+    if not current_app.config.get('CONDITIONAL_GET_ENABLED', True):
+        return make_response(build())
+    if stamp is None or stamp >= datetime.utcnow().replace(microsecond=0):
+        return make_response(build())
+    
+    if is_not_modified(stamp):
+        response = Response(status=304)
+    else:
+        response = make_response(build())
+        if response.status_code not in (200, 304):
+            return response
+    response.last_modified = _as_http_date(stamp)
+    return response
+
+
+def last_modified(loader: Callable[..., Optional[datetime]]) -> Callable:
+    """
+    Answer conditional GETs of a detail view from `loader(**view_args)`.
+
+    The loader returns the naive UTC time the entity last changed, or None
+    when it does not exist (the view then runs and reports it); loaders
+    answer known-missing ids from the negative cache without a query. Stack
+    it under cached_response, which stores Last-Modified with the body.
+    """
+    def decorator(view: Callable) -> Callable:
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if not current_app.config.get('CONDITIONAL_GET_ENABLED', True) or _has_flashes():
+                return view(*args, **kwargs)
+            try:
+                stamp = loader(**kwargs)
+            except FyyurException:
+                # The view hits the same error and reports it
+                return view(*args, **kwargs)
+            if stamp is None:
+                return view(*args, **kwargs)
+            return conditional_response(stamp, lambda: view(*args, **kwargs))
+        return wrapper
+    return decorator
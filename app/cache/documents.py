@@ -0,0 +1,224 @@
+"""
+Read-model documents for the artist and venue JSON API.
+
+The `read_documents` table holds the serialized response body of every
+artist and venue. `/artists/api/<id>` and `/venues/api/<id>` answer from it
+with one primary-key lookup, returning the stored bytes without touching the
+ORM graph or Pydantic. Each document carries a version stamp (bumped on every
+rebuild, sent as X-Document-Version) and the entity's updated_at, so
+consumers can check which state they were given.
+
+Committed writes re-render the affected documents on a background thread.
+Until that finishes a reader may get the previous version; a document whose
+next upcoming show has started is treated as missing. `flask
+rebuild-read-model` rebuilds the whole table.
+"""
+import queue
+import re
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterable, NamedTuple, Optional, Tuple
+
+from flask import current_app, Response
+from sqlalchemy import or_, select
+from sqlalchemy.exc import IntegrityError
+
+from app.cache.backends import get_cache
+from app.cache.invalidation import ChangeSet
+from app.cache.negative import is_known_missing
+from app.models import db, ReadDocument
+
+# kind -> (negative cache entity, service method producing the response schema)
+DOCUMENT_KINDS = {
+    'artists': ('artist', 'build_artist_response'),
+    'venues': ('venue', 'build_venue_response'),
+}
+
+_DETAIL_KEY = re.compile(r'^(artists|venues):detail:(\d+)$')
+
+
+class StoredDocument(NamedTuple):
+    """The served columns of one read-model row."""
+    body: bytes
+    version: int
+    source_updated_at: Optional[datetime]
+
+
+class DocumentStore:
+    """Builds, stores and serves read-model documents for one app."""
+    
+    def __init__(self, app):
+        self.app = app
+        self._queue: "queue.Queue[Tuple[str, int]]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        
+        self.served = 0
+        self.misses = 0
+        self.built = 0
+        self.removed = 0
+        self.errors = 0
+    
+    def read(self, kind: str, entity_id: int) -> Optional[StoredDocument]:
+        """Return the current document, or None when it must be built."""
+        if is_known_missing(DOCUMENT_KINDS[kind][0], entity_id):
+            # The live path answers the 404 from the negative cache, without any query
+            self.misses += 1
+            return None
+        row = db.session.execute(
+            select(ReadDocument.body, ReadDocument.version, ReadDocument.source_updated_at)
+            .where(
+                ReadDocument.kind == kind,
+                ReadDocument.entity_id == entity_id,
+                or_(ReadDocument.expires_at.is_(None), ReadDocument.expires_at > datetime.utcnow())
+            )
+        ).first()
+        if row is None:
+            self.misses += 1
+            return None
+        self.served += 1
+        return StoredDocument(*row)
+    
+    @staticmethod
+    def respond(document: StoredDocument) -> Response:
+        """Serve a stored document as-is."""
+        response = Response(document.body, mimetype='application/json')
+        # The same URL answers MessagePack clients from the live path
+        response.vary.add('Accept')
+        response.headers['X-Document-Version'] = str(document.version)
+        if document.source_updated_at is not None:
+            response.headers['X-Document-Source-Updated'] = document.source_updated_at.isoformat()
+        return response
+    
+    def render(self, kind: str, entity_id: int) -> Optional[Tuple[bytes, Any, Optional[datetime]]]:
+        """Serialize a document exactly as the live API would; None if the entity is gone."""
+        from app.services import ArtistService, VenueService
+        
+        # Built from the repositories: a memoized response may predate the commit
+        service = ArtistService() if kind == 'artists' else VenueService()
+        response = getattr(service, DOCUMENT_KINDS[kind][1])(entity_id)
+        if response is None:
+            return None
+        
+        # Same bytes jsonify() produces, so the stored and live bodies (and ETags) match
+        body = current_app.json.json_response(response.model_dump(mode='json')).get_data()
+        starts = [show.start_time for show in response.upcoming_shows]
+        return body, response.updated_at, min(starts) if starts else None
+    
+    def build(self, kind: str, entity_id: int) -> bool:
+        """Render and store one document; returns False if the entity no longer exists."""
+        rendered = self.render(kind, entity_id)
+        document = db.session.get(ReadDocument, (kind, entity_id))
+        if rendered is None:
+            if document is not None:
+                db.session.delete(document)
+                db.session.commit()
+                self.removed += 1
+            return False
+        
+        body, source_updated_at, expires_at = rendered
+        if document is None:
+            document = ReadDocument(kind=kind, entity_id=entity_id, version=0)
+            db.session.add(document)
+        document.body = body
+        document.version += 1
+        document.source_updated_at = source_updated_at
+        document.expires_at = expires_at
+        document.built_at = datetime.utcnow()
+        try:
+            db.session.commit()
+        except IntegrityError:
+            # Another worker inserted it first; its copy is at least as new
+            db.session.rollback()
+            return True
+        self.built += 1
+        
+        # Cached API responses may hold the body this build replaced
+        cache = get_cache()
+        if cache is not None:
+            cache.invalidate_tags([f'{kind}:detail:{entity_id}'])
+        return True
+    
+    def schedule(self, documents: Iterable[Tuple[str, int]]) -> None:
+        """Rebuild documents on the background worker."""
+        documents = list(documents)
+        if not documents:
+            return
+        for document in documents:
+            self._queue.put(document)
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._work, name='read-model', daemon=True)
+                self._worker.start()
+    
+    def _work(self) -> None:
+        while True:
+            try:
+                kind, entity_id = self._queue.get(timeout=5)
+            except queue.Empty:
+                return
+            try:
+                with self.app.app_context():
+                    self.build(kind, entity_id)
+            except Exception:
+                self.errors += 1
+                self.app.logger.exception('Building %s document %s failed', kind, entity_id)
+            finally:
+                self._queue.task_done()
+    
+    def wait(self) -> None:
+        """Block until every scheduled document has been rebuilt."""
+        self._queue.join()
+    
+    def rebuild_all(self) -> Dict[str, int]:
+        """Rebuild every document synchronously and drop rows of deleted entities."""
+        from app.models import Artist, Venue
+        
+        counts = {}
+        for kind, model in (('artists', Artist), ('venues', Venue)):
+            ReadDocument.query.filter(
+                ReadDocument.kind == kind, ReadDocument.entity_id.notin_(select(model.id))
+            ).delete(synchronize_session=False)
+            db.session.commit()
+            ids = [entity_id for (entity_id,) in db.session.execute(select(model.id).order_by(model.id))]
+            counts[kind] = sum(1 for entity_id in ids if self.build(kind, entity_id))
+        return counts
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'served': self.served,
+            'misses': self.misses,
+            'built': self.built,
+            'removed': self.removed,
+            'errors': self.errors,
+            'queued': self._queue.qsize()
+        }
+
+
+def init_document_store(app) -> Optional[DocumentStore]:
+    """Serve the detail API from the read model when READ_MODEL_ENABLED is set."""
+    if not app.config.get('READ_MODEL_ENABLED', False):
+        app.extensions['document_store'] = None
+        return None
+    
+    store = DocumentStore(app)
+    app.extensions['document_store'] = store
+    invalidator = app.extensions.get('cache_invalidation')
+    if invalidator is not None:
+        invalidator.subscribe(_rebuild_documents)
+    return store
+
+
+def get_document_store() -> Optional[DocumentStore]:
+    """Return the current app's document store, or None when the read model is off."""
+    return current_app.extensions.get('document_store')
+
+
+def _rebuild_documents(change_set: ChangeSet) -> None:
+    store = current_app.extensions.get('document_store')
+    if store is None:
+        return
+    store.schedule([
+        (match.group(1), int(match.group(2)))
+        for match in map(_DETAIL_KEY.match, change_set.keys) if match
+    ])
@@ -0,0 +1,79 @@
+"""
+Jinja fragment caching.
+
+`{% cache key, ttl[, tags] %} ... {% endcache %}` stores the rendered HTML of
+the enclosed block in the app cache backend. The key is usually a tuple that
+includes the entity id and `updated_at`, so an edited entity naturally misses;
+tags (commit-invalidation keys such as 'venues:detail:3') evict fragments
+whose content depends on other rows, like a venue's show tiles. A key of
+None renders the block without caching it, e.g. for a page rendered with
+placeholder data after a database error.
+
+    {% cache ('venue-shows', venue.id, venue.updated_at), 300, ['venues:detail:' ~ venue.id] %}
+        ...
+    {% endcache %}
+"""
+from typing import Any, Dict, Iterable, Optional
+
+from flask import current_app, has_app_context
+from jinja2 import nodes
+from jinja2.ext import Extension
+from markupsafe import Markup
+
+from app.cache.backends import get_cache
+
+
+def fragment_key(key: Any) -> str:
+    """Storage key for a fragment key expression (a string or a tuple of parts)."""
+    if isinstance(key, (tuple, list)):
+        key = ':'.join(str(part) for part in key)
+    return f'fragment:{key}'
+
+
+class FragmentCacheExtension(Extension):
+    """Adds the `{% cache %}` block tag."""
+    
+    tags = {'cache'}
+    
+    def __init__(self, environment):
+        super().__init__(environment)
+        self.hits = 0
+        self.misses = 0
+    
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+        args = [parser.parse_expression()]
+        for _ in range(2):
+            if parser.stream.skip_if('comma'):
+                args.append(parser.parse_expression())
+            else:
+                args.append(nodes.Const(None))
+        
+        body = parser.parse_statements(('name:endcache',), drop_needle=True)
+        return nodes.CallBlock(self.call_method('_render', args), [], [], body).set_lineno(lineno)
+    
+    def _render(self, key: Any, ttl: Optional[float], tags: Optional[Iterable[str]], caller) -> str:
+        if not has_app_context() or not current_app.config.get('FRAGMENT_CACHE_ENABLED', False):
+            return caller()
+        cache = get_cache()
+        if cache is None or key is None:
+            return caller()
+        
+        storage_key = fragment_key(key)
+        html = cache.get(storage_key)
+        if html is not None:
+            self.hits += 1
+            return Markup(html)
+        
+        self.misses += 1
+        rendered = caller()
+        cache.set(storage_key, str(rendered), ttl=ttl, tags=tuple(tags or ()))
+        return rendered
+    
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0
+        }
@@ -0,0 +1,232 @@
+"""
+Commit-driven cache invalidation.
+
+Listeners on the shared ``db`` session collect what changed during each flush
+(Artist/Venue/Show/Genre identities and genre association edits) and turn it
+into cache keys using the declarative ``CACHE_DEPENDENCIES`` rules below.
+The collected keys are dispatched to subscribers only after the transaction
+commits; a rollback discards them.
+"""
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from flask import current_app, has_app_context
+from sqlalchemy import event, inspect, select
+
+from app.models import db, Artist, Venue, Show, Genre, artist_genres, venue_genres
+
+PENDING_KEY = 'pending_cache_invalidation'
+
+
+@dataclass(frozen=True)
+class Related:
+    """
+    Cache keys of entities linked to a changed instance.
+
+    Either read the related id from an attribute of the instance (``attribute``)
+    or look it up through a link table (``through``, matching ``local_column``
+    against the instance id and collecting ``remote_column``).
+    """
+    key: str
+    attribute: Optional[str] = None
+    through: Optional[object] = None
+    local_column: Optional[str] = None
+    remote_column: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class DependencyRule:
+    """What to evict when an instance of a model changes."""
+    kind: str
+    detail: str
+    collections: Tuple[str, ...] = ()
+    related: Tuple[Related, ...] = ()
+
+
+_SHOW_LISTS = ('shows:list', 'shows:upcoming', 'shows:past', 'shows:statistics')
+
+CACHE_DEPENDENCIES: Dict[type, DependencyRule] = {
+    Artist: DependencyRule(
+        kind='artist',
+        detail='artists:detail:{id}',
+        collections=('artists:list', 'stats') + _SHOW_LISTS,
+        related=(
+            Related('venues:detail:{id}', through=Show.__table__, local_column='artist_id', remote_column='venue_id'),
+            Related('shows:detail:{id}', through=Show.__table__, local_column='artist_id', remote_column='id'),
+        )
+    ),
+    Venue: DependencyRule(
+        kind='venue',
+        detail='venues:detail:{id}',
+        collections=('venues:list', 'venues:areas', 'venues:nearby', 'stats') + _SHOW_LISTS,
+        related=(
+            Related('artists:detail:{id}', through=Show.__table__, local_column='venue_id', remote_column='artist_id'),
+            Related('shows:detail:{id}', through=Show.__table__, local_column='venue_id', remote_column='id'),
+        )
+    ),
+    Show: DependencyRule(
+        kind='show',
+        detail='shows:detail:{id}',
+        collections=('artists:list', 'venues:list', 'stats') + _SHOW_LISTS,
+        related=(
+            Related('artists:detail:{id}', attribute='artist_id'),
+            Related('venues:detail:{id}', attribute='venue_id'),
+        )
+    ),
+    Genre: DependencyRule(
+        kind='genre',
+        detail='genres:detail:{id}',
+        collections=('artists:list', 'venues:list'),
+        related=(
+            Related('artists:detail:{id}', through=artist_genres, local_column='genre_id', remote_column='artist_id'),
+            Related('venues:detail:{id}', through=venue_genres, local_column='genre_id', remote_column='venue_id'),
+        )
+    ),
+}
+
+# Genre link tables, keyed by the model owning the `genres` collection
+_ASSOCIATIONS = {Artist: 'artist_genres', Venue: 'venue_genres'}
+
+
+@dataclass
+class ChangeSet:
+    """Everything a committed transaction changed, plus the cache keys it invalidates."""
+    created: Set[Tuple[str, int]] = field(default_factory=set)
+    updated: Set[Tuple[str, int]] = field(default_factory=set)
+    deleted: Set[Tuple[str, int]] = field(default_factory=set)
+    associations: Set[Tuple[str, int, int]] = field(default_factory=set)
+    keys: Set[str] = field(default_factory=set)
+    
+    def __bool__(self) -> bool:
+        return bool(self.keys)
+    
+    def merge(self, other: 'ChangeSet') -> None:
+        self.created |= other.created
+        self.updated |= other.updated
+        self.deleted |= other.deleted
+        self.associations |= other.associations
+        self.keys |= other.keys
+
+
+class CacheInvalidator:
+    """Per-app dispatcher of committed change sets to cache subscribers."""
+    
+    def __init__(self):
+        self._subscribers: List[Callable[[ChangeSet], None]] = []
+        self.commits = 0
+        self.keys_dispatched = 0
+    
+    def subscribe(self, callback: Callable[[ChangeSet], None]) -> None:
+        """Call `callback(change_set)` after every commit that changed cached data."""
+        self._subscribers.append(callback)
+    
+    def dispatch(self, change_set: ChangeSet) -> None:
+        self.commits += 1
+        self.keys_dispatched += len(change_set.keys)
+        for callback in self._subscribers:
+            try:
+                callback(change_set)
+            except Exception:
+                current_app.logger.exception('Cache invalidation subscriber failed')
+    
+    def stats(self) -> Dict[str, int]:
+        return {
+            'commits': self.commits,
+            'keys_dispatched': self.keys_dispatched,
+            'subscribers': len(self._subscribers)
+        }
+
+
+def _collect(session, instance, operation: str, change_set: ChangeSet) -> None:
+    rule = CACHE_DEPENDENCIES.get(type(instance))
+    if rule is None or instance.id is None:
+        return
+    
+    identity = (rule.kind, instance.id)
+    getattr(change_set, operation).add(identity)
+    change_set.keys.add(rule.detail.format(id=instance.id))
+    change_set.keys.update(rule.collections)
+    
+    state = inspect(instance)
+    for related in rule.related:
+        if related.attribute is not None:
+            history = state.attrs[related.attribute].history
+            for value in (*history.unchanged, *history.added, *history.deleted):
+                if value is not None:
+                    change_set.keys.add(related.key.format(id=value))
+        elif operation != 'created':
+            table = related.through
+            rows = session.connection().execute(
+                select(table.c[related.remote_column]).where(table.c[related.local_column] == instance.id)
+            )
+            change_set.keys.update(related.key.format(id=row[0]) for row in rows)
+    
+    association = _ASSOCIATIONS.get(type(instance))
+    if association is not None:
+        history = state.attrs.genres.history
+        for genre in (*history.added, *history.deleted):
+            genre_id = inspect(genre).identity[0] if inspect(genre).identity else None
+            if genre_id is not None:
+                change_set.associations.add((association, instance.id, genre_id))
+
+
+def _after_flush(session, flush_context) -> None:
+    change_set = ChangeSet()
+    for instance in session.new:
+        _collect(session, instance, 'created', change_set)
+    for instance in session.dirty:
+        if session.is_modified(instance):
+            _collect(session, instance, 'updated', change_set)
+    for instance in session.deleted:
+        _collect(session, instance, 'deleted', change_set)
+    
+    if change_set:
+        session.info.setdefault(PENDING_KEY, ChangeSet()).merge(change_set)
+
+
+def _after_commit(session) -> None:
+    change_set = session.info.pop(PENDING_KEY, None)
+    if not change_set or not has_app_context():
+        return
+    invalidator = current_app.extensions.get('cache_invalidation')
+    if invalidator is not None:
+        invalidator.dispatch(change_set)
+
+
+def _after_rollback(session) -> None:
+    session.info.pop(PENDING_KEY, None)
+
+
+_listeners_installed = False
+
+
+def _install_session_listeners() -> None:
+    global _listeners_installed
+    if _listeners_installed:
+        return
+    event.listen(db.session, 'after_flush', _after_flush)
+    event.listen(db.session, 'after_commit', _after_commit)
+    event.listen(db.session, 'after_rollback', _after_rollback)
+    _listeners_installed = True
+
+
+def init_cache_invalidation(app) -> CacheInvalidator:
+    """Install the session listeners and attach an invalidator to the app."""
+    _install_session_listeners()
+    invalidator = CacheInvalidator()
+    app.extensions['cache_invalidation'] = invalidator
+    
+    invalidator.subscribe(_evict_cache_tags)
+    return invalidator
+
+
+def _evict_cache_tags(change_set: ChangeSet) -> None:
+    # Every caching layer tags its entries with these keys
+    cache = current_app.extensions.get('cache')
+    if cache is not None:
+        cache.invalidate_tags(change_set.keys)
+
+
+def get_cache_invalidator() -> Optional[CacheInvalidator]:
+    """Return the current app's invalidator, if installed."""
+    return current_app.extensions.get('cache_invalidation')
@@ -0,0 +1,136 @@
+"""
+Negative cache of entity ids known not to exist.
+
+Detail lookups for deleted or never-created ids (crawlers, stale links) are
+answered from a small per-entity LRU before any query runs. An id is
+forgotten as soon as a commit creates an entity with it, and any write seen
+through the shared backend's invalidation generation clears the whole
+negative cache, so other workers never hide a newly created row.
+
+The app only installs it with a shared backend (CACHE_BACKEND='sqlite'):
+with per-process memory caches, a worker that did not make the commit would
+keep answering 404 for a newly created id until the entry expired.
+"""
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from flask import current_app, has_app_context
+
+from app.cache.invalidation import ChangeSet
+from app.cache.lru import LRUCache
+
+
+class NegativeCache:
+    """Bounded, per-entity sets of missing ids with hit accounting."""
+    
+    def __init__(self, max_entries: int = 10000, ttl: float = 300, backend=None, sync_interval: float = 0.5):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.backend = backend
+        self.sync_interval = sync_interval
+        self._kinds: Dict[str, LRUCache] = {}
+        self._lock = threading.Lock()
+        self._generation = self._backend_generation()
+        self._synced_at = time.monotonic()
+        self.recorded: Dict[str, int] = {}
+        self.cleared: Dict[str, int] = {}
+    
+    def _store(self, kind: str) -> LRUCache:
+        store = self._kinds.get(kind)
+        if store is None:
+            with self._lock:
+                store = self._kinds.setdefault(kind, LRUCache(max_entries=self.max_entries, default_ttl=self.ttl))
+        return store
+    
+    def _backend_generation(self) -> Optional[int]:
+        generation = getattr(self.backend, 'generation', None)
+        return generation() if generation else None
+    
+    def _sync(self) -> None:
+        now = time.monotonic()
+        if self._generation is None or now - self._synced_at < self.sync_interval:
+            return
+        self._synced_at = now
+        generation = self._backend_generation()
+        if generation != self._generation:
+            self._generation = generation
+            self.clear()
+    
+    def is_missing(self, kind: str, entity_id: int) -> bool:
+        """True if the id is known not to exist (the lookup query can be skipped)."""
+        self._sync()
+        return self._store(kind).get(entity_id) is not None
+    
+    def remember_missing(self, kind: str, entity_id: int) -> None:
+        self._store(kind).set(entity_id, True)
+        self.recorded[kind] = self.recorded.get(kind, 0) + 1
+    
+    def forget(self, kind: str, entity_id: int) -> None:
+        if self._store(kind).delete(entity_id):
+            self.cleared[kind] = self.cleared.get(kind, 0) + 1
+    
+    def clear(self) -> None:
+        for store in list(self._kinds.values()):
+            store.clear()
+    
+    def stats(self) -> Dict[str, Any]:
+        """Per entity: queries absorbed (hits), lookups that went to the DB, and size."""
+        return {
+            kind: {
+                'absorbed': store.hits,
+                'passed_through': store.misses,
+                'absorbed_ratio': store.stats()['hit_ratio'],
+                'recorded': self.recorded.get(kind, 0),
+                'cleared': self.cleared.get(kind, 0),
+                'size': len(store)
+            }
+            for kind, store in self._kinds.items()
+        }
+
+
+def init_negative_cache(app) -> Optional[NegativeCache]:
+    """Attach a negative cache to the app (unless disabled or the cache backend is not shared)."""
+    backend = app.extensions.get('cache')
+    if not app.config.get('NEGATIVE_CACHE_ENABLED', False) or getattr(backend, 'generation', None) is None:
+        # No shared invalidation generation: other workers could not see creations
+        app.extensions['negative_cache'] = None
+        return None
+    
+    cache = NegativeCache(
+        max_entries=app.config.get('NEGATIVE_CACHE_MAX_ENTRIES', 10000),
+        ttl=app.config.get('NEGATIVE_CACHE_TTL', 300),
+        backend=backend
+    )
+    app.extensions['negative_cache'] = cache
+    invalidator = app.extensions.get('cache_invalidation')
+    if invalidator is not None:
+        invalidator.subscribe(_forget_created)
+    return cache
+
+
+def get_negative_cache() -> Optional[NegativeCache]:
+    """Return the current app's negative cache, or None when it is off."""
+    if not has_app_context():
+        return None
+    return current_app.extensions.get('negative_cache')
+
+
+def is_known_missing(kind: str, entity_id: int) -> bool:
+    """Check the negative cache, if installed."""
+    cache = get_negative_cache()
+    return cache is not None and cache.is_missing(kind, entity_id)
+
+
+def remember_missing(kind: str, entity_id: int) -> None:
+    """Record a missing id, if the negative cache is installed."""
+    cache = get_negative_cache()
+    if cache is not None:
+        cache.remember_missing(kind, entity_id)
+
+
+def _forget_created(change_set: ChangeSet) -> None:
+    cache = current_app.extensions.get('negative_cache')
+    if cache is not None:
+        for kind, entity_id in change_set.created:
+            cache.forget(kind, entity_id)
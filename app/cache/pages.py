@@ -0,0 +1,272 @@
+"""
+Pre-rendered artist and venue pages.
+
+In publishing mode the detail pages are rendered to static HTML files under
+PAGE_PUBLISH_DIR. The detail routes serve a published file directly (no ORM
+work, Last-Modified included) and fall back to live rendering when it is
+missing. Committed writes
+delete the affected files at once and re-render them on a background thread;
+`flask publish-pages` rebuilds every page in parallel with a process pool.
+
+Pages are rendered straight from the repositories, never from the memoized
+service responses: a memo computed during a concurrent commit could land
+after the invalidation, and a static file has no TTL to recover from it.
+Each file starts with a header line holding the page's Last-Modified stamp,
+read before rendering, and for a page listing upcoming shows the start time
+of its next show; once that time passes the page is dropped and re-rendered,
+since the show has moved to the past.
+"""
+import os
+import queue
+import re
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from flask import current_app, render_template, Response
+
+from app.cache.conditional import conditional_response
+from app.cache.invalidation import ChangeSet
+
+# kind -> (template, template variable, service method)
+PAGE_KINDS = {
+    'artists': ('pages/show_artist.html', 'artist', 'build_artist_response'),
+    'venues': ('pages/show_venue.html', 'venue', 'build_venue_response'),
+}
+
+# First line of every page: '<!-- fyyur:page <expires> <last modified> -->' in unix time, '-' for none
+_HEADER = b'<!-- fyyur:page '
+
+_DETAIL_KEY = re.compile(r'^(artists|venues):detail:(\d+)$')
+
+
+class PublishedPage(NamedTuple):
+    """A stored page and the naive UTC time its entity last changed."""
+    html: bytes
+    last_modified: Optional[datetime]
+
+
+def _to_unix(stamp: Optional[datetime]) -> str:
+    return '-' if stamp is None else repr(stamp.replace(tzinfo=timezone.utc).timestamp())
+
+
+def _from_unix(value: bytes) -> Optional[datetime]:
+    return None if value == b'-' else datetime.fromtimestamp(float(value), timezone.utc).replace(tzinfo=None)
+
+
+class PagePublisher:
+    """Renders, stores and serves static detail pages for one app."""
+    
+    def __init__(self, app, directory: str):
+        self.app = app
+        self.directory = directory
+        self._queue: "queue.Queue[Tuple[str, int]]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        
+        self.served = 0
+        self.misses = 0
+        self.published = 0
+        self.unpublished = 0
+        self.expired = 0
+        self.errors = 0
+    
+    def path_for(self, kind: str, entity_id: int) -> str:
+        return os.path.join(self.directory, kind, f'{int(entity_id)}.html')
+    
+    def read(self, kind: str, entity_id: int) -> Optional[PublishedPage]:
+        """Return a published page, or None when it has to be rendered live."""
+        try:
+            with open(self.path_for(kind, entity_id), 'rb') as page:
+                html = page.read()
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        
+        stamp = None
+        if html.startswith(_HEADER):
+            header, html = html.split(b'\n', 1)
+            expires, modified = header[len(_HEADER):].split()[:2]
+            if expires != b'-' and float(expires) <= time.time():
+                # Its next show has started: the page would still list it as upcoming
+                self.expired += 1
+                self.misses += 1
+                self.unpublish(kind, entity_id)
+                self.schedule([(kind, entity_id)])
+                return None
+            stamp = _from_unix(modified)
+        self.served += 1
+        return PublishedPage(html, stamp)
+    
+    @staticmethod
+    def respond(page: PublishedPage) -> Response:
+        """Serve a published page, answering If-Modified-Since from its stored stamp."""
+        return conditional_response(page.last_modified, lambda: Response(page.html, mimetype='text/html'))
+    
+    def render(self, kind: str, entity_id: int) -> Optional[Tuple[str, Optional[datetime], Optional[datetime]]]:
+        """
+        Render a detail page exactly as its route would; None if the entity is gone.
+
+        Returns the HTML, the start time of the entity's next upcoming show
+        (when the page goes stale, None without upcoming shows) and the
+        entity's last-modified stamp. The stamp is read first, so a write
+        racing the render can only leave it older than the HTML, never newer.
+        """
+        from app.services import ArtistService, VenueService
+        
+        template, variable, method = PAGE_KINDS[kind]
+        service = ArtistService() if kind == 'artists' else VenueService()
+        with self.app.test_request_context(f'/{kind}/{int(entity_id)}'):
+            last_modified = service.get_last_modified(entity_id)
+            response = getattr(service, method)(entity_id)
+            if response is None:
+                return None
+            expires_at = min((show.start_time for show in response.upcoming_shows), default=None)
+            return render_template(template, **{variable: response}), expires_at, last_modified
+    
+    def publish(self, kind: str, entity_id: int) -> bool:
+        """Render and atomically store one page; returns False if it was unpublished."""
+        try:
+            rendered = self.render(kind, entity_id)
+        except Exception:
+            self.errors += 1
+            self.app.logger.exception('Publishing %s %s failed', kind, entity_id)
+            rendered = None
+        if rendered is None:
+            self.unpublish(kind, entity_id)
+            return False
+        
+        html, expires_at, last_modified = rendered
+        path = self.path_for(kind, entity_id)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as page:
+            page.write(f'{_HEADER.decode()}{_to_unix(expires_at)} {_to_unix(last_modified)} -->\n')
+            page.write(html)
+        os.replace(tmp_path, path)
+        self.published += 1
+        return True
+    
+    def unpublish(self, kind: str, entity_id: int) -> None:
+        try:
+            os.remove(self.path_for(kind, entity_id))
+            self.unpublished += 1
+        except FileNotFoundError:
+            pass
+    
+    def schedule(self, pages: Iterable[Tuple[str, int]]) -> None:
+        """Re-render pages on the background worker."""
+        for page in pages:
+            self._queue.put(page)
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._work, name='page-publisher', daemon=True)
+                self._worker.start()
+    
+    def _work(self) -> None:
+        while True:
+            try:
+                kind, entity_id = self._queue.get(timeout=5)
+            except queue.Empty:
+                return
+            try:
+                with self.app.app_context():
+                    self.publish(kind, entity_id)
+            finally:
+                self._queue.task_done()
+    
+    def wait(self) -> None:
+        """Block until every scheduled page has been re-rendered."""
+        self._queue.join()
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'directory': self.directory,
+            'served': self.served,
+            'misses': self.misses,
+            'published': self.published,
+            'unpublished': self.unpublished,
+            'expired': self.expired,
+            'errors': self.errors,
+            'queued': self._queue.qsize()
+        }
+
+
+def init_page_publisher(app) -> Optional[PagePublisher]:
+    """Enable publishing mode when PAGE_PUBLISHING_ENABLED is set."""
+    if not app.config.get('PAGE_PUBLISHING_ENABLED', False):
+        app.extensions['page_publisher'] = None
+        return None
+    
+    publisher = PagePublisher(app, app.config['PAGE_PUBLISH_DIR'])
+    app.extensions['page_publisher'] = publisher
+    invalidator = app.extensions.get('cache_invalidation')
+    if invalidator is not None:
+        invalidator.subscribe(_republish_pages)
+    return publisher
+
+
+def get_page_publisher() -> Optional[PagePublisher]:
+    """Return the current app's publisher, or None when publishing is off."""
+    return current_app.extensions.get('page_publisher')
+
+
+def _republish_pages(change_set: ChangeSet) -> None:
+    publisher = current_app.extensions.get('page_publisher')
+    if publisher is None:
+        return
+    pages = [
+        (match.group(1), int(match.group(2)))
+        for match in map(_DETAIL_KEY.match, change_set.keys) if match
+    ]
+    # Drop stale files now so no request can see them, then rebuild off the request path
+    for kind, entity_id in pages:
+        publisher.unpublish(kind, entity_id)
+    publisher.schedule(pages)
+
+
+_worker_app = None
+
+
+def _init_worker(config_name: str, overrides: Dict[str, Any]) -> None:
+    global _worker_app
+    from app import create_app
+    _worker_app = create_app(config_name, warm_up=False)
+    _worker_app.config.update(overrides)
+
+
+def _publish_chunk(pages: List[Tuple[str, int]], app=None) -> int:
+    app = app or _worker_app
+    publisher = PagePublisher(app, app.config['PAGE_PUBLISH_DIR'])
+    with app.app_context():
+        return sum(1 for kind, entity_id in pages if publisher.publish(kind, entity_id))
+
+
+def publish_all(app, config_name: str, workers: int = 0, chunk_size: int = 50) -> int:
+    """
+    Render every artist and venue page; returns how many were published.
+
+    Pages are split into chunks rendered by a pool of `workers` processes
+    (default: one per CPU); workers=1 renders in this process.
+    """
+    from app.models import Artist, Venue
+    
+    with app.app_context():
+        pages = [('artists', artist_id) for (artist_id,) in Artist.query.with_entities(Artist.id)]
+        pages += [('venues', venue_id) for (venue_id,) in Venue.query.with_entities(Venue.id)]
+    chunks = [pages[start:start + chunk_size] for start in range(0, len(pages), chunk_size)]
+    
+    if workers == 1:
+        return sum(_publish_chunk(chunk, app) for chunk in chunks)
+    
+    overrides = {
+        'SQLALCHEMY_DATABASE_URI': app.config['SQLALCHEMY_DATABASE_URI'],
+        'PAGE_PUBLISH_DIR': app.config['PAGE_PUBLISH_DIR'],
+    }
+    
+    with ProcessPoolExecutor(max_workers=workers or None, initializer=_init_worker,
+                             initargs=(config_name, overrides)) as pool:
+        return sum(pool.map(_publish_chunk, chunks))
@@ -0,0 +1,207 @@
+"""
+HTTP response cache for the JSON API blueprints.
+
+Successful JSON responses are stored as serialized bodies with a strong ETag.
+Repeat requests are answered from the app cache backend (see backends.py),
+and a matching If-None-Match gets a 304 before the view (and therefore the
+database) is touched at all. Entries are tagged with their route name, so
+commit-driven invalidation evicts every query-string variant at once.
+Content-encoded copies of a body (gzip/br/zstd) are stored next to it on
+first use, so hits are never compressed twice.
+"""
+import hashlib
+from dataclasses import dataclass
+from functools import wraps
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from flask import current_app, request, make_response, Response
+from werkzeug.http import parse_date
+
+from app.cache.backends import CacheBackend, MemoryBackend, init_cache
+from app.cache.conditional import is_not_modified
+from app.utils.columnar import COLUMNAR_MIMETYPE
+from app.utils.compression import choose_encoding, compress_body, get_compression_stats, mark_encoded
+from app.utils.json_provider import MSGPACK_MIMETYPE
+from app.utils.streaming import wants_ndjson
+
+# Media types views may negotiate through Accept; each is cached under its own key
+NEGOTIATED_MEDIA_TYPES = ('application/json', COLUMNAR_MIMETYPE, MSGPACK_MIMETYPE)
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    """A stored response body and the headers needed to replay it."""
+    body: bytes
+    etag: str  # unquoted strong entity tag
+    mimetype: str
+    headers: Tuple[Tuple[str, str], ...] = ()  # Vary, Last-Modified and application X- headers, replayed as-is
+
+
+class ResponseCache:
+    """Response cache bound to one Flask application."""
+    
+    KEY_PREFIX = 'response:'
+    
+    def __init__(self, backend: Optional[CacheBackend] = None):
+        self.backend = backend if backend is not None else MemoryBackend()
+        self.not_modified = 0
+    
+    @staticmethod
+    def make_key(name: str, query_string: str = '', representation: str = '') -> str:
+        """Build the storage key for a named route, its (normalized) query string and media type."""
+        key = f'{name}?{query_string}'
+        return f'{key};{representation}' if representation else key
+    
+    def get(self, key: str) -> Optional[CachedResponse]:
+        return self.backend.get(self.KEY_PREFIX + key)
+    
+    def set(self, key: str, entry: CachedResponse, ttl: Optional[float] = None) -> None:
+        name = key.split('?', 1)[0]
+        self.backend.set(self.KEY_PREFIX + key, entry, ttl=ttl, tags=(name,))
+    
+    def get_variant(self, key: str, etag: str, encoding: str) -> Optional[bytes]:
+        """A stored content-encoded copy of the entry with this ETag."""
+        return self.backend.get(f'{self.KEY_PREFIX}{key}#{etag}.{encoding}')
+    
+    def set_variant(self, key: str, etag: str, encoding: str, body: bytes, ttl: Optional[float] = None) -> None:
+        # Keyed by ETag, so a variant can never outlive the body it encodes
+        name = key.split('?', 1)[0]
+        self.backend.set(f'{self.KEY_PREFIX}{key}#{etag}.{encoding}', body, ttl=ttl, tags=(name,))
+    
+    def invalidate(self, name: str) -> int:
+        """Evict every cached variant (any query string) of a named route."""
+        return self.backend.invalidate_tags([name])
+    
+    def invalidate_many(self, names: Iterable[str]) -> int:
+        """Evict every cached variant of several named routes in one pass."""
+        return self.backend.invalidate_tags(names)
+    
+    def clear(self) -> None:
+        self.backend.clear()
+    
+    def stats(self) -> Dict[str, Any]:
+        stats = self.backend.stats()
+        stats['not_modified'] = self.not_modified
+        return stats
+
+
+def init_response_cache(app) -> Optional[ResponseCache]:
+    """Create the response cache for an app (unless disabled in config)."""
+    if not app.config.get('RESPONSE_CACHE_ENABLED', False):
+        app.extensions['response_cache'] = None
+        return None
+    
+    backend = app.extensions.get('cache') or init_cache(app)
+    cache = ResponseCache(backend)
+    app.extensions['response_cache'] = cache
+    return cache
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """Return the current app's response cache, or None when caching is off."""
+    return current_app.extensions.get('response_cache')
+
+
+def compute_etag(body: bytes) -> str:
+    """Strong (unquoted) entity tag for a response body."""
+    return hashlib.sha256(body).hexdigest()[:32]
+
+
+def _representation() -> str:
+    """The media type negotiated through Accept, or '' for plain JSON."""
+    best = request.accept_mimetypes.best_match(NEGOTIATED_MEDIA_TYPES)
+    return '' if best in (None, 'application/json') else best
+
+
+def _normalized_query_string() -> str:
+    return '&'.join(
+        f'{key}={value}'
+        for key, values in sorted(request.args.lists())
+        for value in sorted(values)
+    )
+
+
+def _encoded_body(entry: CachedResponse, encoding: str, cache: Optional[ResponseCache],
+                  key: Optional[str], ttl: Optional[float]) -> bytes:
+    """The entry's body in `encoding`, compressed once per cached entry."""
+    counters = get_compression_stats()
+    if cache is not None:
+        body = cache.get_variant(key, entry.etag, encoding)
+        if body is not None:
+            if counters is not None:
+                counters.cached += 1
+            return body
+    body = compress_body(entry.body, encoding)
+    if counters is not None:
+        counters.record(len(entry.body), len(body))
+    if cache is not None:
+        cache.set_variant(key, entry.etag, encoding, body, ttl=ttl)
+    return body
+
+
+def _replay(entry: CachedResponse, max_age: int, cache: Optional[ResponseCache],
+            key: Optional[str] = None, ttl: Optional[float] = None) -> Response:
+    encoding = choose_encoding(entry.mimetype, len(entry.body))
+    modified = dict(entry.headers).get('Last-Modified')
+    if request.if_none_match.contains_weak(entry.etag) or (modified and is_not_modified(parse_date(modified))):
+        if cache is not None:
+            cache.not_modified += 1
+        response = Response(status=304)
+    else:
+        body = entry.body if encoding is None else _encoded_body(entry, encoding, cache, key, ttl)
+        response = Response(body, mimetype=entry.mimetype)
+    response.headers.extend(entry.headers)
+    response.set_etag(entry.etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = max_age
+    if encoding is not None:
+        if response.status_code == 304:
+            response.set_etag(entry.etag, weak=True)
+            response.vary.add('Accept-Encoding')
+        else:
+            mark_encoded(response, encoding)
+    return response
+
+
+def cached_response(name: str, max_age: int = 60, ttl: Optional[float] = None) -> Callable:
+    """
+    Cache a JSON (or MessagePack) API view.
+
+    Args:
+        name: Route name used for the cache key; may reference view arguments,
+            e.g. 'artists:detail:{artist_id}'
+        max_age: Cache-Control max-age sent to clients (seconds)
+        ttl: Server-side entry lifetime (seconds); defaults to the cache default
+    """
+    def decorator(view: Callable) -> Callable:
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            # Streamed representations are never buffered into the cache
+            if wants_ndjson():
+                return view(*args, **kwargs)
+            
+            cache = get_response_cache()
+            key = None
+            if cache is not None:
+                key = ResponseCache.make_key(name.format(**kwargs), _normalized_query_string(), _representation())
+                entry = cache.get(key)
+                if entry is not None:
+                    return _replay(entry, max_age, cache, key, ttl)
+            
+            response = make_response(view(*args, **kwargs))
+            cacheable = response.is_json or response.mimetype == MSGPACK_MIMETYPE
+            if response.status_code != 200 or not cacheable or response.is_streamed:
+                return response
+            
+            body = response.get_data()
+            entry = CachedResponse(
+                body=body,
+                etag=compute_etag(body),
+                mimetype=response.mimetype,
+                headers=tuple((key, value) for key, value in response.headers.items() if key in ('Vary', 'Last-Modified') or key.startswith('X-'))
+            )
+            if cache is not None:
+                cache.set(key, entry, ttl=ttl)
+            return _replay(entry, max_age, cache, key, ttl)
+        return wrapper
+    return decorator
@@ -0,0 +1,175 @@
+"""
+Request coalescing for expensive service reads.
+
+`coalesced` memoizes a service method in the app cache backend. On a miss,
+concurrent callers asking for the same key inside one worker wait for a
+single in-flight computation (singleflight) instead of each hitting the
+database. Entries are also refreshed early with a probability that rises as
+expiry approaches (XFetch), so popular keys do not all expire at once.
+"""
+import inspect
+import math
+import random
+import threading
+import time
+from dataclasses import dataclass
+from functools import wraps
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from flask import current_app, has_app_context
+
+from app.cache.backends import get_cache
+
+
+class _Call:
+    """One in-flight computation that other callers can wait on."""
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Runs at most one computation per key at a time; other callers share its result."""
+    
+    def __init__(self):
+        self._calls: Dict[str, _Call] = {}
+        self._lock = threading.Lock()
+        self.executions = 0
+        self.waits = 0
+        self.errors = 0
+    
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """Return fn() for this key, or wait for the call already running it."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.executions += 1
+            else:
+                self.waits += 1
+        
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+        
+        try:
+            call.value = fn()
+            return call.value
+        except BaseException as e:
+            call.error = e
+            self.errors += 1
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+    
+    def is_running(self, key: str) -> bool:
+        with self._lock:
+            return key in self._calls
+    
+    def in_flight(self) -> int:
+        return len(self._calls)
+    
+    def stats(self) -> Dict[str, int]:
+        return {
+            'executions': self.executions,
+            'waits': self.waits,
+            'errors': self.errors,
+            'in_flight': self.in_flight()
+        }
+
+
+@dataclass(frozen=True)
+class MemoEntry:
+    """A memoized value plus what early refresh needs to know about it."""
+    value: Any
+    expires_at: float  # wall-clock, comparable across workers
+    delta: float  # seconds the computation took
+
+
+def should_refresh_early(entry: MemoEntry, beta: float = 1.0, now: Optional[float] = None) -> bool:
+    """
+    XFetch: refresh before expiry with probability growing as expiry nears.
+
+    Slow computations (large delta) start refreshing earlier; beta > 1 favours
+    earlier refreshes, beta = 0 disables them.
+    """
+    now = time.time() if now is None else now
+    return now - entry.delta * beta * math.log(1.0 - random.random()) >= entry.expires_at
+
+
+def init_singleflight(app) -> SingleFlight:
+    """Attach a SingleFlight to the app."""
+    flight = SingleFlight()
+    app.extensions['singleflight'] = flight
+    return flight
+
+
+def get_singleflight() -> Optional[SingleFlight]:
+    """Return the current app's SingleFlight, if installed."""
+    return current_app.extensions.get('singleflight')
+
+
+def coalesced(name: str, ttl: float = 60, tags: Iterable[str] = (), beta: float = 1.0) -> Callable:
+    """
+    Memoize a service method with request coalescing.
+
+    Args:
+        name: Cache key; may reference the method's arguments,
+            e.g. 'artists:detail:{artist_id}'
+        ttl: Entry lifetime in seconds
+        tags: Invalidation keys (same format rules as name); the name itself
+            is always a tag
+        beta: Early-refresh aggressiveness (0 disables early refresh)
+
+    None results are not cached. Disabled unless SERVICE_CACHE_ENABLED is set.
+    """
+    tags = tuple(tags)
+    
+    def decorator(method: Callable) -> Callable:
+        signature = inspect.signature(method)
+        
+        @wraps(method)
+        def wrapper(*args, **kwargs):
+            if not has_app_context() or not current_app.config.get('SERVICE_CACHE_ENABLED', False):
+                return method(*args, **kwargs)
+            cache = get_cache()
+            flight = get_singleflight()
+            if cache is None or flight is None:
+                return method(*args, **kwargs)
+            
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = name.format(**bound.arguments)
+            storage_key = f'service:{key}'
+            
+            entry = cache.get(storage_key)
+            if entry is not None and not should_refresh_early(entry, beta):
+                return entry.value
+            
+            def compute():
+                started = time.time()
+                value = method(*args, **kwargs)
+                finished = time.time()
+                if value is not None:
+                    cache.set(
+                        storage_key,
+                        MemoEntry(value=value, expires_at=finished + ttl, delta=finished - started),
+                        ttl=ttl,
+                        tags=(key,) + tuple(tag.format(**bound.arguments) for tag in tags)
+                    )
+                return value
+            
+            if entry is not None:
+                # Early refresh: one caller recomputes, the rest keep the current value
+                if flight.is_running(storage_key):
+                    return entry.value
+            return flight.do(storage_key, compute)
+        return wrapper
+    return decorator
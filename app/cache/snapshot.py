@@ -0,0 +1,148 @@
+"""
+Precomputed data snapshots served with stale-while-revalidate semantics.
+
+A snapshot holds the result of a builder function in memory. Requests only
+ever read the held value; rebuilding happens on a background thread when the
+value is older than `max_age` or when a committed write touches one of the
+snapshot's invalidation tags. Until the first build finishes, requests get
+the snapshot's `empty` value, so the request path never queries the database.
+"""
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from flask import current_app
+
+from app.cache.invalidation import ChangeSet
+
+
+class Snapshot:
+    """One named, background-refreshed value."""
+    
+    def __init__(self, app, name: str, builder: Callable[[], Any], tags: Iterable[str] = (),
+                 max_age: float = 60, empty: Any = None):
+        self.app = app
+        self.name = name
+        self.builder = builder
+        self.tags = frozenset(tags)
+        self.max_age = max_age
+        self.empty = empty
+        
+        self._value: Any = None
+        self._built_at: Optional[float] = None
+        self._generation = 0
+        self._built_generation = -1
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        
+        self.serves = 0
+        self.stale_serves = 0
+        self.empty_serves = 0
+        self.refreshes = 0
+        self.refresh_errors = 0
+        self.last_refresh_ms: Optional[float] = None
+    
+    @property
+    def is_stale(self) -> bool:
+        if self._built_at is None or self._built_generation != self._generation:
+            return True
+        return time.monotonic() - self._built_at > self.max_age
+    
+    def get(self) -> Any:
+        """Return the held value immediately, scheduling a refresh if it is stale."""
+        self.serves += 1
+        if self._built_at is None:
+            self.empty_serves += 1
+            self.schedule_refresh()
+            return self.empty
+        if self.is_stale:
+            self.stale_serves += 1
+            self.schedule_refresh()
+        return self._value
+    
+    def invalidate(self) -> None:
+        """Mark the value stale and rebuild it in the background."""
+        with self._lock:
+            self._generation += 1
+        self.schedule_refresh()
+    
+    def refresh(self) -> Any:
+        """Rebuild synchronously (used by the background thread and warm-up)."""
+        with self._lock:
+            generation = self._generation
+        
+        started = time.perf_counter()
+        with self.app.app_context():
+            value = self.builder()
+        
+        with self._lock:
+            self._value = value
+            self._built_at = time.monotonic()
+            self._built_generation = generation
+        self.refreshes += 1
+        self.last_refresh_ms = round((time.perf_counter() - started) * 1000, 2)
+        return value
+    
+    def schedule_refresh(self) -> bool:
+        """Start a background rebuild unless one is already running."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return False
+            self._thread = threading.Thread(target=self._refresh_loop, name=f'snapshot-{self.name}', daemon=True)
+            self._thread.start()
+            return True
+    
+    def _refresh_loop(self) -> None:
+        # Keep rebuilding while writes arrive mid-build, so none is missed
+        while True:
+            try:
+                self.refresh()
+            except Exception:
+                self.refresh_errors += 1
+                self.app.logger.exception('Snapshot %s refresh failed', self.name)
+                return
+            with self._lock:
+                if self._built_generation == self._generation:
+                    return
+    
+    def wait(self, timeout: Optional[float] = None) -> None:
+        """Block until a running background refresh finishes."""
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'serves': self.serves,
+            'stale_serves': self.stale_serves,
+            'empty_serves': self.empty_serves,
+            'refreshes': self.refreshes,
+            'refresh_errors': self.refresh_errors,
+            'last_refresh_ms': self.last_refresh_ms,
+            'age_seconds': round(time.monotonic() - self._built_at, 2) if self._built_at is not None else None
+        }
+
+
+def register_snapshot(app, name: str, builder: Callable[[], Any], tags: Iterable[str] = (),
+                      max_age: float = 60, empty: Any = None) -> Snapshot:
+    """Create a snapshot on the app and refresh it whenever a commit touches its tags."""
+    snapshots = app.extensions.setdefault('snapshots', {})
+    if not snapshots:
+        invalidator = app.extensions.get('cache_invalidation')
+        if invalidator is not None:
+            invalidator.subscribe(_invalidate_snapshots)
+    
+    snapshot = Snapshot(app, name, builder, tags=tags, max_age=max_age, empty=empty)
+    snapshots[name] = snapshot
+    return snapshot
+
+
+def get_snapshot(name: str) -> Optional[Snapshot]:
+    """Return a registered snapshot of the current app, if any."""
+    return current_app.extensions.get('snapshots', {}).get(name)
+
+
+def _invalidate_snapshots(change_set: ChangeSet) -> None:
+    for snapshot in current_app.extensions.get('snapshots', {}).values():
+        if snapshot.tags & change_set.keys:
+            snapshot.invalidate()
@@ -1,10 +1,14 @@
 """
 Artist controller for artist CRUD operations.
 """
-from flask import Blueprint, render_template, request, jsonify, redirect, url_for, flash
+from flask import Blueprint, current_app, render_template, request, jsonify, redirect, url_for, flash, session
 from app.services import ArtistService
+from app.repositories import ARTIST_FIELDS
 from app.schemas import ArtistCreate, ArtistUpdate
 from app.exceptions import ArtistNotFoundException, DuplicateArtistException, DatabaseException, ValidationException
+from app.cache import cached_response, get_page_publisher, get_document_store, last_modified
+from app.utils.json_provider import wants_msgpack
+from app.utils.streaming import ndjson_response, wants_ndjson
 
 artists_bp = Blueprint('artists', __name__, url_prefix='/artists')
 
@@ -48,6 +52,17 @@ def search():
 @artists_bp.route('/<int:artist_id>')
 def show(artist_id):
     """Show artist details."""
+    # Serve the pre-rendered page, with its stored Last-Modified, unless flashed messages must be shown
+    publisher = get_page_publisher()
+    if publisher is not None and not session.get('_flashes'):
+        page = publisher.read('artists', artist_id)
+        if page is not None:
+            return publisher.respond(page)
+    return _render_artist(artist_id=artist_id)
+
+@last_modified(lambda artist_id: ArtistService().get_last_modified(artist_id))
+def _render_artist(artist_id):
+    """Render the artist page from the database."""
     try:
         artist_service = ArtistService()
         artist_response = artist_service.get_artist_response(artist_id)
@@ -215,18 +230,57 @@ def delete(artist_id):
 
 # API endpoints
 @artists_bp.route('/api')
+@cached_response('artists:list', max_age=30)
 def api_list():
-    """API endpoint to list all artists."""
+    """API endpoint to list all artists, optionally filtered by ?genre=...&match=any|all and ?fields=."""
     try:
+        fields = ARTIST_FIELDS.parse(request.args.getlist('fields'))
+        serialize = ARTIST_FIELDS.serializer(fields)
         artist_service = ArtistService()
-        artists = artist_service.get_all()
-        return jsonify([artist.to_dict() for artist in artists])
+        genre_names = request.args.getlist('genre')
+        match_all = request.args.get('match', 'any') == 'all'
+        if wants_ndjson():
+            artists = artist_service.iter_artists(
+                genre_names, match_all=match_all, batch_size=current_app.config['NDJSON_BATCH_SIZE'], fields=fields
+            )
+            return ndjson_response(artists, serialize)
+        
+        if genre_names:
+            artists = artist_service.get_artists_by_genres(genre_names, match_all=match_all, fields=fields)
+        else:
+            artists = artist_service.get_all(fields=fields)
+        response = jsonify([serialize(artist) for artist in artists])
+        response.vary.add('Accept')
+        return response
+    except ValidationException as e:
+        return jsonify({'error': str(e)}), 400
     except DatabaseException as e:
         return jsonify({'error': str(e)}), 500
 
 @artists_bp.route('/api/<int:artist_id>')
+@cached_response('artists:detail:{artist_id}', max_age=30)
+@last_modified(lambda artist_id: ArtistService().get_last_modified(artist_id))
 def api_show(artist_id):
-    """API endpoint to show artist details."""
+    """API endpoint to show artist details (?fields= picks keys of the list representation)."""
+    try:
+        fields = ARTIST_FIELDS.parse(request.args.getlist('fields'))
+        if fields:
+            artist = ArtistService().get_by_id(artist_id, fields=fields)
+            if artist is None:
+                return jsonify({'error': f"Artist with ID {artist_id} not found"}), 404
+            return jsonify(ARTIST_FIELDS.serializer(fields)(artist))
+    except ValidationException as e:
+        return jsonify({'error': str(e)}), 400
+    except DatabaseException as e:
+        return jsonify({'error': str(e)}), 500
+    
+    # Stored documents are JSON; MessagePack clients take the live path
+    store = get_document_store()
+    if store is not None and not wants_msgpack():
+        document = store.read('artists', artist_id)
+        if document is not None:
+            return store.respond(document)
+    
     try:
         artist_service = ArtistService()
         artist_response = artist_service.get_artist_response(artist_id)
@@ -234,6 +288,8 @@ def api_show(artist_id):
         if not artist_response:
             return jsonify({'error': f"Artist with ID {artist_id} not found"}), 404
         
+        if store is not None:
+            store.schedule([('artists', artist_id)])
         return jsonify(artist_response.model_dump())
     except ArtistNotFoundException as e:
         return jsonify({'error': str(e)}), 404
@@ -1,15 +1,27 @@
 """
 Main controller for the Fyyur application.
 """
-from flask import Blueprint, render_template, jsonify
-from app.services import VenueService, ArtistService, ShowService
+from flask import Blueprint, current_app, render_template, request, jsonify
+from app.services import VenueService, ArtistService, ShowService, ChangeFeedService, ImportService, IMPORT_KINDS
 from app.exceptions import DatabaseException
+from app.utils.batch import dispatch_batch
+from app.utils.ingest import IMPORT_FORMATS, IMPORT_MIMETYPES, iter_records
+from app.utils.compression import get_compression_stats
+from app.cache import (
+    cached_response, get_response_cache, get_cache_invalidator, get_singleflight, get_snapshot,
+    get_page_publisher, get_negative_cache, get_document_store, FragmentCacheExtension
+)
 
 main_bp = Blueprint('main', __name__)
 
 @main_bp.route('/')
 def index():
     """Homepage with recent data."""
+    snapshot = get_snapshot('homepage')
+    if snapshot is not None:
+        # Served from memory; stale data triggers a background refresh
+        return render_template('pages/home.html', **snapshot.get())
+    
     try:
         venue_service = VenueService()
         artist_service = ArtistService()
@@ -32,6 +44,7 @@ def index():
                              error=str(e))
 
 @main_bp.route('/api/stats')
+@cached_response('stats', max_age=60)
 def api_stats():
     """API endpoint for application statistics."""
     try:
@@ -49,3 +62,94 @@ def api_stats():
         return jsonify(stats)
     except DatabaseException as e:
         return jsonify({'error': str(e)}), 500
+
+@main_bp.route('/api/batch', methods=['POST'])
+def api_batch():
+    """
+    API endpoint answering several GET API paths in one round trip.
+
+    Body: {"requests": ["/artists/api/1", "/api/stats", ...]}, at most
+    BATCH_MAX_REQUESTS paths; each result carries its own status code.
+    """
+    payload = request.get_json(silent=True)
+    paths = payload.get('requests') if isinstance(payload, dict) else None
+    if not isinstance(paths, list):
+        return jsonify({'error': 'Expected a JSON body like {"requests": ["/artists/api/1", ...]}'}), 400
+    
+    limit = current_app.config.get('BATCH_MAX_REQUESTS', 20)
+    if len(paths) > limit:
+        return jsonify({'error': f'A batch may hold at most {limit} requests, got {len(paths)}'}), 400
+    
+    return jsonify({'responses': dispatch_batch(paths, excluded=(request.endpoint,))})
+
+@main_bp.route('/api/changes')
+def api_changes():
+    """
+    API endpoint for incremental sync: artists, venues and shows changed since a cursor.
+
+    Start with ?since=0 (or no cursor) and pass back the returned `cursor`;
+    deleted entities arrive as tombstones (operation 'deleted', no data).
+    """
+    page_size = current_app.config.get('CHANGE_FEED_PAGE_SIZE', 500)
+    since = request.args.get('since', '0')
+    limit = request.args.get('limit', str(page_size))
+    if not (since.isdigit() and limit.isdigit() and 0 < int(limit) <= page_size):
+        return jsonify({'error': f'since must be a cursor returned by this endpoint and limit 1-{page_size}'}), 400
+    
+    try:
+        return jsonify(ChangeFeedService().get_changes(int(since), int(limit)))
+    except DatabaseException as e:
+        return jsonify({'error': str(e)}), 500
+
+@main_bp.route('/api/import', methods=['POST'])
+def api_import():
+    """
+    API endpoint for bulk imports: POST an NDJSON or CSV body to /api/import?kind=artists|venues|shows.
+
+    The format comes from ?format=ndjson|csv or the Content-Type
+    (application/x-ndjson, text/csv). The body is read as a stream and
+    committed in chunks of IMPORT_CHUNK_SIZE rows; the response counts
+    imported and failed rows and lists the failures by line number.
+    """
+    kind = request.args.get('kind', '')
+    fmt = request.args.get('format') or IMPORT_MIMETYPES.get(request.mimetype)
+    if kind not in IMPORT_KINDS or fmt not in IMPORT_FORMATS:
+        return jsonify({'error': f"Expected ?kind= one of {', '.join(IMPORT_KINDS)} and an NDJSON or CSV body "
+                                 f"(?format= one of {', '.join(IMPORT_FORMATS)} or a matching Content-Type)"}), 400
+    
+    try:
+        summary = ImportService().import_records(
+            kind, iter_records(request.stream, fmt),
+            chunk_size=current_app.config.get('IMPORT_CHUNK_SIZE', 500),
+            max_errors=current_app.config.get('IMPORT_MAX_ERRORS', 1000)
+        )
+        return jsonify(summary)
+    except DatabaseException as e:
+        return jsonify({'error': str(e)}), 500
+
+@main_bp.route('/api/cache/stats')
+def api_cache_stats():
+    """API endpoint for response cache hit/miss statistics."""
+    cache = get_response_cache()
+    if cache is None:
+        return jsonify({'enabled': False})
+    
+    invalidator = get_cache_invalidator()
+    flight = get_singleflight()
+    publisher = get_page_publisher()
+    negative = get_negative_cache()
+    documents = get_document_store()
+    compression = get_compression_stats()
+    return jsonify({
+        'enabled': True,
+        **cache.stats(),
+        'invalidation': invalidator.stats() if invalidator else None,
+        'singleflight': flight.stats() if flight else None,
+        'fragments': current_app.jinja_env.extensions[FragmentCacheExtension.identifier].stats(),
+        'pages': publisher.stats() if publisher else None,
+        'negative': negative.stats() if negative else None,
+        'documents': documents.stats() if documents else None,
+        'snapshots': {name: snapshot.stats() for name, snapshot in current_app.extensions.get('snapshots', {}).items()},
+        'warmup': current_app.extensions.get('warmup'),
+        'compression': compression.stats() if compression else None
+    })
@@ -1,10 +1,14 @@
 """
 Show controller for show CRUD operations.
 """
-from flask import Blueprint, render_template, request, jsonify, redirect, url_for, flash  # pyright: ignore[reportMissingImports]
+from flask import Blueprint, current_app, render_template, request, jsonify, redirect, url_for, flash  # pyright: ignore[reportMissingImports]
 from app.services import ShowService, VenueService, ArtistService
+from app.repositories import SHOW_FIELDS
 from app.schemas import ShowCreate
 from app.exceptions import ShowNotFoundException, DatabaseException, ValidationException
+from app.cache import cached_response, last_modified
+from app.utils.columnar import COLUMNAR_MIMETYPE, wants_columnar
+from app.utils.streaming import ndjson_response, wants_ndjson
 
 shows_bp = Blueprint('shows', __name__, url_prefix='/shows')
 
@@ -13,12 +17,15 @@ def index():
     """List all shows."""
     try:
         show_service = ShowService()
+        # Read before the rows, so a concurrent write can only make the render newer than its key
+        list_version = show_service.get_list_version()
         shows = show_service.get_all_with_details()
         
-        return render_template('pages/shows.html', shows=shows)
+        return render_template('pages/shows.html', shows=shows, list_version=list_version)
     except DatabaseException as e:
         flash(f"Error loading shows: {str(e)}", 'error')
-        return render_template('pages/shows.html', shows=[])
+        # No list_version: the empty placeholder must not be cached
+        return render_template('pages/shows.html', shows=[], list_version=None)
 
 @shows_bp.route('/create', methods=['GET'])
 def create_form():
@@ -74,7 +81,7 @@ def create_submit():
         
         flash(f"Show was successfully created!", 'success')
         return redirect(url_for('shows.index'))
-        
+    
     except ValidationException as e:
         flash(str(e), 'error')
         return redirect(url_for('shows.create_form'))
@@ -83,6 +90,7 @@ def create_submit():
         return redirect(url_for('shows.create_form'))
 
 @shows_bp.route('/<int:show_id>')
+@last_modified(lambda show_id: ShowService().get_last_modified(show_id))
 def show(show_id):
     """Show show details."""
     try:
@@ -117,61 +125,106 @@ def delete(show_id):
             flash(f"Show was successfully deleted!", 'success')
         else:
             flash(f"Error deleting show", 'error')
-            
-        return redirect(url_for('shows.index'))
         
+        return redirect(url_for('shows.index'))
+    
     except DatabaseException as e:
         flash(str(e), 'error')
         return redirect(url_for('shows.index'))
 
 # API endpoints
 @shows_bp.route('/api')
+@cached_response('shows:list', max_age=30)
 def api_list():
-    """API endpoint to list all shows."""
+    """
+    API endpoint to list all shows.
+
+    Streamed as NDJSON on request, columnar with ?format=columnar (or its
+    media type); ?fields= narrows the keys of the row encodings.
+    """
     try:
+        fields = SHOW_FIELDS.parse(request.args.getlist('fields'))
+        serialize = SHOW_FIELDS.serializer(fields)
         show_service = ShowService()
-        shows = show_service.get_all()
-        return jsonify([show.to_dict() for show in shows])
+        if wants_columnar():
+            if fields:
+                raise ValidationException("?fields= cannot be combined with the columnar format")
+            response = current_app.json.json_response(show_service.get_show_columns())
+            response.mimetype = COLUMNAR_MIMETYPE
+            response.vary.add('Accept')
+            return response
+        if wants_ndjson():
+            shows = show_service.iter_all_with_details(current_app.config['NDJSON_BATCH_SIZE'], fields=fields)
+            return ndjson_response(shows, serialize)
+        
+        shows = show_service.get_all(fields=fields)
+        response = jsonify([serialize(show) for show in shows])
+        response.vary.add('Accept')
+        return response
+    except ValidationException as e:
+        return jsonify({'error': str(e)}), 400
     except DatabaseException as e:
         return jsonify({'error': str(e)}), 500
 
 @shows_bp.route('/api/<int:show_id>')
+@cached_response('shows:detail:{show_id}', max_age=30)
+@last_modified(lambda show_id: ShowService().get_last_modified(show_id))
 def api_show(show_id):
-    """API endpoint to show show details."""
+    """API endpoint to show show details (?fields= picks keys of the list representation)."""
     try:
         show_service = ShowService()
+        fields = SHOW_FIELDS.parse(request.args.getlist('fields'))
+        if fields:
+            show = show_service.get_by_id(show_id, fields=fields)
+            if show is None:
+                return jsonify({'error': f"Show with ID {show_id} not found"}), 404
+            return jsonify(SHOW_FIELDS.serializer(fields)(show))
+        
         show_response = show_service.get_show_response(show_id)
         
         if not show_response:
             return jsonify({'error': f"Show with ID {show_id} not found"}), 404
         
         return jsonify(show_response.model_dump())
+    except ValidationException as e:
+        return jsonify({'error': str(e)}), 400
     except ShowNotFoundException as e:
         return jsonify({'error': str(e)}), 404
     except DatabaseException as e:
         return jsonify({'error': str(e)}), 500
 
 @shows_bp.route('/api/upcoming')
+@cached_response('shows:upcoming', max_age=30)
 def api_upcoming():
-    """API endpoint for upcoming shows."""
+    """API endpoint for upcoming shows (?fields= narrows keys)."""
     try:
+        fields = SHOW_FIELDS.parse(request.args.getlist('fields'))
+        serialize = SHOW_FIELDS.serializer(fields)
         show_service = ShowService()
-        shows = show_service.get_upcoming_shows()
-        return jsonify([show.to_dict() for show in shows])
+        shows = show_service.get_upcoming_shows(fields=fields)
+        return jsonify([serialize(show) for show in shows])
+    except ValidationException as e:
+        return jsonify({'error': str(e)}), 400
     except DatabaseException as e:
         return jsonify({'error': str(e)}), 500
 
 @shows_bp.route('/api/past')
+@cached_response('shows:past', max_age=60)
 def api_past():
-    """API endpoint for past shows."""
+    """API endpoint for past shows (?fields= narrows keys)."""
     try:
+        fields = SHOW_FIELDS.parse(request.args.getlist('fields'))
+        serialize = SHOW_FIELDS.serializer(fields)
         show_service = ShowService()
-        shows = show_service.get_past_shows()
-        return jsonify([show.to_dict() for show in shows])
+        shows = show_service.get_past_shows(fields=fields)
+        return jsonify([serialize(show) for show in shows])
+    except ValidationException as e:
+        return jsonify({'error': str(e)}), 400
     except DatabaseException as e:
         return jsonify({'error': str(e)}), 500
 
 @shows_bp.route('/api/statistics')
+@cached_response('shows:statistics', max_age=60)
 def api_statistics():
     """API endpoint for show statistics."""
     try:
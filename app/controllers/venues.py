@@ -1,10 +1,14 @@
 """
 Venue controller for venue CRUD operations.
 """
-from flask import Blueprint, render_template, request, jsonify, redirect, url_for, flash
+from flask import Blueprint, render_template, request, jsonify, redirect, url_for, flash, session
 from app.services import VenueService
+from app.repositories import VENUE_FIELDS
 from app.schemas import VenueCreate, VenueUpdate
 from app.exceptions import VenueNotFoundException, DuplicateVenueException, DatabaseException, ValidationException
+from app.cache import cached_response, get_page_publisher, get_document_store, last_modified
+from app.utils.constants import DEFAULT_NEARBY_RADIUS_KM
+from app.utils.json_provider import wants_msgpack
 
 venues_bp = Blueprint('venues', __name__, url_prefix='/venues')
 
@@ -13,6 +17,8 @@ def index():
     """List all venues grouped by area."""
     try:
         venue_service = VenueService()
+        # Read before the rows, so a concurrent write can only make the render newer than its key
+        list_version = venue_service.get_list_version()
         areas = venue_service.get_areas()
         
         # Group venues by area
@@ -24,10 +30,12 @@ def index():
         
         return render_template('pages/venues.html', 
                              areas=areas,
-                             venues_by_area=venues_by_area)
+                             venues_by_area=venues_by_area,
+                             list_version=list_version)
     except DatabaseException as e:
         flash(f"Error loading venues: {str(e)}", 'error')
-        return render_template('pages/venues.html', areas=[], venues_by_area={})
+        # No list_version: the empty placeholder must not be cached
+        return render_template('pages/venues.html', areas=[], venues_by_area={}, list_version=None)
 
 @venues_bp.route('/search', methods=['POST'])
 def search():
@@ -57,6 +65,17 @@ def search():
 @venues_bp.route('/<int:venue_id>')
 def show(venue_id):
     """Show venue details."""
+    # Serve the pre-rendered page, with its stored Last-Modified, unless flashed messages must be shown
+    publisher = get_page_publisher()
+    if publisher is not None and not session.get('_flashes'):
+        page = publisher.read('venues', venue_id)
+        if page is not None:
+            return publisher.respond(page)
+    return _render_venue(venue_id=venue_id)
+
+@last_modified(lambda venue_id: VenueService().get_last_modified(venue_id))
+def _render_venue(venue_id):
+    """Render the venue page from the database."""
     try:
         venue_service = VenueService()
         venue_response = venue_service.get_venue_response(venue_id)
@@ -104,6 +123,8 @@ def create_submit():
             'website_link': request.form.get('website_link', '').strip(),
             'seeking_talent': bool(request.form.get('seeking_talent')),
             'seeking_description': request.form.get('seeking_description', '').strip(),
+            'latitude': request.form.get('latitude', type=float),
+            'longitude': request.form.get('longitude', type=float),
             'genres': request.form.getlist('genres')
         }
         
@@ -174,11 +195,16 @@ def edit_submit(venue_id):
             'website_link': request.form.get('website_link', '').strip(),
             'seeking_talent': bool(request.form.get('seeking_talent')),
             'seeking_description': request.form.get('seeking_description', '').strip(),
+            'latitude': request.form.get('latitude', type=float),
+            'longitude': request.form.get('longitude', type=float),
             'genres': request.form.getlist('genres')
         }
         
-        # Remove empty values
-        form_data = {k: v for k, v in form_data.items() if v}
+        # Remove empty values (0.0 is a valid coordinate, so those only when missing)
+        form_data = {
+            k: v for k, v in form_data.items()
+            if (v is not None if k in ('latitude', 'longitude') else v)
+        }
         
         # Update venue
         venue_update = VenueUpdate(**form_data)
@@ -226,18 +252,68 @@ def delete(venue_id):
 
 # API endpoints
 @venues_bp.route('/api')
+@cached_response('venues:list', max_age=30)
 def api_list():
-    """API endpoint to list all venues."""
+    """API endpoint to list all venues, optionally filtered by ?genre=...&match=any|all and ?fields=."""
     try:
+        fields = VENUE_FIELDS.parse(request.args.getlist('fields'))
+        serialize = VENUE_FIELDS.serializer(fields)
         venue_service = VenueService()
-        venues = venue_service.get_all()
-        return jsonify([venue.to_dict() for venue in venues])
+        genre_names = request.args.getlist('genre')
+        if genre_names:
+            match_all = request.args.get('match', 'any') == 'all'
+            venues = venue_service.get_venues_by_genres(genre_names, match_all=match_all, fields=fields)
+        else:
+            venues = venue_service.get_all(fields=fields)
+        return jsonify([serialize(venue) for venue in venues])
+    except ValidationException as e:
+        return jsonify({'error': str(e)}), 400
+    except DatabaseException as e:
+        return jsonify({'error': str(e)}), 500
+
+@venues_bp.route('/api/nearby')
+@cached_response('venues:nearby', max_age=60)
+def api_nearby():
+    """API endpoint for venues near a point: ?lat=&lng=&radius= (km)."""
+    lat = request.args.get('lat', type=float)
+    lng = request.args.get('lng', type=float)
+    radius = request.args.get('radius', DEFAULT_NEARBY_RADIUS_KM, type=float)
+    
+    if lat is None or lng is None:
+        return jsonify({'error': "Query parameters 'lat' and 'lng' are required numbers"}), 400
+    
+    try:
+        venue_service = VenueService()
+        return jsonify(venue_service.get_nearby_venues(lat, lng, radius))
+    except ValidationException as e:
+        return jsonify({'error': str(e)}), 400
     except DatabaseException as e:
         return jsonify({'error': str(e)}), 500
 
 @venues_bp.route('/api/<int:venue_id>')
+@cached_response('venues:detail:{venue_id}', max_age=30)
+@last_modified(lambda venue_id: VenueService().get_last_modified(venue_id))
 def api_show(venue_id):
-    """API endpoint to show venue details."""
+    """API endpoint to show venue details (?fields= picks keys of the list representation)."""
+    try:
+        fields = VENUE_FIELDS.parse(request.args.getlist('fields'))
+        if fields:
+            venue = VenueService().get_by_id(venue_id, fields=fields)
+            if venue is None:
+                return jsonify({'error': f"Venue with ID {venue_id} not found"}), 404
+            return jsonify(VENUE_FIELDS.serializer(fields)(venue))
+    except ValidationException as e:
+        return jsonify({'error': str(e)}), 400
+    except DatabaseException as e:
+        return jsonify({'error': str(e)}), 500
+    
+    # Stored documents are JSON; MessagePack clients take the live path
+    store = get_document_store()
+    if store is not None and not wants_msgpack():
+        document = store.read('venues', venue_id)
+        if document is not None:
+            return store.respond(document)
+    
     try:
         venue_service = VenueService()
         venue_response = venue_service.get_venue_response(venue_id)
@@ -245,6 +321,8 @@ def api_show(venue_id):
         if not venue_response:
             return jsonify({'error': f"Venue with ID {venue_id} not found"}), 404
         
+        if store is not None:
+            store.schedule([('venues', venue_id)])
         return jsonify(venue_response.model_dump())
     except VenueNotFoundException as e:
         return jsonify({'error': str(e)}), 404
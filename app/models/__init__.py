@@ -6,6 +6,9 @@ from app.models.venue import Venue, venue_genres
 from app.models.artist import Artist, artist_genres
 from app.models.show import Show
 from app.models.genre import Genre
+from app.models.read_document import ReadDocument
+from app.models.change_log import ChangeLogEntry, record_changes
+from app.models.show_aggregates import refresh_show_aggregates, stale_aggregate_ids
 
 __all__ = [
     'BaseModel',
@@ -14,6 +17,11 @@ __all__ = [
     'Artist', 
     'Show',
     'Genre',
+    'ReadDocument',
+    'ChangeLogEntry',
     'venue_genres',
-    'artist_genres'
+    'artist_genres',
+    'record_changes',
+    'refresh_show_aggregates',
+    'stale_aggregate_ids'
 ]
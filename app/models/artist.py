@@ -3,7 +3,11 @@ Artist model representing musical artists.
 """
 from datetime import datetime
 from typing import List, Optional
+from sqlalchemy import inspect
+from sqlalchemy.orm import validates
 from app.models.base import BaseModel, db
+from app.utils.formatters import normalize_key
+from app.utils.genres import genre_mask
 
 
 # Association table for artist-genre many-to-many relationship
@@ -33,6 +37,20 @@ class Artist(BaseModel):
     seeking_venue = db.Column(db.Boolean, default=False)
     seeking_description = db.Column(db.Text)
 
+    # Normalized lookup keys (lowercased, whitespace collapsed), kept in sync on write
+    name_key = db.Column(db.String(255), nullable=False)
+    city_key = db.Column(db.String(120), nullable=False)
+    state_key = db.Column(db.String(2), nullable=False)
+
+    # Denormalized genre bitmask (see app.utils.genres), kept in sync with `genres`
+    genre_mask = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+
+    # Materialized show aggregates (see app.models.show_aggregates)
+    num_upcoming_shows = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    num_past_shows = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    next_show_at = db.Column(db.DateTime)
+    last_show_at = db.Column(db.DateTime)
+
     # Relationships
     shows = db.relationship('Show', back_populates='artist', cascade='all, delete-orphan')
     genres = db.relationship('Genre', secondary=artist_genres, back_populates='artists')
@@ -42,11 +60,20 @@ class Artist(BaseModel):
         db.CheckConstraint("length(state) = 2", name='ck_artist_state_length'),
         db.Index('idx_artist_city_state', 'city', 'state'),
         db.Index('idx_artist_name', 'name'),
+        db.Index('idx_artist_name_city_key', 'name_key', 'city_key'),
+        db.Index('idx_artist_city_state_key', 'city_key', 'state_key'),
+        db.Index('idx_artist_next_show_at', 'next_show_at'),
     )
 
     def __repr__(self) -> str:
         return f'<Artist {self.name}>'
 
+    @validates('name', 'city', 'state')
+    def _sync_lookup_key(self, key: str, value: str) -> str:
+        """Keep the normalized lookup key in sync with its source column."""
+        setattr(self, f'{key}_key', normalize_key(value))
+        return value
+
     @property
     def upcoming_shows(self) -> List['Show']:
         """Get upcoming shows for this artist."""
@@ -85,6 +112,16 @@ class Artist(BaseModel):
             'past_shows': [show.to_dict() for show in self.past_shows],
             'upcoming_shows_count': self.upcoming_shows_count,
             'past_shows_count': self.past_shows_count,
+            'next_show_at': self.next_show_at.isoformat() if self.next_show_at else None,
+            'last_show_at': self.last_show_at.isoformat() if self.last_show_at else None,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
+
+
+@db.event.listens_for(Artist, 'before_insert')
+@db.event.listens_for(Artist, 'before_update')
+def _sync_genre_mask(mapper, connection, target: Artist) -> None:
+    """Recompute genre_mask at flush time whenever the genres collection changed."""
+    if target.genre_mask is None or inspect(target).attrs.genres.history.has_changes():
+        target.genre_mask = genre_mask(genre.name for genre in target.genres)
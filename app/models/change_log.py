@@ -0,0 +1,143 @@
+"""
+Change log behind the `/api/changes` sync feed.
+
+Every flush that creates, updates or deletes an artist, venue or show writes
+one `change_log` row per affected entity, in the same transaction, so the
+log commits or rolls back with the change itself. Rows carry a monotonically
+increasing sequence number that clients use as their sync cursor.
+
+The log is compacted as it is written: an entity keeps only its latest row,
+so a client catching up reads each changed entity once and the table grows
+with the number of entities (plus tombstones of deleted ones), not with the
+number of writes. Show writes also log their artist and venue as updated,
+since both embed show lists and counts; genre renames log every artist and
+venue tagged with the genre.
+
+Sequence numbers are handed out when a row is written, not at commit. SQLite
+serializes writers, so they also commit in order; with concurrent writers
+(PostgreSQL) a slow transaction can commit a lower number after a reader has
+moved past it, so clients there should resume from a slightly older cursor.
+"""
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from sqlalchemy import event, inspect, select
+
+from app.models.base import db
+from app.models.artist import Artist, artist_genres
+from app.models.venue import Venue, venue_genres
+from app.models.show import Show
+from app.models.genre import Genre
+
+CREATED, UPDATED, DELETED = 'created', 'updated', 'deleted'
+
+# Feed kind of each logged model (the API path prefix)
+CHANGE_KINDS = {Artist: 'artists', Venue: 'venues', Show: 'shows'}
+
+# session.info key: entities created earlier in the current transaction
+CREATED_KEY = 'change_log_created'
+
+# Keep IN lists well below SQLite's bound-parameter limit
+_ID_CHUNK = 500
+
+
+class ChangeLogEntry(db.Model):
+    """Latest change of one entity; `seq` orders the feed."""
+    __tablename__ = 'change_log'
+    
+    seq = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(16), nullable=False)  # 'artists', 'venues' or 'shows'
+    entity_id = db.Column(db.Integer, nullable=False)
+    operation = db.Column(db.String(8), nullable=False)  # CREATED, UPDATED or DELETED
+    changed_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    
+    __table_args__ = (
+        db.Index('idx_change_log_entity', 'kind', 'entity_id'),
+        # Never hand out a sequence number twice, even after compaction deleted the highest row
+        {'sqlite_autoincrement': True},
+    )
+    
+    def __repr__(self) -> str:
+        return f'<ChangeLogEntry {self.seq} {self.operation} {self.kind}/{self.entity_id}>'
+
+
+def record_changes(connection, changes: Dict[Tuple[str, int], str], now: Optional[datetime] = None) -> int:
+    """Log `changes` ({(kind, entity_id): operation}), replacing earlier rows of the same entities."""
+    if not changes:
+        return 0
+    table = ChangeLogEntry.__table__
+    now = now or datetime.utcnow()
+    
+    by_kind: Dict[str, list] = {}
+    for kind, entity_id in changes:
+        by_kind.setdefault(kind, []).append(entity_id)
+    for kind, ids in by_kind.items():
+        ids.sort()
+        for start in range(0, len(ids), _ID_CHUNK):
+            connection.execute(
+                table.delete().where(table.c.kind == kind, table.c.entity_id.in_(ids[start:start + _ID_CHUNK]))
+            )
+    
+    connection.execute(table.insert(), [
+        {'kind': kind, 'entity_id': entity_id, 'operation': operation, 'changed_at': now}
+        for (kind, entity_id), operation in sorted(changes.items())
+    ])
+    return len(changes)
+
+
+def _owner_changes(instance: Show, changes: Dict[Tuple[str, int], str]) -> None:
+    state = inspect(instance)
+    for attribute, kind in (('artist_id', 'artists'), ('venue_id', 'venues')):
+        history = state.attrs[attribute].history
+        for value in (*history.unchanged, *history.added, *history.deleted):
+            if value is not None:
+                changes.setdefault((kind, value), UPDATED)
+
+
+def _genre_changes(connection, genre: Genre, changes: Dict[Tuple[str, int], str]) -> None:
+    for link, column, kind in ((artist_genres, 'artist_id', 'artists'), (venue_genres, 'venue_id', 'venues')):
+        for (entity_id,) in connection.execute(select(link.c[column]).where(link.c.genre_id == genre.id)):
+            changes.setdefault((kind, entity_id), UPDATED)
+
+
+def _after_flush(session, flush_context) -> None:
+    changes: Dict[Tuple[str, int], str] = {}
+    
+    def collect(instances: Iterable, operation: str) -> None:
+        for instance in instances:
+            if isinstance(instance, Genre):
+                # Only a rename shows up in other rows; unused genres are the only ones deleted
+                if operation == UPDATED:
+                    _genre_changes(session.connection(), instance, changes)
+                continue
+            kind = CHANGE_KINDS.get(type(instance))
+            if kind is None or instance.id is None:
+                continue
+            changes[(kind, instance.id)] = operation
+            if isinstance(instance, Show):
+                _owner_changes(instance, changes)
+    
+    # Deletes go last: a tombstone replaces the owner update a cascaded show logged
+    collect(session.new, CREATED)
+    collect((instance for instance in session.dirty if session.is_modified(instance)), UPDATED)
+    collect(session.deleted, DELETED)
+    
+    if not changes:
+        return
+    # An entity created by an earlier flush of this transaction is still new to readers
+    created: Set[Tuple[str, int]] = session.info.setdefault(CREATED_KEY, set())
+    for key, operation in changes.items():
+        if operation == UPDATED and key in created:
+            changes[key] = CREATED
+        elif operation == CREATED:
+            created.add(key)
+    record_changes(session.connection(), changes)
+
+
+def _end_transaction(session) -> None:
+    session.info.pop(CREATED_KEY, None)
+
+
+event.listen(db.session, 'after_flush', _after_flush)
+event.listen(db.session, 'after_commit', _end_transaction)
+event.listen(db.session, 'after_rollback', _end_transaction)
@@ -0,0 +1,25 @@
+"""
+Read-model documents: the serialized JSON API body of an artist or venue.
+"""
+from datetime import datetime
+
+from app.models.base import db
+
+
+class ReadDocument(db.Model):
+    """One pre-serialized API document, keyed by entity kind and id."""
+    __tablename__ = 'read_documents'
+    
+    kind = db.Column(db.String(16), primary_key=True)  # 'artists' or 'venues'
+    entity_id = db.Column(db.Integer, primary_key=True)
+    body = db.Column(db.LargeBinary, nullable=False)
+    # Bumped on every rebuild; served as X-Document-Version
+    version = db.Column(db.Integer, nullable=False, default=1)
+    # The entity's updated_at when the document was built
+    source_updated_at = db.Column(db.DateTime)
+    # Start of the next upcoming show: the document's upcoming/past split is wrong after it
+    expires_at = db.Column(db.DateTime)
+    built_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    
+    def __repr__(self) -> str:
+        return f'<ReadDocument {self.kind}/{self.entity_id} v{self.version}>'
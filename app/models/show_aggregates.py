@@ -0,0 +1,92 @@
+"""
+Materialized per-entity show aggregates.
+
+Artists and venues carry denormalized columns (num_upcoming_shows,
+num_past_shows, next_show_at, last_show_at). Whenever a flush inserts, moves
+or deletes shows, the aggregates of the affected artists and venues are
+recomputed in the same transaction with one set-based UPDATE per table.
+Because shows move from upcoming to past as time passes, rows whose
+next_show_at has gone by are re-swept periodically (see
+ShowRepository.sweep_aggregates).
+
+Upcoming means start_time > now and past means start_time <= now, matching
+the upcoming_shows/past_shows model properties.
+"""
+from datetime import datetime
+from typing import Iterable, Optional, Set, Tuple
+
+from sqlalchemy import event, func, inspect, select
+
+from app.models.base import db
+from app.models.artist import Artist
+from app.models.venue import Venue
+from app.models.show import Show
+
+_OWNERS = (
+    (Artist.__table__, 'artist_id'),
+    (Venue.__table__, 'venue_id'),
+)
+
+# Keep IN lists well below SQLite's bound-parameter limit
+_ID_CHUNK = 500
+
+
+def _aggregate_values(table, foreign_key: str, now: datetime) -> dict:
+    shows = Show.__table__
+    owned = shows.c[foreign_key] == table.c.id
+    upcoming = shows.c.start_time > now
+    past = shows.c.start_time <= now
+    
+    def scalar(expression, condition):
+        return select(expression).select_from(shows).where(owned, condition).scalar_subquery()
+    
+    return {
+        'num_upcoming_shows': scalar(func.count(), upcoming),
+        'num_past_shows': scalar(func.count(), past),
+        'next_show_at': scalar(func.min(shows.c.start_time), upcoming),
+        'last_show_at': scalar(func.max(shows.c.start_time), past),
+    }
+
+
+def refresh_show_aggregates(connection, artist_ids: Iterable[int] = (), venue_ids: Iterable[int] = (),
+                            now: Optional[datetime] = None) -> int:
+    """Recompute the aggregates of the given artists and venues; returns rows updated."""
+    now = now or datetime.utcnow()
+    updated = 0
+    for (table, foreign_key), ids in zip(_OWNERS, (sorted(set(artist_ids)), sorted(set(venue_ids)))):
+        for start in range(0, len(ids), _ID_CHUNK):
+            chunk = ids[start:start + _ID_CHUNK]
+            updated += connection.execute(
+                table.update()
+                .where(table.c.id.in_(chunk))
+                .values(**_aggregate_values(table, foreign_key, now))
+            ).rowcount
+    return updated
+
+
+def stale_aggregate_ids(connection, now: Optional[datetime] = None) -> Tuple[Set[int], Set[int]]:
+    """Artists and venues whose next show has started since their last refresh."""
+    now = now or datetime.utcnow()
+    return tuple(
+        {row[0] for row in connection.execute(select(table.c.id).where(table.c.next_show_at <= now))}
+        for table, _ in _OWNERS
+    )
+
+
+def _after_flush(session, flush_context) -> None:
+    artist_ids: Set[int] = set()
+    venue_ids: Set[int] = set()
+    for instance in (*session.new, *session.dirty, *session.deleted):
+        if not isinstance(instance, Show):
+            continue
+        state = inspect(instance)
+        for attribute, ids in (('artist_id', artist_ids), ('venue_id', venue_ids)):
+            history = state.attrs[attribute].history
+            ids.update(value for value in (*history.unchanged, *history.added, *history.deleted)
+                       if value is not None)
+    
+    if artist_ids or venue_ids:
+        refresh_show_aggregates(session.connection(), artist_ids, venue_ids)
+
+
+event.listen(db.session, 'after_flush', _after_flush)
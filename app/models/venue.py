@@ -3,7 +3,12 @@ Venue model representing music venues.
 """
 from datetime import datetime
 from typing import List, Optional
+from sqlalchemy import inspect
+from sqlalchemy.orm import validates
 from app.models.base import BaseModel, db
+from app.utils.formatters import normalize_key
+from app.utils.genres import genre_mask
+from app.utils.geo import grid_cell
 
 
 # Association table for venue-genre many-to-many relationship
@@ -34,6 +39,25 @@ class Venue(BaseModel):
     seeking_talent = db.Column(db.Boolean, default=False)
     seeking_description = db.Column(db.Text)
 
+    # Location (optional) and its grid cell, kept in sync for nearby search
+    latitude = db.Column(db.Float)
+    longitude = db.Column(db.Float)
+    grid_cell = db.Column(db.Integer)
+
+    # Normalized lookup keys (lowercased, whitespace collapsed), kept in sync on write
+    name_key = db.Column(db.String(255), nullable=False)
+    city_key = db.Column(db.String(120), nullable=False)
+    state_key = db.Column(db.String(2), nullable=False)
+
+    # Denormalized genre bitmask (see app.utils.genres), kept in sync with `genres`
+    genre_mask = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+
+    # Materialized show aggregates (see app.models.show_aggregates)
+    num_upcoming_shows = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    num_past_shows = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    next_show_at = db.Column(db.DateTime)
+    last_show_at = db.Column(db.DateTime)
+
     # Relationships
     shows = db.relationship('Show', back_populates='venue', cascade='all, delete-orphan')
     genres = db.relationship('Genre', secondary=venue_genres, back_populates='venues')
@@ -44,11 +68,21 @@ class Venue(BaseModel):
         db.CheckConstraint("length(state) = 2", name='ck_venue_state_length'),
         db.Index('idx_venue_city_state', 'city', 'state'),
         db.Index('idx_venue_name', 'name'),
+        db.Index('idx_venue_name_city_key', 'name_key', 'city_key'),
+        db.Index('idx_venue_city_state_key', 'city_key', 'state_key'),
+        db.Index('idx_venue_next_show_at', 'next_show_at'),
+        db.Index('idx_venue_grid_cell', 'grid_cell'),
     )
 
     def __repr__(self) -> str:
         return f'<Venue {self.name}>'
 
+    @validates('name', 'city', 'state')
+    def _sync_lookup_key(self, key: str, value: str) -> str:
+        """Keep the normalized lookup key in sync with its source column."""
+        setattr(self, f'{key}_key', normalize_key(value))
+        return value
+
     @property
     def upcoming_shows(self) -> List['Show']:
         """Get upcoming shows for this venue."""
@@ -83,11 +117,30 @@ class Venue(BaseModel):
             'website_link': self.website_link,
             'seeking_talent': self.seeking_talent,
             'seeking_description': self.seeking_description,
+            'latitude': self.latitude,
+            'longitude': self.longitude,
             'genres': [genre.name for genre in self.genres],
             'upcoming_shows': [show.to_dict() for show in self.upcoming_shows],
             'past_shows': [show.to_dict() for show in self.past_shows],
             'upcoming_shows_count': self.upcoming_shows_count,
             'past_shows_count': self.past_shows_count,
+            'next_show_at': self.next_show_at.isoformat() if self.next_show_at else None,
+            'last_show_at': self.last_show_at.isoformat() if self.last_show_at else None,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
+
+
+@db.event.listens_for(Venue, 'before_insert')
+@db.event.listens_for(Venue, 'before_update')
+def _sync_genre_mask(mapper, connection, target: Venue) -> None:
+    """Recompute genre_mask at flush time whenever the genres collection changed."""
+    if target.genre_mask is None or inspect(target).attrs.genres.history.has_changes():
+        target.genre_mask = genre_mask(genre.name for genre in target.genres)
+
+
+@db.event.listens_for(Venue, 'before_insert')
+@db.event.listens_for(Venue, 'before_update')
+def _sync_grid_cell(mapper, connection, target: Venue) -> None:
+    """Recompute the grid cell from the current coordinates."""
+    target.grid_cell = grid_cell(target.latitude, target.longitude)
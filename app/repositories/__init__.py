@@ -6,11 +6,19 @@ from app.repositories.venue_repository import VenueRepository
 from app.repositories.artist_repository import ArtistRepository
 from app.repositories.show_repository import ShowRepository
 from app.repositories.genre_repository import GenreRepository
+from app.repositories.change_log_repository import ChangeLogRepository
+from app.repositories.fieldsets import ApiField, FieldSet, ARTIST_FIELDS, VENUE_FIELDS, SHOW_FIELDS
 
 __all__ = [
     'BaseRepository',
     'VenueRepository',
     'ArtistRepository',
     'ShowRepository',
-    'GenreRepository'
+    'GenreRepository',
+    'ChangeLogRepository',
+    'ApiField',
+    'FieldSet',
+    'ARTIST_FIELDS',
+    'VENUE_FIELDS',
+    'SHOW_FIELDS'
 ]
\ No newline at end of file
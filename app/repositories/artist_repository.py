@@ -1,39 +1,117 @@
 """
 Artist repository for database operations.
 """
-from typing import List, Optional, Dict, Any
+from datetime import datetime
+from typing import Iterable, Iterator, List, Optional, Dict, Any, Sequence, Set, Tuple
+from sqlalchemy import select
 from sqlalchemy.exc import SQLAlchemyError
-from app.models import Artist, Genre, Show, db
-from app.repositories.base import BaseRepository
+from app.models import Artist, Venue, Genre, Show, db
+from app.repositories.base import BaseRepository, changed_at
+from app.repositories.fieldsets import ARTIST_FIELDS
 from app.exceptions import DatabaseException, DuplicateArtistException
+from app.utils.formatters import normalize_key
+from app.utils.constants import GENRE_BITS
+from app.utils.genres import genre_mask
 
 class ArtistRepository(BaseRepository[Artist]):
     """Repository for Artist operations."""
     
+    fieldset = ARTIST_FIELDS
+    
     def __init__(self):
         super().__init__(Artist)
     
     def get_by_name_and_city(self, name: str, city: str) -> Optional[Artist]:
-        """Get artist by name and city."""
+        """Get artist by name and city (case- and whitespace-insensitive)."""
         try:
-            return Artist.query.filter_by(name=name, city=city).first()
+            return Artist.query.filter_by(
+                name_key=normalize_key(name),
+                city_key=normalize_key(city)
+            ).first()
         except SQLAlchemyError as e:
             raise DatabaseException(f"Error getting artist by name and city: {str(e)}")
     
+    def get_existing_keys(self, keys: Iterable[Tuple[str, str]]) -> Set[Tuple[str, str]]:
+        """The (name_key, city_key) pairs among `keys` that already belong to an artist."""
+        keys = set(keys)
+        try:
+            rows = db.session.execute(
+                select(Artist.name_key, Artist.city_key).where(Artist.name_key.in_({name for name, _ in keys}))
+            )
+            return {tuple(row) for row in rows} & keys
+        except SQLAlchemyError as e:
+            raise DatabaseException(f"Error checking existing artists: {str(e)}")
+    
     def get_by_city_state(self, city: str, state: str) -> List[Artist]:
-        """Get artists by city and state."""
+        """Get artists by city and state (case- and whitespace-insensitive)."""
         try:
-            return Artist.query.filter_by(city=city, state=state).all()
+            return Artist.query.filter_by(
+                city_key=normalize_key(city),
+                state_key=normalize_key(state)
+            ).all()
         except SQLAlchemyError as e:
             raise DatabaseException(f"Error getting artists by city and state: {str(e)}")
     
     def search_by_name(self, name: str) -> List[Artist]:
         """Search artists by name (partial match)."""
         try:
-            return Artist.query.filter(Artist.name.ilike(f'%{name}%')).all()
+            return Artist.query.filter(Artist.name_key.contains(normalize_key(name), autoescape=True)).all()
         except SQLAlchemyError as e:
             raise DatabaseException(f"Error searching artists by name: {str(e)}")
     
+    @staticmethod
+    def _genre_condition(genre_names: List[str], match_all: bool = False):
+        """Bitmask filter for any (or every) genre; None when nothing can match."""
+        wanted = genre_mask(genre_names)
+        if not wanted or (match_all and any(name not in GENRE_BITS for name in genre_names)):
+            return None
+        
+        masked = Artist.genre_mask.bitwise_and(wanted)
+        return masked == wanted if match_all else masked != 0
+    
+    def get_by_genres(self, genre_names: List[str], match_all: bool = False,
+                      fields: Optional[Sequence[str]] = None) -> List[Artist]:
+        """Get artists having any (or, with match_all, every) genre, using the genre bitmask."""
+        try:
+            condition = self._genre_condition(genre_names, match_all)
+            if condition is None:
+                return []
+            return Artist.query.options(*self.loader_options(fields)).filter(condition).all()
+        except SQLAlchemyError as e:
+            raise DatabaseException(f"Error getting artists by genres: {str(e)}")
+    
+    def iter_for_api(self, batch_size: int = 500, genre_names: Optional[List[str]] = None,
+                     match_all: bool = False, fields: Optional[Sequence[str]] = None) -> Iterator[Artist]:
+        """Stream artists with what to_dict() (or the sparse `fields`) reads, optionally filtered by genre."""
+        criteria = []
+        if genre_names:
+            condition = self._genre_condition(genre_names, match_all)
+            if condition is None:
+                return iter(())
+            criteria.append(condition)
+        
+        options = self.loader_options(fields) or (
+            db.selectinload(Artist.genres),
+            db.selectinload(Artist.shows).joinedload(Show.venue)
+        )
+        return self.iter_all(batch_size, criteria=criteria, options=options)
+    
+    def get_last_modified(self, artist_id: int, now: Optional[datetime] = None) -> Optional[datetime]:
+        """
+        When the artist's detail page/API last changed, from one indexed query.
+
+        Covers the artist row, its shows and their venues. A show that has
+        started since the last aggregate sweep moved from upcoming to past at
+        its start time, which no row records yet.
+        """
+        now = now or datetime.utcnow()
+        return self.latest_change(
+            select(changed_at(Artist)).where(Artist.id == artist_id),
+            select(Artist.next_show_at).where(Artist.id == artist_id, Artist.next_show_at <= now),
+            select(changed_at(Show)).where(Show.artist_id == artist_id),
+            select(changed_at(Venue)).join(Show, Show.venue_id == Venue.id).where(Show.artist_id == artist_id)
+        )
+    
     def get_with_shows(self, artist_id: int) -> Optional[Artist]:
         """Get artist with its shows."""
         try:
@@ -125,24 +203,17 @@ class ArtistRepository(BaseRepository[Artist]):
             raise DatabaseException(f"Error updating artist with genres: {str(e)}")
     
     def get_all_with_counts(self) -> List[Dict[str, Any]]:
-        """Get all artists with show counts."""
+        """Get all artists with show counts, read from the materialized aggregates."""
         try:
-            from datetime import datetime
-            artists = Artist.query.all()
-            result = []
-            
-            for artist in artists:
-                upcoming_count = Show.query.filter(
-                    Show.artist_id == artist.id,
-                    Show.start_time > datetime.utcnow()
-                ).count()
-                
-                result.append({
-                    'id': artist.id,
-                    'name': artist.name,
-                    'num_upcoming_shows': upcoming_count
-                })
-            
-            return result
+            rows = db.session.query(
+                Artist.id, Artist.name, Artist.num_upcoming_shows, Artist.num_past_shows, Artist.next_show_at
+            ).order_by(Artist.id)
+            return [{
+                'id': row.id,
+                'name': row.name,
+                'num_upcoming_shows': row.num_upcoming_shows,
+                'num_past_shows': row.num_past_shows,
+                'next_show_at': row.next_show_at
+            } for row in rows]
         except SQLAlchemyError as e:
             raise DatabaseException(f"Error getting artists with counts: {str(e)}")
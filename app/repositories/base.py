@@ -1,7 +1,9 @@
 """
 Base repository class with common CRUD operations.
 """
-from typing import TypeVar, Generic, List, Optional, Dict, Any
+from datetime import datetime
+from typing import TypeVar, Generic, Iterable, Iterator, List, Optional, Dict, Any, Sequence, Set
+from sqlalchemy import func, select, union_all
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 from app.models.base import BaseModel, db
@@ -9,12 +11,25 @@ from app.exceptions import DatabaseException
 
 T = TypeVar('T', bound=BaseModel)
 
+def changed_at(model):
+    """When a row last changed: updated_at, or created_at for rows never updated."""
+    return func.coalesce(model.updated_at, model.created_at).label('changed_at')
+
 class BaseRepository(Generic[T]):
     """Base repository with common CRUD operations."""
     
+    # Sparse fieldset of the model's API representation (see fieldsets.py)
+    fieldset = None
+    
     def __init__(self, model_class: type[T]):
         self.model_class = model_class
     
+    def loader_options(self, fields: Optional[Sequence[str]] = None) -> List[Any]:
+        """Loader options for a sparse fieldset; none when every field is wanted."""
+        if not fields or self.fieldset is None:
+            return []
+        return self.fieldset.loader_options(fields)
+    
     def create(self, **kwargs) -> T:
         """Create a new record."""
         try:
@@ -26,23 +41,76 @@ class BaseRepository(Generic[T]):
             db.session.rollback()
             raise DatabaseException(f"Error creating {self.model_class.__name__}: {str(e)}")
     
-    def get_by_id(self, id: int) -> Optional[T]:
-        """Get a record by ID."""
+    def create_many(self, instances: Sequence[T]) -> int:
+        """Insert already-built instances in one transaction; returns how many were added."""
+        try:
+            db.session.add_all(instances)
+            db.session.commit()
+            return len(instances)
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            raise DatabaseException(f"Error creating {self.model_class.__name__} records: {str(e)}")
+    
+    def existing_ids(self, ids: Iterable[int]) -> Set[int]:
+        """The subset of `ids` that exist."""
+        try:
+            return set(db.session.scalars(
+                select(self.model_class.id).where(self.model_class.id.in_(set(ids)))
+            ))
+        except SQLAlchemyError as e:
+            raise DatabaseException(f"Error checking {self.model_class.__name__} IDs: {str(e)}")
+    
+    def get_by_id(self, id: int, fields: Optional[Sequence[str]] = None) -> Optional[T]:
+        """Get a record by ID, loading only what `fields` needs when given."""
         try:
+            if fields:
+                return db.session.get(self.model_class, id, options=self.loader_options(fields))
             return self.model_class.query.get(id)
         except SQLAlchemyError as e:
             raise DatabaseException(f"Error getting {self.model_class.__name__} by ID: {str(e)}")
     
-    def get_all(self, limit: Optional[int] = None, offset: int = 0) -> List[T]:
-        """Get all records with optional pagination."""
+    def get_by_ids(self, ids: Iterable[int], fields: Optional[Sequence[str]] = None) -> List[T]:
+        """Get the records with the given IDs (missing ones are skipped), loading what `fields` reads."""
+        ids = sorted(set(ids))
+        options = self.fieldset.loader_options(fields or self.fieldset.fields) if self.fieldset is not None else []
         try:
-            query = self.model_class.query.offset(offset)
+            return list(db.session.scalars(
+                select(self.model_class).where(self.model_class.id.in_(ids)).options(*options)
+            ))
+        except SQLAlchemyError as e:
+            raise DatabaseException(f"Error getting {self.model_class.__name__} by IDs: {str(e)}")
+    
+    def get_all(self, limit: Optional[int] = None, offset: int = 0,
+                fields: Optional[Sequence[str]] = None) -> List[T]:
+        """Get all records with optional pagination and sparse fieldset."""
+        try:
+            query = self.model_class.query.options(*self.loader_options(fields)).offset(offset)
             if limit:
                 query = query.limit(limit)
             return query.all()
         except SQLAlchemyError as e:
             raise DatabaseException(f"Error getting all {self.model_class.__name__}: {str(e)}")
     
+    def iter_all(self, batch_size: int = 500, criteria: Iterable[Any] = (),
+                 options: Iterable[Any] = ()) -> Iterator[T]:
+        """
+        Stream records in primary-key order, fetching `batch_size` rows at a time.
+        
+        Uses yield_per, so rows come from a server-side cursor where the
+        driver supports one and loaded instances are not kept by the session.
+        """
+        statement = (
+            select(self.model_class)
+            .where(*criteria)
+            .options(*options)
+            .order_by(self.model_class.id)
+            .execution_options(yield_per=batch_size)
+        )
+        try:
+            yield from db.session.scalars(statement)
+        except SQLAlchemyError as e:
+            raise DatabaseException(f"Error streaming {self.model_class.__name__}: {str(e)}")
+    
     def update(self, id: int, **kwargs) -> Optional[T]:
         """Update a record by ID."""
         try:
@@ -74,6 +142,24 @@ class BaseRepository(Generic[T]):
             db.session.rollback()
             raise DatabaseException(f"Error deleting {self.model_class.__name__}: {str(e)}")
     
+    def latest_change(self, *statements) -> Optional[datetime]:
+        """The newest timestamp among single-column `statements`, in one query (None when all are empty)."""
+        try:
+            changes = union_all(*statements).subquery()
+            return db.session.scalar(select(func.max(changes.c[0])))
+        except SQLAlchemyError as e:
+            raise DatabaseException(f"Error getting last change of {self.model_class.__name__}: {str(e)}")
+    
+    def list_version(self) -> str:
+        """Row count and newest change of the table, for keying cached list renders."""
+        try:
+            count, latest = db.session.execute(select(
+                func.count(), func.max(func.coalesce(self.model_class.updated_at, self.model_class.created_at))
+            )).one()
+            return f"{count}:{latest.isoformat() if latest else ''}"
+        except SQLAlchemyError as e:
+            raise DatabaseException(f"Error getting list version of {self.model_class.__name__}: {str(e)}")
+    
     def count(self) -> int:
         """Count total records."""
         try:
@@ -0,0 +1,23 @@
+"""
+Change log repository for the /api/changes feed.
+"""
+from typing import List
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+from app.models import ChangeLogEntry, db
+from app.exceptions import DatabaseException
+
+class ChangeLogRepository:
+    """Reads the change log in sequence order."""
+    
+    def get_since(self, cursor: int, limit: int) -> List[ChangeLogEntry]:
+        """Entries with a sequence number above `cursor`, oldest first."""
+        try:
+            return list(db.session.scalars(
+                select(ChangeLogEntry)
+                .where(ChangeLogEntry.seq > cursor)
+                .order_by(ChangeLogEntry.seq)
+                .limit(limit)
+            ))
+        except SQLAlchemyError as e:
+            raise DatabaseException(f"Error reading change log: {str(e)}")
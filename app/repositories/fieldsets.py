@@ -0,0 +1,147 @@
+"""
+Sparse fieldsets for the JSON API (`?fields=id,name,image_link`).
+
+Every key of a model's to_dict() representation is declared as an ApiField:
+how to read it from an instance, which columns it needs and which
+relationship loaders. A FieldSet turns a requested subset into loader
+options (load_only for the columns, a selectin/joined load per needed
+relationship, raiseload for everything else), so unrequested relationships
+are never loaded, and into a serializer that emits only the requested keys.
+The API routes serialize full rows through the same serializers.
+
+Show counts are read from the materialized num_upcoming_shows/num_past_shows
+columns instead of loading every show. Datetimes stay datetime objects: the
+API encoders write them (ISO 8601 in JSON, Timestamp extensions in msgpack).
+"""
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy.orm import joinedload, load_only, raiseload, selectinload
+
+from app.exceptions import ValidationException
+from app.models import Artist, Venue, Show, Genre
+
+
+@dataclass(frozen=True)
+class ApiField:
+    """One serialized key: its getter, the columns it reads and the loaders it needs."""
+    get: Callable[[Any], Any]
+    columns: Tuple[str, ...] = ()
+    loads: Tuple[Callable[[], Any], ...] = ()  # loader option factories, shared between fields
+
+
+class FieldSet:
+    """The selectable fields of one model's API representation."""
+    
+    def __init__(self, model, fields: Dict[str, ApiField]):
+        self.model = model
+        self.fields = fields
+    
+    def parse(self, values: Iterable[str]) -> Optional[Tuple[str, ...]]:
+        """
+        Field names from ?fields= values (comma-separated and/or repeated).
+
+        Returns None when no fields were requested; raises ValidationException
+        naming any unknown field.
+        """
+        names = [name.strip() for value in values for name in value.split(',') if name.strip()]
+        if not names:
+            return None
+        unknown = [name for name in names if name not in self.fields]
+        if unknown:
+            raise ValidationException(
+                f"Unknown field(s): {', '.join(unknown)}. Available: {', '.join(self.fields)}"
+            )
+        return tuple(dict.fromkeys(names))
+    
+    def loader_options(self, names: Iterable[str]) -> List[Any]:
+        """Loader options that fetch exactly what the named fields read."""
+        selected = [self.fields[name] for name in names]
+        columns = dict.fromkeys(column for field in selected for column in field.columns)
+        factories = dict.fromkeys(factory for field in selected for factory in field.loads)
+        return [
+            load_only(*(getattr(self.model, column) for column in columns), raiseload=True),
+            *(factory() for factory in factories),
+            raiseload('*', sql_only=True)
+        ]
+    
+    def serializer(self, names: Optional[Iterable[str]] = None) -> Callable[[Any], Dict[str, Any]]:
+        """Function turning an instance into a dict of the named fields (default: all), in request order."""
+        getters = [(name, self.fields[name].get) for name in (names or self.fields)]
+        return lambda instance: {name: get(instance) for name, get in getters}
+
+
+def _column(name: str) -> ApiField:
+    return ApiField(get=lambda instance: getattr(instance, name), columns=(name,))
+
+
+def _owner_fields(model, columns: Tuple[str, ...]) -> Dict[str, ApiField]:
+    """Fields shared by artists and venues, in to_dict() order after `columns`."""
+    # A show row reads the owner's name and image through show.artist/show.venue
+    show_columns = ('name', 'image_link')
+    other = Venue if model is Artist else Artist
+    other_side = Show.venue if model is Artist else Show.artist
+    
+    def load_genres():
+        return selectinload(model.genres).load_only(Genre.name)
+    
+    def load_shows():
+        return selectinload(model.shows).options(
+            joinedload(other_side).load_only(other.name, other.image_link)
+        )
+    
+    return {
+        **{name: _column(name) for name in columns},
+        'genres': ApiField(get=lambda instance: [genre.name for genre in instance.genres], loads=(load_genres,)),
+        'upcoming_shows': ApiField(
+            get=lambda instance: [_show_row(show) for show in instance.upcoming_shows],
+            columns=show_columns, loads=(load_shows,)
+        ),
+        'past_shows': ApiField(
+            get=lambda instance: [_show_row(show) for show in instance.past_shows],
+            columns=show_columns, loads=(load_shows,)
+        ),
+        'upcoming_shows_count': ApiField(get=lambda instance: instance.num_upcoming_shows,
+                                         columns=('num_upcoming_shows',)),
+        'past_shows_count': ApiField(get=lambda instance: instance.num_past_shows, columns=('num_past_shows',)),
+        'next_show_at': _column('next_show_at'),
+        'last_show_at': _column('last_show_at'),
+        'created_at': _column('created_at'),
+        'updated_at': _column('updated_at'),
+    }
+
+
+def _load_show_artist():
+    return joinedload(Show.artist).load_only(Artist.name, Artist.image_link)
+
+
+def _load_show_venue():
+    return joinedload(Show.venue).load_only(Venue.name, Venue.image_link)
+
+
+ARTIST_FIELDS = FieldSet(Artist, _owner_fields(Artist, (
+    'id', 'name', 'city', 'state', 'phone', 'image_link', 'facebook_link', 'website_link',
+    'seeking_venue', 'seeking_description'
+)))
+
+VENUE_FIELDS = FieldSet(Venue, _owner_fields(Venue, (
+    'id', 'name', 'city', 'state', 'address', 'phone', 'image_link', 'facebook_link', 'website_link',
+    'seeking_talent', 'seeking_description', 'latitude', 'longitude'
+)))
+
+SHOW_FIELDS = FieldSet(Show, {
+    'id': _column('id'),
+    'artist_id': _column('artist_id'),
+    'artist_name': ApiField(get=lambda show: show.artist.name, columns=('artist_id',), loads=(_load_show_artist,)),
+    'artist_image_link': ApiField(get=lambda show: show.artist.image_link, columns=('artist_id',),
+                                  loads=(_load_show_artist,)),
+    'venue_id': _column('venue_id'),
+    'venue_name': ApiField(get=lambda show: show.venue.name, columns=('venue_id',), loads=(_load_show_venue,)),
+    'venue_image_link': ApiField(get=lambda show: show.venue.image_link, columns=('venue_id',),
+                                 loads=(_load_show_venue,)),
+    'start_time': _column('start_time'),
+    'created_at': _column('created_at'),
+    'updated_at': _column('updated_at'),
+})
+
+_show_row = SHOW_FIELDS.serializer()
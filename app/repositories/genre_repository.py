@@ -1,7 +1,7 @@
 """
 Genre repository for database operations.
 """
-from typing import List, Optional, Dict, Any
+from typing import Iterable, List, Optional, Dict, Any
 from sqlalchemy.exc import SQLAlchemyError
 from app.models import Genre, Artist, Venue, db
 from app.repositories.base import BaseRepository
@@ -20,6 +20,13 @@ class GenreRepository(BaseRepository[Genre]):
         except SQLAlchemyError as e:
             raise DatabaseException(f"Error getting genre by name: {str(e)}")
     
+    def get_by_names(self, names: Iterable[str]) -> Dict[str, Genre]:
+        """Genres by name for every name in `names` that exists."""
+        try:
+            return {genre.name: genre for genre in Genre.query.filter(Genre.name.in_(set(names)))}
+        except SQLAlchemyError as e:
+            raise DatabaseException(f"Error getting genres by name: {str(e)}")
+    
     def get_or_create(self, name: str) -> Genre:
         """Get existing genre or create new one."""
         try:
@@ -1,15 +1,20 @@
 """
 Show repository for database operations.
 """
-from typing import List, Optional, Dict, Any
+from datetime import datetime
+from typing import Iterable, Iterator, List, Optional, Dict, Any, Sequence, Set, Tuple
+from sqlalchemy import or_, select
 from sqlalchemy.exc import SQLAlchemyError
-from app.models import Show, Artist, Venue, db
-from app.repositories.base import BaseRepository
+from app.models import Show, Artist, Venue, db, record_changes, refresh_show_aggregates, stale_aggregate_ids
+from app.repositories.base import BaseRepository, changed_at
+from app.repositories.fieldsets import SHOW_FIELDS
 from app.exceptions import DatabaseException
 
 class ShowRepository(BaseRepository[Show]):
     """Repository for Show operations."""
     
+    fieldset = SHOW_FIELDS
+    
     def __init__(self):
         super().__init__(Show)
     
@@ -27,22 +32,22 @@ class ShowRepository(BaseRepository[Show]):
         except SQLAlchemyError as e:
             raise DatabaseException(f"Error getting show by venue and time: {str(e)}")
     
-    def get_upcoming_shows(self, limit: Optional[int] = None) -> List[Show]:
+    def get_upcoming_shows(self, limit: Optional[int] = None, fields: Optional[Sequence[str]] = None) -> List[Show]:
         """Get all upcoming shows."""
         try:
             from datetime import datetime
-            query = Show.query.filter(Show.start_time > datetime.utcnow())
+            query = Show.query.options(*self.loader_options(fields)).filter(Show.start_time > datetime.utcnow())
             if limit:
                 query = query.limit(limit)
             return query.all()
         except SQLAlchemyError as e:
             raise DatabaseException(f"Error getting upcoming shows: {str(e)}")
     
-    def get_past_shows(self, limit: Optional[int] = None) -> List[Show]:
+    def get_past_shows(self, limit: Optional[int] = None, fields: Optional[Sequence[str]] = None) -> List[Show]:
         """Get all past shows."""
         try:
             from datetime import datetime
-            query = Show.query.filter(Show.start_time < datetime.utcnow())
+            query = Show.query.options(*self.loader_options(fields)).filter(Show.start_time < datetime.utcnow())
             if limit:
                 query = query.limit(limit)
             return query.all()
@@ -63,6 +68,23 @@ class ShowRepository(BaseRepository[Show]):
         except SQLAlchemyError as e:
             raise DatabaseException(f"Error getting shows by venue: {str(e)}")
     
+    def get_booked_slots(self, artist_ids: Iterable[int], venue_ids: Iterable[int],
+                         start_times: Iterable[datetime]) -> Tuple[Set[Tuple[int, datetime]], Set[Tuple[int, datetime]]]:
+        """Existing (artist_id, start_time) and (venue_id, start_time) pairs among the given values."""
+        artist_ids, venue_ids = set(artist_ids), set(venue_ids)
+        try:
+            rows = db.session.execute(
+                select(Show.artist_id, Show.venue_id, Show.start_time)
+                .where(Show.start_time.in_(set(start_times)))
+                .where(or_(Show.artist_id.in_(artist_ids), Show.venue_id.in_(venue_ids)))
+            ).all()
+            return (
+                {(row.artist_id, row.start_time) for row in rows if row.artist_id in artist_ids},
+                {(row.venue_id, row.start_time) for row in rows if row.venue_id in venue_ids}
+            )
+        except SQLAlchemyError as e:
+            raise DatabaseException(f"Error checking booked show slots: {str(e)}")
+    
     def create_with_validation(self, artist_id: int, venue_id: int, start_time) -> Show:
         """Create show with validation."""
         try:
@@ -94,6 +116,54 @@ class ShowRepository(BaseRepository[Show]):
             db.session.rollback()
             raise DatabaseException(f"Error creating show: {str(e)}")
     
+    def list_version(self) -> str:
+        """Shows list version, also covering the artists and venues the tiles display."""
+        return f"{super().list_version()}:{self.latest_change(select(changed_at(Artist)), select(changed_at(Venue)))}"
+    
+    def get_last_modified(self, show_id: int) -> Optional[datetime]:
+        """When the show's detail page/API last changed: the show, its artist or its venue."""
+        return self.latest_change(
+            select(changed_at(Show)).where(Show.id == show_id),
+            select(changed_at(Artist)).join(Show, Show.artist_id == Artist.id).where(Show.id == show_id),
+            select(changed_at(Venue)).join(Show, Show.venue_id == Venue.id).where(Show.id == show_id)
+        )
+    
+    def sweep_aggregates(self, now=None) -> Tuple[Set[int], Set[int]]:
+        """
+        Re-sweep artists and venues whose next show has started.
+        
+        Show writes keep the aggregates current on their own; this moves
+        shows from upcoming to past as time passes. Returns the ids of the
+        (artists, venues) refreshed.
+        """
+        try:
+            connection = db.session.connection()
+            artist_ids, venue_ids = stale_aggregate_ids(connection, now)
+            if artist_ids or venue_ids:
+                refresh_show_aggregates(connection, artist_ids, venue_ids, now)
+                # Their show counts changed: tell /api/changes readers
+                record_changes(connection, {
+                    **{('artists', artist_id): 'updated' for artist_id in artist_ids},
+                    **{('venues', venue_id): 'updated' for venue_id in venue_ids}
+                })
+            db.session.commit()
+            return artist_ids, venue_ids
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            raise DatabaseException(f"Error sweeping show aggregates: {str(e)}")
+    
+    def rebuild_aggregates(self) -> int:
+        """Recompute the aggregates of every artist and venue."""
+        try:
+            artist_ids = [row[0] for row in db.session.query(Artist.id)]
+            venue_ids = [row[0] for row in db.session.query(Venue.id)]
+            updated = refresh_show_aggregates(db.session.connection(), artist_ids, venue_ids)
+            db.session.commit()
+            return updated
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            raise DatabaseException(f"Error rebuilding show aggregates: {str(e)}")
+    
     def get_recent_shows(self, days: int = 30, limit: Optional[int] = None) -> List[Show]:
         """Get recent shows within specified days."""
         try:
@@ -116,6 +186,35 @@ class ShowRepository(BaseRepository[Show]):
         except SQLAlchemyError as e:
             raise DatabaseException(f"Error getting shows by date range: {str(e)}")
     
+    def iter_with_details(self, batch_size: int = 500, fields: Optional[Sequence[str]] = None) -> Iterator[Show]:
+        """Stream shows with their artist and venue (or just the sparse `fields`) in the same query."""
+        options = self.loader_options(fields) or (db.joinedload(Show.artist), db.joinedload(Show.venue))
+        return self.iter_all(batch_size, options=options)
+    
+    def get_columns(self) -> Tuple[List[Any], List[Any], List[Any]]:
+        """
+        Plain rows for the columnar show encoding, without building ORM objects.
+
+        Returns (shows, artists, venues): show columns in id order, plus the
+        id/name/image_link of each artist and venue that has a show.
+        """
+        try:
+            shows = db.session.execute(
+                db.select(Show.id, Show.artist_id, Show.venue_id, Show.start_time, Show.created_at, Show.updated_at)
+                .order_by(Show.id)
+            ).all()
+            artists = db.session.execute(
+                db.select(Artist.id, Artist.name, Artist.image_link)
+                .where(Artist.id.in_(db.select(Show.artist_id))).order_by(Artist.id)
+            ).all()
+            venues = db.session.execute(
+                db.select(Venue.id, Venue.name, Venue.image_link)
+                .where(Venue.id.in_(db.select(Show.venue_id))).order_by(Venue.id)
+            ).all()
+            return shows, artists, venues
+        except SQLAlchemyError as e:
+            raise DatabaseException(f"Error getting show columns: {str(e)}")
+    
     def get_all_with_details(self) -> List[Dict[str, Any]]:
         """Get all shows with artist and venue details."""
         try:
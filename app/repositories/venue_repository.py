@@ -1,39 +1,116 @@
 """
 Venue repository for database operations.
 """
-from typing import List, Optional, Dict, Any
+from datetime import datetime
+from typing import Iterable, List, Optional, Dict, Any, Sequence, Set, Tuple
+from sqlalchemy import select
 from sqlalchemy.exc import SQLAlchemyError
-from app.models import Venue, Genre, Show, db
-from app.repositories.base import BaseRepository
+from app.models import Artist, Venue, Genre, Show, db
+from app.repositories.base import BaseRepository, changed_at
+from app.repositories.fieldsets import VENUE_FIELDS
 from app.exceptions import DatabaseException, DuplicateVenueException
+from app.utils.formatters import normalize_key
+from app.utils.constants import GENRE_BITS
+from app.utils.genres import genre_mask
+from app.utils.geo import grid_cell_ranges, haversine_many_km
 
 class VenueRepository(BaseRepository[Venue]):
     """Repository for Venue operations."""
     
+    fieldset = VENUE_FIELDS
+    
     def __init__(self):
         super().__init__(Venue)
     
     def get_by_name_and_city(self, name: str, city: str) -> Optional[Venue]:
-        """Get venue by name and city."""
+        """Get venue by name and city (case- and whitespace-insensitive)."""
         try:
-            return Venue.query.filter_by(name=name, city=city).first()
+            return Venue.query.filter_by(
+                name_key=normalize_key(name),
+                city_key=normalize_key(city)
+            ).first()
         except SQLAlchemyError as e:
             raise DatabaseException(f"Error getting venue by name and city: {str(e)}")
     
+    def get_existing_keys(self, keys: Iterable[Tuple[str, str]]) -> Set[Tuple[str, str]]:
+        """The (name_key, city_key) pairs among `keys` that already belong to a venue."""
+        keys = set(keys)
+        try:
+            rows = db.session.execute(
+                select(Venue.name_key, Venue.city_key).where(Venue.name_key.in_({name for name, _ in keys}))
+            )
+            return {tuple(row) for row in rows} & keys
+        except SQLAlchemyError as e:
+            raise DatabaseException(f"Error checking existing venues: {str(e)}")
+    
     def get_by_city_state(self, city: str, state: str) -> List[Venue]:
-        """Get venues by city and state."""
+        """Get venues by city and state (case- and whitespace-insensitive)."""
         try:
-            return Venue.query.filter_by(city=city, state=state).all()
+            return Venue.query.filter_by(
+                city_key=normalize_key(city),
+                state_key=normalize_key(state)
+            ).all()
         except SQLAlchemyError as e:
             raise DatabaseException(f"Error getting venues by city and state: {str(e)}")
     
     def search_by_name(self, name: str) -> List[Venue]:
         """Search venues by name (partial match)."""
         try:
-            return Venue.query.filter(Venue.name.ilike(f'%{name}%')).all()
+            return Venue.query.filter(Venue.name_key.contains(normalize_key(name), autoescape=True)).all()
         except SQLAlchemyError as e:
             raise DatabaseException(f"Error searching venues by name: {str(e)}")
     
+    def get_by_genres(self, genre_names: List[str], match_all: bool = False,
+                      fields: Optional[Sequence[str]] = None) -> List[Venue]:
+        """Get venues having any (or, with match_all, every) genre, using the genre bitmask."""
+        try:
+            wanted = genre_mask(genre_names)
+            if not wanted or (match_all and any(name not in GENRE_BITS for name in genre_names)):
+                return []
+            
+            masked = Venue.genre_mask.bitwise_and(wanted)
+            condition = masked == wanted if match_all else masked != 0
+            return Venue.query.options(*self.loader_options(fields)).filter(condition).all()
+        except SQLAlchemyError as e:
+            raise DatabaseException(f"Error getting venues by genres: {str(e)}")
+    
+    def get_nearby(self, lat: float, lng: float, radius_km: float) -> List[Tuple[Venue, float]]:
+        """Get venues within radius_km of a point, nearest first, with their distances."""
+        try:
+            from sqlalchemy import or_
+            # Prune by grid cell (indexed range scans), then refine by exact distance
+            ranges = grid_cell_ranges(lat, lng, radius_km)
+            candidates = Venue.query.filter(
+                or_(*[Venue.grid_cell.between(first, last) for first, last in ranges])
+            ).all()
+            
+            distances = haversine_many_km(lat, lng, [(venue.latitude, venue.longitude) for venue in candidates])
+            nearby = [
+                (venue, distance)
+                for venue, distance in zip(candidates, distances)
+                if distance <= radius_km
+            ]
+            nearby.sort(key=lambda item: item[1])
+            return nearby
+        except SQLAlchemyError as e:
+            raise DatabaseException(f"Error getting nearby venues: {str(e)}")
+    
+    def get_last_modified(self, venue_id: int, now: Optional[datetime] = None) -> Optional[datetime]:
+        """
+        When the venue's detail page/API last changed, from one indexed query.
+
+        Covers the venue row, its shows and their artists. A show that has
+        started since the last aggregate sweep moved from upcoming to past at
+        its start time, which no row records yet.
+        """
+        now = now or datetime.utcnow()
+        return self.latest_change(
+            select(changed_at(Venue)).where(Venue.id == venue_id),
+            select(Venue.next_show_at).where(Venue.id == venue_id, Venue.next_show_at <= now),
+            select(changed_at(Show)).where(Show.venue_id == venue_id),
+            select(changed_at(Artist)).join(Show, Show.artist_id == Artist.id).where(Show.venue_id == venue_id)
+        )
+    
     def get_with_shows(self, venue_id: int) -> Optional[Venue]:
         """Get venue with its shows."""
         try:
@@ -125,42 +202,34 @@ class VenueRepository(BaseRepository[Venue]):
             raise DatabaseException(f"Error updating venue with genres: {str(e)}")
     
     def get_all_with_counts(self) -> List[Dict[str, Any]]:
-        """Get all venues with show counts."""
+        """Get all venues with show counts, read from the materialized aggregates."""
         try:
-            from datetime import datetime
-            venues = Venue.query.all()
-            result = []
-            
-            for venue in venues:
-                upcoming_count = Show.query.filter(
-                    Show.venue_id == venue.id,
-                    Show.start_time > datetime.utcnow()
-                ).count()
-                
-                result.append({
-                    'id': venue.id,
-                    'name': venue.name,
-                    'num_upcoming_shows': upcoming_count
-                })
-            
-            return result
+            rows = db.session.query(
+                Venue.id, Venue.name, Venue.num_upcoming_shows, Venue.num_past_shows, Venue.next_show_at
+            ).order_by(Venue.id)
+            return [{
+                'id': row.id,
+                'name': row.name,
+                'num_upcoming_shows': row.num_upcoming_shows,
+                'num_past_shows': row.num_past_shows,
+                'next_show_at': row.next_show_at
+            } for row in rows]
         except SQLAlchemyError as e:
             raise DatabaseException(f"Error getting venues with counts: {str(e)}")
     
     def get_areas(self) -> List[Dict[str, Any]]:
-        """Get unique city/state combinations (areas)."""
+        """Get unique city/state combinations (areas), grouped by normalized keys."""
         try:
-            areas = db.session.query(Venue.city, Venue.state).distinct().all()
-            result = []
-            
-            for city, state in areas:
-                venue_count = Venue.query.filter_by(city=city, state=state).count()
-                result.append({
-                    'city': city,
-                    'state': state,
-                    'venues': venue_count
-                })
+            from sqlalchemy import func
+            areas = db.session.query(
+                func.min(Venue.city),
+                func.min(Venue.state),
+                func.count(Venue.id)
+            ).group_by(Venue.city_key, Venue.state_key).order_by(Venue.state_key, Venue.city_key).all()
             
-            return result
+            return [
+                {'city': city, 'state': state, 'venues': venue_count}
+                for city, state, venue_count in areas
+            ]
         except SQLAlchemyError as e:
-            raise DatabaseException(f"Error getting areas: {str(e)}")
+            raise DatabaseException(f"Error getting areas: {str(e)}")
\ No newline at end of file
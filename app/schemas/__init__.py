@@ -1,7 +1,7 @@
 """
 Schemas package for Fyyur application.
 """
-from app.schemas.common import BaseSchema, TimestampMixin
+from app.schemas.common import BaseSchema, TimestampMixin, ReadSchema
 from app.schemas.venue_schema import (
     VenueCreate, VenueUpdate, VenueResponse, VenueListItem, VenueSearchResponse
 )
@@ -9,12 +9,13 @@ from app.schemas.artist_schema import (
     ArtistCreate, ArtistUpdate, ArtistResponse, ArtistListItem, ArtistSearchResponse
 )
 from app.schemas.show_schema import (
-    ShowCreate, ShowResponse, ShowListItem
+    ShowCreate, ShowResponse, ShowListItem, ShowSummary
 )
 
 __all__ = [
     'BaseSchema',
     'TimestampMixin',
+    'ReadSchema',
     'VenueCreate',
     'VenueUpdate', 
     'VenueResponse',
@@ -27,5 +28,6 @@ __all__ = [
     'ArtistSearchResponse',
     'ShowCreate',
     'ShowResponse',
-    'ShowListItem'
+    'ShowListItem',
+    'ShowSummary'
 ]
@@ -5,7 +5,8 @@ from typing import List, Optional
 from pydantic import BaseModel, Field, HttpUrl, field_validator
 from datetime import datetime
 
-from app.schemas.common import BaseSchema, TimestampMixin
+from app.schemas.common import BaseSchema, ReadSchema
+from app.schemas.show_schema import ShowSummary
 
 
 class ArtistBase(BaseSchema):
@@ -64,23 +65,37 @@ class ArtistUpdate(BaseSchema):
     seeking_description: Optional[str] = Field(None, max_length=500)
 
 
-class ArtistResponse(ArtistBase, TimestampMixin):
+class ArtistResponse(ReadSchema):
     """Complete artist response schema."""
     id: int
+    name: str
+    city: str
+    state: str
+    phone: Optional[str] = None
+    image_link: Optional[str] = None
+    facebook_link: Optional[str] = None
+    website_link: Optional[str] = None
+    genres: List[str] = []
+    seeking_venue: bool = False
+    seeking_description: Optional[str] = None
+    created_at: datetime
+    updated_at: Optional[datetime] = None
     num_upcoming_shows: int = 0
     num_past_shows: int = 0
-    past_shows: List[dict] = []
-    upcoming_shows: List[dict] = []
+    past_shows: List[ShowSummary] = []
+    upcoming_shows: List[ShowSummary] = []
 
 
-class ArtistListItem(BaseSchema):
+class ArtistListItem(ReadSchema):
     """Artist list item schema."""
     id: int
     name: str
     num_upcoming_shows: int = 0
+    num_past_shows: int = 0
+    next_show_at: Optional[datetime] = None
 
 
-class ArtistSearchResponse(BaseSchema):
+class ArtistSearchResponse(ReadSchema):
     """Artist search response schema."""
     count: int
     data: List[ArtistListItem]
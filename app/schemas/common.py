@@ -15,3 +15,17 @@ class TimestampMixin(BaseModel):
     """Mixin for timestamps."""
     created_at: datetime
     updated_at: Optional[datetime] = None
+
+
+class ReadSchema(BaseModel):
+    """
+    Base for read-side response schemas.
+
+    Responses are built from rows the write-side schemas already validated,
+    so read schemas declare plain types only: no field validators, patterns or
+    URL parsing. Building one is then a single pass through pydantic-core,
+    which on pydantic 2.12 is faster than skipping validation with
+    model_construct() (see scripts/bench_schemas.py).
+    """
+    model_config = ConfigDict(from_attributes=True)
+
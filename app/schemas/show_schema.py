@@ -2,9 +2,10 @@
 Show schemas for validation and serialization.
 """
 from datetime import datetime
+from typing import Optional
 from pydantic import BaseModel, Field, field_validator
 
-from app.schemas.common import BaseSchema, TimestampMixin
+from app.schemas.common import BaseSchema, ReadSchema
 
 
 class ShowBase(BaseSchema):
@@ -27,18 +28,36 @@ class ShowCreate(ShowBase):
     pass
 
 
-class ShowResponse(ShowBase, TimestampMixin):
+class ShowResponse(ReadSchema):
     """Complete show response schema."""
     id: int
+    artist_id: int
     artist_name: str
-    artist_image_link: str | None = None
+    artist_image_link: Optional[str] = None
+    venue_id: int
     venue_name: str
-    venue_image_link: str | None = None
+    venue_image_link: Optional[str] = None
+    start_time: datetime
+    created_at: datetime
+    updated_at: Optional[datetime] = None
 
 
-class ShowListItem(BaseSchema):
+class ShowListItem(ReadSchema):
     """Show list item schema."""
     id: int
+    artist_id: int
+    artist_name: str
+    venue_id: int
+    venue_name: str
+    start_time: datetime
+
+
+class ShowSummary(ReadSchema):
+    """Show summary for venue/artist pages."""
+    artist_id: int
     artist_name: str
+    artist_image_link: Optional[str] = None
+    venue_id: int
     venue_name: str
+    venue_image_link: Optional[str] = None
     start_time: datetime
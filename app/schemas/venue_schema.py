@@ -5,7 +5,8 @@ from typing import List, Optional
 from pydantic import BaseModel, Field, HttpUrl, field_validator
 from datetime import datetime
 
-from app.schemas.common import BaseSchema, TimestampMixin
+from app.schemas.common import BaseSchema, ReadSchema
+from app.schemas.show_schema import ShowSummary
 
 
 class VenueBase(BaseSchema):
@@ -24,6 +25,9 @@ class VenueBase(BaseSchema):
     seeking_talent: bool = False
     seeking_description: Optional[str] = Field(None, max_length=500)
     
+    latitude: Optional[float] = Field(None, ge=-90, le=90)
+    longitude: Optional[float] = Field(None, ge=-180, le=180)
+    
     @field_validator('genres')
     @classmethod
     def validate_genres(cls, v: List[str]) -> List[str]:
@@ -64,36 +68,44 @@ class VenueUpdate(BaseSchema):
     genres: Optional[List[str]] = None
     seeking_talent: Optional[bool] = None
     seeking_description: Optional[str] = Field(None, max_length=500)
+    latitude: Optional[float] = Field(None, ge=-90, le=90)
+    longitude: Optional[float] = Field(None, ge=-180, le=180)
 
 
-class ShowSummary(BaseSchema):
-    """Show summary for venue/artist pages."""
-    artist_id: int
-    artist_name: str
-    artist_image_link: Optional[str] = None
-    venue_id: int
-    venue_name: str
-    venue_image_link: Optional[str] = None
-    start_time: datetime
-
-
-class VenueResponse(VenueBase, TimestampMixin):
+class VenueResponse(ReadSchema):
     """Complete venue response schema."""
     id: int
+    name: str
+    city: str
+    state: str
+    address: str
+    phone: Optional[str] = None
+    image_link: Optional[str] = None
+    facebook_link: Optional[str] = None
+    website_link: Optional[str] = None
+    genres: List[str] = []
+    seeking_talent: bool = False
+    seeking_description: Optional[str] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    created_at: datetime
+    updated_at: Optional[datetime] = None
     num_upcoming_shows: int = 0
     num_past_shows: int = 0
     past_shows: List[ShowSummary] = []
     upcoming_shows: List[ShowSummary] = []
 
 
-class VenueListItem(BaseSchema):
+class VenueListItem(ReadSchema):
     """Venue list item schema."""
     id: int
     name: str
     num_upcoming_shows: int = 0
+    num_past_shows: int = 0
+    next_show_at: Optional[datetime] = None
 
 
-class VenueSearchResponse(BaseSchema):
+class VenueSearchResponse(ReadSchema):
     """Venue search response schema."""
     count: int
     data: List[VenueListItem]
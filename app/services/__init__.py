@@ -6,11 +6,18 @@ from app.services.venue_service import VenueService
 from app.services.artist_service import ArtistService
 from app.services.show_service import ShowService
 from app.services.genre_service import GenreService
+from app.services.homepage_service import HomepageService
+from app.services.change_feed_service import ChangeFeedService
+from app.services.import_service import ImportService, IMPORT_KINDS
 
 __all__ = [
     'BaseService',
     'VenueService',
     'ArtistService',
     'ShowService',
-    'GenreService'
+    'GenreService',
+    'HomepageService',
+    'ChangeFeedService',
+    'ImportService',
+    'IMPORT_KINDS'
 ]
\ No newline at end of file
@@ -1,11 +1,14 @@
 """
 Artist service for business logic operations.
 """
-from typing import List, Optional, Dict, Any
+from datetime import datetime
+from typing import Iterator, List, Optional, Dict, Any, Sequence
 from app.models import Artist, Show
 from app.repositories import ArtistRepository
 from app.services.base import BaseService
 from app.exceptions import ArtistNotFoundException, DuplicateArtistException, DatabaseException
+from app.cache.singleflight import coalesced
+from app.cache.negative import is_known_missing, remember_missing
 from app.schemas import ArtistCreate, ArtistUpdate, ArtistResponse, ArtistListItem
 
 class ArtistService(BaseService[Artist]):
@@ -56,8 +59,11 @@ class ArtistService(BaseService[Artist]):
         """Get artist with its shows."""
         try:
             self.validate_id(artist_id)
+            if is_known_missing('artist', artist_id):
+                raise ArtistNotFoundException(f"Artist with ID {artist_id} not found")
             artist = self.repository.get_with_shows(artist_id)
             if not artist:
+                remember_missing('artist', artist_id)
                 raise ArtistNotFoundException(f"Artist with ID {artist_id} not found")
             return artist
         except ArtistNotFoundException:
@@ -65,40 +71,68 @@ class ArtistService(BaseService[Artist]):
         except Exception as e:
             raise DatabaseException(f"Error getting artist with shows: {str(e)}")
     
+    def get_last_modified(self, artist_id: int) -> Optional[datetime]:
+        """When the artist's detail representation last changed (None if the artist does not exist)."""
+        try:
+            if is_known_missing('artist', artist_id):
+                return None
+            return self.repository.get_last_modified(artist_id)
+        except Exception as e:
+            raise DatabaseException(f"Error getting artist last-modified time: {str(e)}")
+    
+    @coalesced('artists:detail:{artist_id}', ttl=60)
     def get_artist_response(self, artist_id: int) -> Optional[ArtistResponse]:
         """Get artist as response schema."""
         try:
             artist = self.get_artist_with_shows(artist_id)
             if not artist:
                 return None
-            
-            # Get shows
-            upcoming_shows = self.repository.get_upcoming_shows(artist_id)
-            past_shows = self.repository.get_past_shows(artist_id)
-            
-            # Convert to response format
-            return ArtistResponse(
-                id=artist.id,
-                name=artist.name,
-                city=artist.city,
-                state=artist.state,
-                phone=artist.phone,
-                image_link=artist.image_link,
-                facebook_link=artist.facebook_link,
-                website_link=artist.website_link,
-                genres=[genre.name for genre in artist.genres],
-                seeking_venue=artist.seeking_venue,
-                seeking_description=artist.seeking_description,
-                created_at=artist.created_at,
-                updated_at=artist.updated_at,
-                num_upcoming_shows=len(upcoming_shows),
-                num_past_shows=len(past_shows),
-                upcoming_shows=[self._format_show_summary(show) for show in upcoming_shows],
-                past_shows=[self._format_show_summary(show) for show in past_shows]
-            )
+            return self._to_response(artist)
+        except ArtistNotFoundException:
+            raise
         except Exception as e:
             raise DatabaseException(f"Error getting artist response: {str(e)}")
     
+    def build_artist_response(self, artist_id: int) -> Optional[ArtistResponse]:
+        """
+        Build the artist response straight from the repository (None if the artist is gone).
+
+        Unlike get_artist_response this bypasses the memoized copy and the
+        negative cache, for writers that must not persist a stale value.
+        """
+        try:
+            artist = self.repository.get_with_shows(artist_id)
+            return self._to_response(artist) if artist else None
+        except Exception as e:
+            raise DatabaseException(f"Error building artist response: {str(e)}")
+    
+    def _to_response(self, artist: Artist) -> ArtistResponse:
+        """Detail response of a loaded artist, with its upcoming and past shows."""
+        # Get shows
+        upcoming_shows = self.repository.get_upcoming_shows(artist.id)
+        past_shows = self.repository.get_past_shows(artist.id)
+        
+        # Convert to response format
+        return ArtistResponse(
+            id=artist.id,
+            name=artist.name,
+            city=artist.city,
+            state=artist.state,
+            phone=artist.phone,
+            image_link=artist.image_link,
+            facebook_link=artist.facebook_link,
+            website_link=artist.website_link,
+            genres=[genre.name for genre in artist.genres],
+            seeking_venue=artist.seeking_venue,
+            seeking_description=artist.seeking_description,
+            created_at=artist.created_at,
+            updated_at=artist.updated_at,
+            num_upcoming_shows=len(upcoming_shows),
+            num_past_shows=len(past_shows),
+            upcoming_shows=[self._format_show_summary(show) for show in upcoming_shows],
+            past_shows=[self._format_show_summary(show) for show in past_shows]
+        )
+    
     def get_artists_by_area(self, city: str, state: str) -> List[Artist]:
         """Get artists by city and state."""
         try:
@@ -115,6 +149,19 @@ class ArtistService(BaseService[Artist]):
         except Exception as e:
             raise DatabaseException(f"Error searching artists: {str(e)}")
     
+    def get_artists_by_genres(self, genre_names: List[str], match_all: bool = False,
+                              fields: Optional[Sequence[str]] = None) -> List[Artist]:
+        """Get artists matching any (or all) of the given genres."""
+        try:
+            return self.repository.get_by_genres(genre_names, match_all=match_all, fields=fields)
+        except Exception as e:
+            raise DatabaseException(f"Error getting artists by genres: {str(e)}")
+    
+    def iter_artists(self, genre_names: Optional[List[str]] = None, match_all: bool = False,
+                     batch_size: int = 500, fields: Optional[Sequence[str]] = None) -> Iterator[Artist]:
+        """Stream artists for the API without loading the whole table."""
+        return self.repository.iter_for_api(batch_size, genre_names=genre_names, match_all=match_all, fields=fields)
+    
     def get_artists_with_counts(self) -> List[ArtistListItem]:
         """Get all artists with show counts."""
         try:
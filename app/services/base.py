@@ -1,7 +1,7 @@
 """
 Base service class with common business logic.
 """
-from typing import TypeVar, Generic, List, Optional, Dict, Any
+from typing import TypeVar, Generic, List, Optional, Dict, Any, Sequence
 from app.repositories.base import BaseRepository
 from app.exceptions import DatabaseException
 
@@ -20,17 +20,18 @@ class BaseService(Generic[T]):
         except Exception as e:
             raise DatabaseException(f"Service error creating record: {str(e)}")
     
-    def get_by_id(self, id: int) -> Optional[T]:
-        """Get a record by ID."""
+    def get_by_id(self, id: int, fields: Optional[Sequence[str]] = None) -> Optional[T]:
+        """Get a record by ID (only the sparse `fields` loaded, when given)."""
         try:
-            return self.repository.get_by_id(id)
+            return self.repository.get_by_id(id, fields=fields)
         except Exception as e:
             raise DatabaseException(f"Service error getting record by ID: {str(e)}")
     
-    def get_all(self, limit: Optional[int] = None, offset: int = 0) -> List[T]:
-        """Get all records with optional pagination."""
+    def get_all(self, limit: Optional[int] = None, offset: int = 0,
+                fields: Optional[Sequence[str]] = None) -> List[T]:
+        """Get all records with optional pagination and sparse fieldset."""
         try:
-            return self.repository.get_all(limit=limit, offset=offset)
+            return self.repository.get_all(limit=limit, offset=offset, fields=fields)
         except Exception as e:
             raise DatabaseException(f"Service error getting all records: {str(e)}")
     
@@ -48,6 +49,13 @@ class BaseService(Generic[T]):
         except Exception as e:
             raise DatabaseException(f"Service error deleting record: {str(e)}")
     
+    def get_list_version(self) -> str:
+        """Version of the listed records: changes whenever one is added, edited or deleted."""
+        try:
+            return self.repository.list_version()
+        except Exception as e:
+            raise DatabaseException(f"Service error getting list version: {str(e)}")
+    
     def count(self) -> int:
         """Count total records."""
         try:
@@ -0,0 +1,68 @@
+"""
+Change feed service for incremental client sync (/api/changes).
+"""
+from collections import defaultdict
+from typing import Any, Dict, List
+from app.models.change_log import DELETED
+from app.repositories import (
+    ChangeLogRepository, ArtistRepository, VenueRepository, ShowRepository,
+    ARTIST_FIELDS, VENUE_FIELDS, SHOW_FIELDS
+)
+from app.exceptions import DatabaseException
+
+class ChangeFeedService:
+    """Pages through the change log and attaches the current row of every changed entity."""
+    
+    def __init__(self):
+        self.change_log = ChangeLogRepository()
+        # kind -> (repository, fieldset): rows match the /<kind>/api list representation
+        self.kinds = {
+            'artists': (ArtistRepository(), ARTIST_FIELDS),
+            'venues': (VenueRepository(), VENUE_FIELDS),
+            'shows': (ShowRepository(), SHOW_FIELDS),
+        }
+    
+    def get_changes(self, cursor: int, limit: int) -> Dict[str, Any]:
+        """
+        Up to `limit` changes after `cursor`, oldest first.
+
+        Each change carries its sequence number, kind, id, operation and
+        changed_at; created/updated entries also carry the entity's current
+        row under 'data' (deleted ones are tombstones without data). Pass the
+        returned 'cursor' as the next `since`; 'has_more' tells whether another
+        page is already waiting.
+        """
+        try:
+            entries = self.change_log.get_since(cursor, limit + 1)
+            has_more = len(entries) > limit
+            entries = entries[:limit]
+            
+            wanted = defaultdict(set)
+            for entry in entries:
+                if entry.operation != DELETED:
+                    wanted[entry.kind].add(entry.entity_id)
+            rows: Dict[str, Dict[int, Dict[str, Any]]] = {}
+            for kind, ids in wanted.items():
+                repository, fieldset = self.kinds[kind]
+                serialize = fieldset.serializer()
+                rows[kind] = {instance.id: serialize(instance) for instance in repository.get_by_ids(ids)}
+            
+            changes: List[Dict[str, Any]] = []
+            for entry in entries:
+                data = rows.get(entry.kind, {}).get(entry.entity_id)
+                changes.append({
+                    'seq': entry.seq,
+                    'kind': entry.kind,
+                    'id': entry.entity_id,
+                    # Deleted since this entry was written; its tombstone follows later in the feed
+                    'operation': entry.operation if data is not None else DELETED,
+                    'changed_at': entry.changed_at,
+                    'data': data
+                })
+            return {
+                'changes': changes,
+                'cursor': entries[-1].seq if entries else cursor,
+                'has_more': has_more
+            }
+        except Exception as e:
+            raise DatabaseException(f"Error reading changes: {str(e)}")
@@ -6,6 +6,7 @@ from app.models import Genre
 from app.repositories import GenreRepository
 from app.services.base import BaseService
 from app.exceptions import DatabaseException
+from app.cache.singleflight import coalesced
 
 class GenreService(BaseService[Genre]):
     """Service for Genre business logic."""
@@ -49,6 +50,7 @@ class GenreService(BaseService[Genre]):
         except Exception as e:
             raise DatabaseException(f"Error getting venues by genre: {str(e)}")
     
+    @coalesced('genres:popular:{limit}', ttl=300, tags=('artists:list', 'venues:list'))
     def get_popular_genres(self, limit: int = 10) -> List[Dict[str, Any]]:
         """Get most popular genres."""
         try:
@@ -0,0 +1,58 @@
+"""
+Homepage service for building the homepage data bundle.
+"""
+from typing import Any, Dict, List
+from app.services.venue_service import VenueService
+from app.services.artist_service import ArtistService
+from app.services.show_service import ShowService
+
+class HomepageService:
+    """Service composing the recent venues, artists and shows shown on the homepage."""
+    
+    RECENT_LIMIT = 10
+    RECENT_SHOW_DAYS = 30
+    
+    # Served until the first snapshot is built
+    EMPTY: Dict[str, List[Dict[str, Any]]] = {'venues': [], 'artists': [], 'shows': []}
+    
+    def __init__(self):
+        self.venue_service = VenueService()
+        self.artist_service = ArtistService()
+        self.show_service = ShowService()
+    
+    def get_homepage_data(self) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Build the homepage bundle as plain dicts.
+        
+        Plain data (no ORM instances) can be held across requests and threads
+        without touching a session.
+        """
+        venues = self.venue_service.get_all(limit=self.RECENT_LIMIT)
+        artists = self.artist_service.get_all(limit=self.RECENT_LIMIT)
+        shows = self.show_service.get_recent_shows(days=self.RECENT_SHOW_DAYS, limit=self.RECENT_LIMIT)
+        
+        return {
+            'venues': [{
+                'id': venue.id,
+                'name': venue.name,
+                'city': venue.city,
+                'state': venue.state,
+                'image_link': venue.image_link
+            } for venue in venues],
+            'artists': [{
+                'id': artist.id,
+                'name': artist.name,
+                'city': artist.city,
+                'state': artist.state,
+                'image_link': artist.image_link
+            } for artist in artists],
+            'shows': [{
+                'id': show.id,
+                'venue_id': show.venue_id,
+                'venue_name': show.venue.name,
+                'artist_id': show.artist_id,
+                'artist_name': show.artist.name,
+                'artist_image_link': show.artist.image_link,
+                'start_time': show.start_time
+            } for show in shows]
+        }
@@ -0,0 +1,153 @@
+"""
+Bulk import service for artists, venues and shows (/api/import, flask import-data).
+"""
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+from pydantic import BaseModel, ValidationError
+from app.models import Artist, Venue, Show
+from app.repositories import ArtistRepository, VenueRepository, ShowRepository, GenreRepository
+from app.schemas import ArtistCreate, VenueCreate, ShowCreate
+from app.exceptions import DatabaseException
+from app.utils.formatters import normalize_key
+from app.utils.ingest import Record
+
+IMPORT_KINDS = ('artists', 'venues', 'shows')
+
+# (line number, error message) for every row a chunk rejects
+Rejects = List[Tuple[int, str]]
+
+def _validation_message(error: ValidationError) -> str:
+    """Pydantic errors as 'field: message' pairs on one line."""
+    return '; '.join(
+        f"{'.'.join(str(part) for part in detail['loc']) or 'row'}: {detail['msg']}"
+        for detail in error.errors()
+    )
+
+class ImportService:
+    """
+    Validates and inserts streamed records one chunk at a time.
+
+    Each chunk of rows is validated against the kind's Create schema, checked
+    against the database with one query per lookup (genre names, duplicate
+    artists/venues, referenced IDs, booked show slots) and inserted in its own
+    transaction, so a 500k-row file holds one chunk in memory and a failure
+    loses at most that chunk. Rows go through the ORM, so genre masks, show
+    aggregates, the change log and cache invalidation follow as for form
+    submissions.
+    """
+    
+    def __init__(self):
+        self.artists = ArtistRepository()
+        self.venues = VenueRepository()
+        self.shows = ShowRepository()
+        self.genres = GenreRepository()
+        # kind -> (Create schema, repository, builder of model instances)
+        self.kinds: Dict[str, Tuple[type, Any, Callable]] = {
+            'artists': (ArtistCreate, self.artists, self._build_artists),
+            'venues': (VenueCreate, self.venues, self._build_venues),
+            'shows': (ShowCreate, self.shows, self._build_shows),
+        }
+    
+    def import_records(self, kind: str, records: Iterable[Record], chunk_size: int = 500,
+                       max_errors: int = 1000) -> Dict[str, Any]:
+        """
+        Import (line_number, row, error) records (see app/utils/ingest.py).
+
+        Returns the counts of imported and failed rows plus the first
+        `max_errors` failures as {'line', 'error'}; 'errors_truncated' tells
+        whether more were dropped.
+        """
+        if kind not in self.kinds:
+            raise ValueError(f"Unknown import kind '{kind}' (expected one of: {', '.join(IMPORT_KINDS)})")
+        schema, repository, build = self.kinds[kind]
+        summary: Dict[str, Any] = {'kind': kind, 'imported': 0, 'failed': 0, 'errors': [], 'errors_truncated': False}
+        
+        def reject(rows: Rejects) -> None:
+            summary['failed'] += len(rows)
+            room = max_errors - len(summary['errors'])
+            summary['errors'].extend({'line': line, 'error': error} for line, error in rows[:room])
+            summary['errors_truncated'] = summary['errors_truncated'] or len(rows) > room
+        
+        records = iter(records)
+        while True:
+            chunk = list(islice(records, chunk_size))
+            if not chunk:
+                break
+            
+            valid: List[Tuple[int, BaseModel]] = []
+            rejected: Rejects = []
+            for line, row, error in chunk:
+                if error is not None:
+                    rejected.append((line, error))
+                    continue
+                try:
+                    valid.append((line, schema.model_validate(row)))
+                except ValidationError as e:
+                    rejected.append((line, _validation_message(e)))
+            
+            if valid:
+                try:
+                    instances, unresolved = build(valid)
+                    rejected.extend(unresolved)
+                    summary['imported'] += repository.create_many([instance for _, instance in instances])
+                except DatabaseException as e:
+                    # The chunk's transaction was rolled back: none of its rows went in
+                    failed = {line for line, _ in rejected}
+                    rejected.extend((line, str(e)) for line, _ in valid if line not in failed)
+            reject(sorted(rejected))
+        return summary
+    
+    def _build_listed(self, model: type, repository, label: str,
+                      rows: List[Tuple[int, BaseModel]]) -> Tuple[List[Tuple[int, Any]], Rejects]:
+        """Artists or venues: names must be free in their city and genres must resolve."""
+        genres = self.genres.get_by_names(name for _, data in rows for name in data.genres)
+        existing = repository.get_existing_keys(
+            (normalize_key(data.name), normalize_key(data.city)) for _, data in rows
+        )
+        instances: List[Tuple[int, Any]] = []
+        rejected: Rejects = []
+        for line, data in rows:
+            key = (normalize_key(data.name), normalize_key(data.city))
+            missing = [name for name in data.genres if name not in genres]
+            if key in existing:
+                rejected.append((line, f"{label} '{data.name}' already exists in {data.city}"))
+            elif missing:
+                rejected.append((line, f"Invalid genres: {', '.join(missing)}"))
+            else:
+                existing.add(key)
+                instance = model(**data.model_dump(mode='json', exclude={'genres'}))
+                instance.genres = [genres[name] for name in dict.fromkeys(data.genres)]
+                instances.append((line, instance))
+        return instances, rejected
+    
+    def _build_artists(self, rows: List[Tuple[int, BaseModel]]) -> Tuple[List[Tuple[int, Any]], Rejects]:
+        return self._build_listed(Artist, self.artists, 'Artist', rows)
+    
+    def _build_venues(self, rows: List[Tuple[int, BaseModel]]) -> Tuple[List[Tuple[int, Any]], Rejects]:
+        return self._build_listed(Venue, self.venues, 'Venue', rows)
+    
+    def _build_shows(self, rows: List[Tuple[int, BaseModel]]) -> Tuple[List[Tuple[int, Any]], Rejects]:
+        """Shows: both ends must exist and neither may already be booked at that time."""
+        artist_ids = self.artists.existing_ids(data.artist_id for _, data in rows)
+        venue_ids = self.venues.existing_ids(data.venue_id for _, data in rows)
+        artist_slots, venue_slots = self.shows.get_booked_slots(
+            artist_ids, venue_ids, (data.start_time for _, data in rows)
+        )
+        instances: List[Tuple[int, Any]] = []
+        rejected: Rejects = []
+        for line, data in rows:
+            artist_slot = (data.artist_id, data.start_time)
+            venue_slot = (data.venue_id, data.start_time)
+            if data.artist_id not in artist_ids:
+                rejected.append((line, f"Artist with ID {data.artist_id} not found"))
+            elif data.venue_id not in venue_ids:
+                rejected.append((line, f"Venue with ID {data.venue_id} not found"))
+            elif artist_slot in artist_slots:
+                rejected.append((line, f"Artist {data.artist_id} already has a show at {data.start_time}"))
+            elif venue_slot in venue_slots:
+                rejected.append((line, f"Venue {data.venue_id} already has a show at {data.start_time}"))
+            else:
+                artist_slots.add(artist_slot)
+                venue_slots.add(venue_slot)
+                instances.append((line, Show(**data.model_dump())))
+        return instances, rejected
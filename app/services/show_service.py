@@ -1,13 +1,16 @@
 """
 Show service for business logic operations.
 """
-from typing import List, Optional, Dict, Any
+from typing import Iterator, List, Optional, Dict, Any, Sequence
 from datetime import datetime
 from app.models import Show
 from app.repositories import ShowRepository
 from app.services.base import BaseService
 from app.exceptions import ShowNotFoundException, DatabaseException
+from app.cache.singleflight import coalesced
+from app.cache.negative import is_known_missing, remember_missing
 from app.schemas import ShowCreate, ShowResponse, ShowListItem
+from app.utils.columnar import encode_show_columns
 
 class ShowService(BaseService[Show]):
     """Service for Show business logic."""
@@ -31,12 +34,24 @@ class ShowService(BaseService[Show]):
         except Exception as e:
             raise DatabaseException(f"Error creating show: {str(e)}")
     
+    def get_last_modified(self, show_id: int) -> Optional[datetime]:
+        """When the show's detail representation last changed (None if the show does not exist)."""
+        try:
+            if is_known_missing('show', show_id):
+                return None
+            return self.repository.get_last_modified(show_id)
+        except Exception as e:
+            raise DatabaseException(f"Error getting show last-modified time: {str(e)}")
+    
     def get_show_response(self, show_id: int) -> Optional[ShowResponse]:
         """Get show as response schema."""
         try:
             self.validate_id(show_id)
+            if is_known_missing('show', show_id):
+                raise ShowNotFoundException(f"Show with ID {show_id} not found")
             show = self.get_by_id(show_id)
             if not show:
+                remember_missing('show', show_id)
                 raise ShowNotFoundException(f"Show with ID {show_id} not found")
             
             return ShowResponse(
@@ -63,19 +78,30 @@ class ShowService(BaseService[Show]):
         except Exception as e:
             raise DatabaseException(f"Error getting shows with details: {str(e)}")
     
-    def get_upcoming_shows(self, limit: Optional[int] = None) -> List[Show]:
+    def iter_all_with_details(self, batch_size: int = 500, fields: Optional[Sequence[str]] = None) -> Iterator[Show]:
+        """Stream every show with its artist and venue, batch by batch."""
+        return self.repository.iter_with_details(batch_size, fields=fields)
+    
+    def get_show_columns(self) -> Dict[str, Any]:
+        """Every show in the columnar encoding (see app/utils/columnar.py)."""
+        try:
+            return encode_show_columns(*self.repository.get_columns())
+        except Exception as e:
+            raise DatabaseException(f"Error getting show columns: {str(e)}")
+    
+    def get_upcoming_shows(self, limit: Optional[int] = None, fields: Optional[Sequence[str]] = None) -> List[Show]:
         """Get all upcoming shows."""
         try:
             self.validate_pagination(limit=limit)
-            return self.repository.get_upcoming_shows(limit=limit)
+            return self.repository.get_upcoming_shows(limit=limit, fields=fields)
         except Exception as e:
             raise DatabaseException(f"Error getting upcoming shows: {str(e)}")
     
-    def get_past_shows(self, limit: Optional[int] = None) -> List[Show]:
+    def get_past_shows(self, limit: Optional[int] = None, fields: Optional[Sequence[str]] = None) -> List[Show]:
         """Get all past shows."""
         try:
             self.validate_pagination(limit=limit)
-            return self.repository.get_past_shows(limit=limit)
+            return self.repository.get_past_shows(limit=limit, fields=fields)
         except Exception as e:
             raise DatabaseException(f"Error getting past shows: {str(e)}")
     
@@ -114,6 +140,27 @@ class ShowService(BaseService[Show]):
         except Exception as e:
             raise DatabaseException(f"Error getting shows by date range: {str(e)}")
     
+    def sweep_show_aggregates(self) -> Dict[str, int]:
+        """Move started shows from upcoming to past in the artist/venue aggregates."""
+        try:
+            artist_ids, venue_ids = self.repository.sweep_aggregates()
+            if artist_ids or venue_ids:
+                # Raw aggregate updates bypass the ORM flush, so evict what they changed explicitly
+                from app.cache import ChangeSet, get_cache_invalidator
+                invalidator = get_cache_invalidator()
+                if invalidator is not None:
+                    invalidator.dispatch(ChangeSet(
+                        updated={('artist', artist_id) for artist_id in artist_ids}
+                                | {('venue', venue_id) for venue_id in venue_ids},
+                        keys={'artists:list', 'venues:list', 'shows:upcoming', 'shows:past', 'stats'}
+                             | {f'artists:detail:{artist_id}' for artist_id in artist_ids}
+                             | {f'venues:detail:{venue_id}' for venue_id in venue_ids}
+                    ))
+            return {'artists': len(artist_ids), 'venues': len(venue_ids)}
+        except Exception as e:
+            raise DatabaseException(f"Error sweeping show aggregates: {str(e)}")
+    
+    @coalesced('shows:statistics', ttl=60)
     def get_show_statistics(self) -> Dict[str, int]:
         """Get show statistics."""
         try:
@@ -158,9 +205,15 @@ class ShowService(BaseService[Show]):
     def get_shows_by_genre(self, genre_name: str) -> List[Show]:
         """Get shows by genre."""
         try:
-            # This would require a more complex query joining shows with artists/venues and their genres
-            # For now, we'll implement a simple version
             from app.models import Artist, Venue, Genre
+            from app.utils.constants import GENRE_BITS
+            
+            # Known genres are a single bitwise predicate on the denormalized masks
+            bit = GENRE_BITS.get(genre_name)
+            if bit is not None:
+                return Show.query.join(Show.artist).join(Show.venue).filter(
+                    (Artist.genre_mask.bitwise_and(bit) != 0) | (Venue.genre_mask.bitwise_and(bit) != 0)
+                ).all()
             
             # Get artists with this genre
             artists_with_genre = Artist.query.join(Artist.genres).filter(Genre.name == genre_name).all()
@@ -1,11 +1,15 @@
 """
 Venue service for business logic operations.
 """
-from typing import List, Optional, Dict, Any
+from datetime import datetime
+from typing import List, Optional, Dict, Any, Sequence
 from app.models import Venue, Show
 from app.repositories import VenueRepository
 from app.services.base import BaseService
-from app.exceptions import VenueNotFoundException, DuplicateVenueException, DatabaseException
+from app.exceptions import VenueNotFoundException, DuplicateVenueException, DatabaseException, ValidationException
+from app.utils.constants import MAX_NEARBY_RADIUS_KM
+from app.cache.singleflight import coalesced
+from app.cache.negative import is_known_missing, remember_missing
 from app.schemas import VenueCreate, VenueUpdate, VenueResponse, VenueListItem
 
 class VenueService(BaseService[Venue]):
@@ -56,8 +60,11 @@ class VenueService(BaseService[Venue]):
         """Get venue with its shows."""
         try:
             self.validate_id(venue_id)
+            if is_known_missing('venue', venue_id):
+                raise VenueNotFoundException(f"Venue with ID {venue_id} not found")
             venue = self.repository.get_with_shows(venue_id)
             if not venue:
+                remember_missing('venue', venue_id)
                 raise VenueNotFoundException(f"Venue with ID {venue_id} not found")
             return venue
         except VenueNotFoundException:
@@ -65,41 +72,71 @@ class VenueService(BaseService[Venue]):
         except Exception as e:
             raise DatabaseException(f"Error getting venue with shows: {str(e)}")
     
+    def get_last_modified(self, venue_id: int) -> Optional[datetime]:
+        """When the venue's detail representation last changed (None if the venue does not exist)."""
+        try:
+            if is_known_missing('venue', venue_id):
+                return None
+            return self.repository.get_last_modified(venue_id)
+        except Exception as e:
+            raise DatabaseException(f"Error getting venue last-modified time: {str(e)}")
+    
+    @coalesced('venues:detail:{venue_id}', ttl=60)
     def get_venue_response(self, venue_id: int) -> Optional[VenueResponse]:
         """Get venue as response schema."""
         try:
             venue = self.get_venue_with_shows(venue_id)
             if not venue:
                 return None
-            
-            # Get shows
-            upcoming_shows = self.repository.get_upcoming_shows(venue_id)
-            past_shows = self.repository.get_past_shows(venue_id)
-            
-            # Convert to response format
-            return VenueResponse(
-                id=venue.id,
-                name=venue.name,
-                city=venue.city,
-                state=venue.state,
-                address=venue.address,
-                phone=venue.phone,
-                image_link=venue.image_link,
-                facebook_link=venue.facebook_link,
-                website_link=venue.website_link,
-                genres=[genre.name for genre in venue.genres],
-                seeking_talent=venue.seeking_talent,
-                seeking_description=venue.seeking_description,
-                created_at=venue.created_at,
-                updated_at=venue.updated_at,
-                num_upcoming_shows=len(upcoming_shows),
-                num_past_shows=len(past_shows),
-                upcoming_shows=[self._format_show_summary(show) for show in upcoming_shows],
-                past_shows=[self._format_show_summary(show) for show in past_shows]
-            )
+            return self._to_response(venue)
+        except VenueNotFoundException:
+            raise
         except Exception as e:
             raise DatabaseException(f"Error getting venue response: {str(e)}")
     
+    def build_venue_response(self, venue_id: int) -> Optional[VenueResponse]:
+        """
+        Build the venue response straight from the repository (None if the venue is gone).
+
+        Unlike get_venue_response this bypasses the memoized copy and the
+        negative cache, for writers that must not persist a stale value.
+        """
+        try:
+            venue = self.repository.get_with_shows(venue_id)
+            return self._to_response(venue) if venue else None
+        except Exception as e:
+            raise DatabaseException(f"Error building venue response: {str(e)}")
+    
+    def _to_response(self, venue: Venue) -> VenueResponse:
+        """Detail response of a loaded venue, with its upcoming and past shows."""
+        # Get shows
+        upcoming_shows = self.repository.get_upcoming_shows(venue.id)
+        past_shows = self.repository.get_past_shows(venue.id)
+        
+        # Convert to response format
+        return VenueResponse(
+            id=venue.id,
+            name=venue.name,
+            city=venue.city,
+            state=venue.state,
+            address=venue.address,
+            phone=venue.phone,
+            image_link=venue.image_link,
+            facebook_link=venue.facebook_link,
+            website_link=venue.website_link,
+            genres=[genre.name for genre in venue.genres],
+            seeking_talent=venue.seeking_talent,
+            seeking_description=venue.seeking_description,
+            latitude=venue.latitude,
+            longitude=venue.longitude,
+            created_at=venue.created_at,
+            updated_at=venue.updated_at,
+            num_upcoming_shows=len(upcoming_shows),
+            num_past_shows=len(past_shows),
+            upcoming_shows=[self._format_show_summary(show) for show in upcoming_shows],
+            past_shows=[self._format_show_summary(show) for show in past_shows]
+        )
+    
     def get_venues_by_area(self, city: str, state: str) -> List[Venue]:
         """Get venues by city and state."""
         try:
@@ -116,6 +153,39 @@ class VenueService(BaseService[Venue]):
         except Exception as e:
             raise DatabaseException(f"Error searching venues: {str(e)}")
     
+    def get_venues_by_genres(self, genre_names: List[str], match_all: bool = False,
+                             fields: Optional[Sequence[str]] = None) -> List[Venue]:
+        """Get venues matching any (or all) of the given genres."""
+        try:
+            return self.repository.get_by_genres(genre_names, match_all=match_all, fields=fields)
+        except Exception as e:
+            raise DatabaseException(f"Error getting venues by genres: {str(e)}")
+    
+    def get_nearby_venues(self, lat: float, lng: float, radius_km: float) -> List[Dict[str, Any]]:
+        """Get venues near a point as summaries with their distance in km."""
+        if not -90 <= lat <= 90 or not -180 <= lng <= 180:
+            raise ValidationException("Latitude must be within [-90, 90] and longitude within [-180, 180]")
+        if not 0 < radius_km <= MAX_NEARBY_RADIUS_KM:
+            raise ValidationException(f"Radius must be greater than 0 and at most {MAX_NEARBY_RADIUS_KM} km")
+        
+        try:
+            return [
+                {
+                    'id': venue.id,
+                    'name': venue.name,
+                    'city': venue.city,
+                    'state': venue.state,
+                    'address': venue.address,
+                    'image_link': venue.image_link,
+                    'latitude': venue.latitude,
+                    'longitude': venue.longitude,
+                    'distance_km': round(distance, 3)
+                }
+                for venue, distance in self.repository.get_nearby(lat, lng, radius_km)
+            ]
+        except Exception as e:
+            raise DatabaseException(f"Error getting nearby venues: {str(e)}")
+    
     def get_venues_with_counts(self) -> List[VenueListItem]:
         """Get all venues with show counts."""
         try:
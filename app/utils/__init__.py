@@ -2,8 +2,15 @@
 Utils package for Fyyur application.
 """
 from app.utils.validators import validate_phone, validate_state_code, validate_genres
-from app.utils.formatters import format_datetime, format_phone, format_address
+from app.utils.formatters import format_datetime, format_phone, format_address, normalize_key
 from app.utils.constants import VALID_GENRES, VALID_STATES, DEFAULT_PAGE_SIZE
+from app.utils.genres import genre_mask, genres_from_mask
+from app.utils.json_provider import FastJSONProvider, MSGPACK_MIMETYPE, wants_msgpack
+from app.utils.streaming import NDJSON_MIMETYPE, ndjson_response, wants_ndjson
+from app.utils.columnar import COLUMNAR_MIMETYPE, encode_show_columns, wants_columnar
+from app.utils.batch import dispatch_batch
+from app.utils.ingest import IMPORT_FORMATS, IMPORT_MIMETYPES, iter_records
+from app.utils.compression import CODECS, compress_body, init_compression, negotiate_encoding
 
 __all__ = [
     'validate_phone',
@@ -12,7 +19,27 @@ __all__ = [
     'format_datetime',
     'format_phone',
     'format_address',
+    'normalize_key',
     'VALID_GENRES',
     'VALID_STATES',
-    'DEFAULT_PAGE_SIZE'
+    'DEFAULT_PAGE_SIZE',
+    'genre_mask',
+    'genres_from_mask',
+    'FastJSONProvider',
+    'MSGPACK_MIMETYPE',
+    'wants_msgpack',
+    'NDJSON_MIMETYPE',
+    'ndjson_response',
+    'wants_ndjson',
+    'CODECS',
+    'compress_body',
+    'init_compression',
+    'negotiate_encoding',
+    'COLUMNAR_MIMETYPE',
+    'encode_show_columns',
+    'wants_columnar',
+    'dispatch_batch',
+    'IMPORT_FORMATS',
+    'IMPORT_MIMETYPES',
+    'iter_records'
 ]
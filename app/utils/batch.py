@@ -0,0 +1,74 @@
+"""
+Batched API reads (`POST /api/batch`).
+
+A client that needs several API resources to render one screen sends their
+paths in one request:
+
+    {"requests": ["/artists/api/4", "/venues/api/7?fields=id,name", "/api/stats"]}
+
+and gets one result per path, in order, each with the status code and JSON
+body the path would have answered on its own:
+
+    {"responses": [{"path": "/artists/api/4", "status": 200, "body": {...}}, ...]}
+
+Sub-requests are dispatched in-process through the full Flask pipeline
+(routing, before/after hooks, the response cache), inside the batch's app
+context: they share its SQLAlchemy session, so rows one of them loaded are
+found in the identity map by the next. Only GET routes under an `api` path
+segment can be batched; anything else gets a 400 entry. Sub-requests always
+negotiate plain JSON, the batch response itself follows the client's Accept.
+"""
+import sys
+from typing import Any, Collection, Dict, List
+
+from flask import current_app, request
+from werkzeug.test import EnvironBuilder
+
+from app.models import db
+
+
+def is_batchable(rule, excluded: Collection[str] = ()) -> bool:
+    """True for GET routes of the JSON API (an `api` path segment), minus `excluded` endpoints."""
+    return (
+        'GET' in (rule.methods or ())
+        and 'api' in rule.rule.split('/')
+        and rule.endpoint not in excluded
+    )
+
+
+def dispatch_get(path: str, excluded: Collection[str] = ()) -> Dict[str, Any]:
+    """
+    Answer GET `path` in-process and describe the result.
+
+    Returns {'path', 'status', 'body'}; body is the decoded JSON, or None
+    when the route answered something else (a redirect, an HTML error page).
+    """
+    if not isinstance(path, str) or not path.startswith('/') or path.startswith('//'):
+        return {'path': path, 'status': 400, 'body': {'error': 'Expected a path such as /artists/api/1'}}
+    
+    app = current_app._get_current_object()
+    environ = EnvironBuilder(
+        path=path,
+        base_url=request.root_url,
+        headers={'Accept': 'application/json'},
+        environ_overrides={'REMOTE_ADDR': request.remote_addr}
+    ).get_environ()
+    
+    # The current app context is reused, and with it the SQLAlchemy session
+    with app.request_context(environ):
+        rule = request.url_rule
+        if rule is not None and not is_batchable(rule, excluded):
+            return {'path': path, 'status': 400, 'body': {'error': f'{rule.rule} cannot be batched'}}
+        try:
+            response = app.full_dispatch_request()
+        except Exception:
+            app.log_exception(sys.exc_info())
+            db.session.rollback()
+            return {'path': path, 'status': 500, 'body': {'error': 'Internal server error'}}
+        body = app.json.loads(response.get_data()) if response.is_json else None
+        return {'path': path, 'status': response.status_code, 'body': body}
+
+
+def dispatch_batch(paths: List[Any], excluded: Collection[str] = ()) -> List[Dict[str, Any]]:
+    """Answer every path in order (see dispatch_get)."""
+    return [dispatch_get(path, excluded) for path in paths]
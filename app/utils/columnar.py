@@ -0,0 +1,73 @@
+"""
+Columnar JSON encoding for bulk show lists.
+
+`GET /shows/api?format=columnar` (or `Accept: application/vnd.fyyur.columnar+json`)
+returns one array per field instead of one object per show, and lists each
+artist and venue once in a lookup table that shows reference by index:
+
+    {
+      "format": "columnar", "version": 1, "count": 2,
+      "shows": {"id": [1, 2], "artist": [0, 0], "venue": [0, 1],
+                "start_time": [...], "created_at": [...], "updated_at": [...]},
+      "artists": {"id": [4], "name": ["..."], "image_link": ["..."]},
+      "venues": {"id": [7, 9], "name": [...], "image_link": [...]}
+    }
+
+Row i of the default encoding is shows.*[i], with artist_id/artist_name/
+artist_image_link read from artists.*[shows.artist[i]] (and the same for
+venues). tests/unit/test_controllers.py holds the reference decoder.
+"""
+from typing import Any, Dict, Iterable, List, Sequence
+
+from flask import request
+
+COLUMNAR_MIMETYPE = 'application/vnd.fyyur.columnar+json'
+COLUMNAR_VERSION = 1
+
+SHOW_COLUMNS = ('id', 'artist_id', 'venue_id', 'start_time', 'created_at', 'updated_at')
+PARTY_COLUMNS = ('id', 'name', 'image_link')
+
+
+def wants_columnar() -> bool:
+    """True when the request selects the columnar encoding (query parameter or media type)."""
+    if request.args.get('format') == 'columnar':
+        return True
+    return request.accept_mimetypes.best_match(['application/json', COLUMNAR_MIMETYPE]) == COLUMNAR_MIMETYPE
+
+
+def _table(rows: Sequence[Sequence[Any]], columns: Sequence[str]) -> Dict[str, List[Any]]:
+    """Transpose rows into one list per column."""
+    if not rows:
+        return {column: [] for column in columns}
+    return {column: list(values) for column, values in zip(columns, zip(*rows))}
+
+
+def encode_show_columns(shows: Sequence[Sequence[Any]], artists: Iterable[Sequence[Any]],
+                        venues: Iterable[Sequence[Any]]) -> Dict[str, Any]:
+    """
+    Build the columnar document.
+
+    `shows` rows hold SHOW_COLUMNS, `artists`/`venues` rows hold PARTY_COLUMNS
+    and must include every party a show refers to. Datetimes are left to the
+    JSON provider, which writes them as ISO 8601 like Show.to_dict().
+    """
+    artists, venues = list(artists), list(venues)
+    artist_index = {row[0]: index for index, row in enumerate(artists)}
+    venue_index = {row[0]: index for index, row in enumerate(venues)}
+    
+    columns = _table(shows, SHOW_COLUMNS)
+    return {
+        'format': 'columnar',
+        'version': COLUMNAR_VERSION,
+        'count': len(shows),
+        'shows': {
+            'id': columns['id'],
+            'artist': [artist_index[artist_id] for artist_id in columns['artist_id']],
+            'venue': [venue_index[venue_id] for venue_id in columns['venue_id']],
+            'start_time': columns['start_time'],
+            'created_at': columns['created_at'],
+            'updated_at': columns['updated_at'],
+        },
+        'artists': _table(artists, PARTY_COLUMNS),
+        'venues': _table(venues, PARTY_COLUMNS),
+    }
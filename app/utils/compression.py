@@ -0,0 +1,216 @@
+"""
+HTTP response compression.
+
+Responses of a compressible type (JSON, NDJSON, HTML, CSS, JS, SVG...) at or
+above COMPRESSION_MIN_SIZE bytes are encoded with the best codec both sides
+support: brotli or zstd when their packages are installed, gzip otherwise.
+Images, fonts and archives are already compressed and pass through untouched.
+Streamed responses (NDJSON) are compressed chunk by chunk with a sync flush
+after each one, so clients keep receiving rows as they are produced.
+
+A compressed response keeps its entity tag in weak form (W/"..."), as
+If-None-Match compares weakly: a client revalidating with the tag of any
+encoding gets its 304. The JSON response cache stores the encoded bodies it
+produces next to the original (see ResponseCache.get_variant), so a cache
+hit never compresses the same body twice.
+"""
+import gzip
+import zlib
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+
+from flask import current_app, request, Response
+
+try:
+    import brotli
+except ImportError:  # optional codec
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # optional codec
+    zstandard = None
+
+# Types worth compressing; anything else (images, fonts, archives) is sent as-is
+COMPRESSIBLE_MIMETYPES = frozenset({
+    'text/html', 'text/css', 'text/plain', 'text/csv', 'text/xml', 'text/javascript',
+    'application/json', 'application/x-ndjson', 'application/javascript', 'application/xml',
+    'application/manifest+json', 'application/msgpack', 'image/svg+xml',
+})
+
+
+@dataclass(frozen=True)
+class Codec:
+    """One content coding: whole-body and streaming compressors at a given level."""
+    name: str
+    compress: Callable[[bytes, int], bytes]
+    compressobj: Callable[[int], Any]  # object with compress/flush (or process/flush for brotli)
+
+
+def _gzip_stream(level: int):
+    return zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+
+CODECS: Dict[str, Codec] = {
+    # mtime=0 keeps the bytes (and any ETag derived from them) stable
+    'gzip': Codec('gzip', lambda data, level: gzip.compress(data, compresslevel=level, mtime=0), _gzip_stream),
+}
+if brotli is not None:
+    CODECS['br'] = Codec('br', lambda data, level: brotli.compress(data, quality=level),
+                         lambda level: brotli.Compressor(quality=level))
+if zstandard is not None:
+    CODECS['zstd'] = Codec('zstd', lambda data, level: zstandard.ZstdCompressor(level=level).compress(data),
+                           lambda level: zstandard.ZstdCompressor(level=level).compressobj())
+
+DEFAULT_LEVELS = {'br': 5, 'zstd': 3, 'gzip': 6}
+
+
+def is_compressible_type(mimetype: str) -> bool:
+    """True for text-like types, including vendor JSON types (application/vnd.*+json)."""
+    return mimetype in COMPRESSIBLE_MIMETYPES or mimetype.endswith('+json')
+
+
+def is_compressible(response: Response) -> bool:
+    """True for successful, not yet encoded responses of a compressible type."""
+    return (
+        response.status_code == 200
+        and is_compressible_type(response.mimetype)
+        and 'Content-Encoding' not in response.headers
+    )
+
+
+def negotiate_encoding() -> Optional[str]:
+    """The content coding to use for the current request, or None for identity."""
+    config = current_app.config
+    if not config.get('COMPRESSION_ENABLED', False):
+        return None
+    preferred = [name for name in config.get('COMPRESSION_ALGORITHMS', ('br', 'zstd', 'gzip')) if name in CODECS]
+    if not preferred:
+        return None
+    # identity competes too, so 'gzip;q=0.5, identity' keeps the body uncompressed
+    encoding = request.accept_encodings.best_match(preferred + ['identity'])
+    return None if encoding == 'identity' else encoding
+
+
+def choose_encoding(mimetype: str, size: Optional[int] = None) -> Optional[str]:
+    """The coding for a body of this type and size (None: unknown, e.g. a stream), or None."""
+    if not is_compressible_type(mimetype):
+        return None
+    if size is not None and size < current_app.config.get('COMPRESSION_MIN_SIZE', 1024):
+        return None
+    return negotiate_encoding()
+
+
+def compress_body(body: bytes, encoding: str) -> bytes:
+    """Encode a whole body with the configured level of `encoding`."""
+    return CODECS[encoding].compress(body, _level(encoding))
+
+
+def iter_compressed(chunks: Iterable[bytes], encoding: str) -> Iterator[bytes]:
+    """Encode a stream, flushing after every chunk so nothing waits in the compressor."""
+    # Created now: the body is iterated after the app context is gone
+    stream = CODECS[encoding].compressobj(_level(encoding))
+    if encoding == 'br':
+        return _iter_brotli(chunks, stream)
+    return _iter_flushed(chunks, stream, zstandard.COMPRESSOBJ_FLUSH_BLOCK if encoding == 'zstd' else zlib.Z_SYNC_FLUSH)
+
+
+def _iter_flushed(chunks: Iterable[bytes], stream, sync: int) -> Iterator[bytes]:
+    for chunk in chunks:
+        data = stream.compress(chunk) + stream.flush(sync)
+        if data:
+            yield data
+    yield stream.flush()
+
+
+def _iter_brotli(chunks: Iterable[bytes], stream) -> Iterator[bytes]:
+    for chunk in chunks:
+        data = stream.process(chunk) + stream.flush()
+        if data:
+            yield data
+    yield stream.finish()
+
+
+def mark_encoded(response: Response, encoding: str) -> Response:
+    """Set the headers of a response whose body is now in `encoding`."""
+    response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+
+def _level(encoding: str) -> int:
+    levels = current_app.config.get('COMPRESSION_LEVELS') or {}
+    return levels.get(encoding, DEFAULT_LEVELS[encoding])
+
+
+class CompressionStats:
+    """Counters shown under /api/cache/stats."""
+    
+    def __init__(self):
+        self.compressed = 0
+        self.streamed = 0
+        self.cached = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+    
+    def record(self, size: int, encoded_size: int) -> None:
+        self.compressed += 1
+        self.bytes_in += size
+        self.bytes_out += encoded_size
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'codecs': sorted(CODECS),
+            'compressed': self.compressed,
+            'streamed': self.streamed,
+            'cached': self.cached,
+            'bytes_in': self.bytes_in,
+            'bytes_out': self.bytes_out,
+            'ratio': round(self.bytes_out / self.bytes_in, 3) if self.bytes_in else None
+        }
+
+
+def init_compression(app) -> Optional[CompressionStats]:
+    """Compress eligible responses after every request when COMPRESSION_ENABLED is set."""
+    if not app.config.get('COMPRESSION_ENABLED', False):
+        app.extensions['compression'] = None
+        return None
+    
+    counters = CompressionStats()
+    app.extensions['compression'] = counters
+    
+    @app.after_request
+    def compress_response(response: Response) -> Response:
+        if not is_compressible(response) or request.method == 'HEAD':
+            return response
+        response.vary.add('Accept-Encoding')
+        
+        if response.is_streamed and not response.direct_passthrough:
+            encoding = choose_encoding(response.mimetype)
+            if encoding is not None:
+                response.response = iter_compressed(response.response, encoding)
+                counters.streamed += 1
+                mark_encoded(response, encoding)
+            return response
+        
+        # Static files arrive as file wrappers; read them so they can be encoded
+        response.direct_passthrough = False
+        body = response.get_data()
+        encoding = choose_encoding(response.mimetype, len(body))
+        if encoding is None:
+            return response
+        
+        encoded = compress_body(body, encoding)
+        counters.record(len(body), len(encoded))
+        response.set_data(encoded)
+        return mark_encoded(response, encoding)
+    
+    return counters
+
+
+def get_compression_stats() -> Optional[CompressionStats]:
+    """Return the current app's compression counters, or None when compression is off."""
+    return current_app.extensions.get('compression')
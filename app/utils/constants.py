@@ -1,7 +1,7 @@
 """
 Constants for the Fyyur application.
 """
-from typing import Set
+from typing import Dict, Set, Tuple
 
 # Valid music genres
 VALID_GENRES: Set[str] = {
@@ -11,6 +11,16 @@ VALID_GENRES: Set[str] = {
     'Reggae', 'Rock n Roll', 'Soul', 'Other'
 }
 
+# Bit positions for the genre_mask columns. Only ever append new genres:
+# reordering this tuple would invalidate every stored mask.
+GENRE_BIT_ORDER: Tuple[str, ...] = (
+    'Alternative', 'Blues', 'Classical', 'Country', 'Electronic',
+    'Folk', 'Funk', 'Hip-Hop', 'Heavy Metal', 'Instrumental',
+    'Jazz', 'Musical Theatre', 'Pop', 'Punk', 'R&B',
+    'Reggae', 'Rock n Roll', 'Soul', 'Other'
+)
+GENRE_BITS: Dict[str, int] = {name: 1 << i for i, name in enumerate(GENRE_BIT_ORDER)}
+
 # Valid US state codes
 VALID_STATES: Set[str] = {
     'AL', 'AK', 'AZ', 'AR', 'CA', 'CO', 'CT', 'DE', 'DC', 'FL',
@@ -27,6 +37,10 @@ MAX_PAGE_SIZE = 100
 # Search defaults
 MAX_SEARCH_RESULTS = 50
 
+# Nearby venue search (kilometres)
+DEFAULT_NEARBY_RADIUS_KM = 25
+MAX_NEARBY_RADIUS_KM = 200
+
 # File upload limits
 MAX_IMAGE_SIZE = 5 * 1024 * 1024  # 5MB
 ALLOWED_IMAGE_EXTENSIONS = {'jpg', 'jpeg', 'png', 'gif', 'webp'}
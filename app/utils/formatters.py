@@ -5,6 +5,7 @@ import re
 from babel import dates
 import dateutil.parser
 from datetime import datetime
+from typing import Optional
 
 
 def format_datetime(value, format='medium'):
@@ -51,3 +52,15 @@ def format_phone(phone: str) -> str:
 def format_address(city: str, state: str) -> str:
     """Format city and state for display."""
     return f"{city}, {state}"
+
+
+def normalize_key(value: Optional[str]) -> Optional[str]:
+    """
+    Normalize a value for case-insensitive lookups.
+    
+    Lowercases the value and collapses runs of whitespace into a single
+    space, so "San  Francisco " and "san francisco" share the same key.
+    """
+    if value is None:
+        return None
+    return ' '.join(value.split()).lower()
@@ -0,0 +1,24 @@
+"""
+Genre bitmask helpers for the Fyyur application.
+
+Artists and venues carry a denormalized ``genre_mask`` integer where bit ``i``
+is set when the entity has genre ``GENRE_BIT_ORDER[i]``. Genres outside
+``VALID_GENRES`` have no bit and are ignored by the mask.
+"""
+from typing import Iterable, List
+
+from app.utils.constants import GENRE_BITS
+
+
+def genre_mask(genre_names: Iterable[str]) -> int:
+    """Build the bitmask for a collection of genre names."""
+    mask = 0
+    for name in genre_names:
+        mask |= GENRE_BITS.get(name, 0)
+    return mask
+
+
+def genres_from_mask(mask: int) -> List[str]:
+    """Expand a bitmask back into genre names, in bit order."""
+    return [name for name, bit in GENRE_BITS.items() if mask & bit]
+
@@ -0,0 +1,97 @@
+"""
+Geospatial helpers for the Fyyur application.
+
+Venues with coordinates are bucketed into a fixed-size latitude/longitude
+grid. Each cell gets one integer id, numbered row by row (latitude-major), so
+the cells covering a search box form one contiguous id range per latitude row
+and can be fetched with indexed BETWEEN scans on plain SQLite.
+"""
+import math
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+EARTH_RADIUS_KM = 6371.0088
+
+# Grid cell edge in degrees (~11 km of latitude)
+GRID_CELL_DEGREES = 0.1
+
+_LAT_ROWS = int(round(180 / GRID_CELL_DEGREES))
+_LNG_COLUMNS = int(round(360 / GRID_CELL_DEGREES))
+_KM_PER_DEGREE_LAT = math.pi * EARTH_RADIUS_KM / 180
+
+
+def _lat_row(lat: float) -> int:
+    return min(int(math.floor((lat + 90) / GRID_CELL_DEGREES)), _LAT_ROWS - 1)
+
+
+def _lng_column(lng: float) -> int:
+    return int(math.floor((lng + 180) / GRID_CELL_DEGREES)) % _LNG_COLUMNS
+
+
+def grid_cell(lat: Optional[float], lng: Optional[float]) -> Optional[int]:
+    """Return the grid cell id for a coordinate, or None when either is missing."""
+    if lat is None or lng is None:
+        return None
+    return _lat_row(lat) * _LNG_COLUMNS + _lng_column(lng)
+
+
+def grid_cell_ranges(lat: float, lng: float, radius_km: float) -> List[Tuple[int, int]]:
+    """
+    Return inclusive (first, last) cell id ranges covering a search circle.
+
+    The circle's bounding box is widened in longitude by the cosine of the
+    most poleward latitude it touches. Boxes crossing the antimeridian are
+    split in two, and boxes reaching a pole cover every column of the row.
+    """
+    lat_delta = radius_km / _KM_PER_DEGREE_LAT
+    min_lat = max(lat - lat_delta, -90.0)
+    max_lat = min(lat + lat_delta, 90.0)
+
+    widest_lat = max(abs(min_lat), abs(max_lat))
+    cos_lat = math.cos(math.radians(widest_lat))
+    if cos_lat <= 1e-9 or radius_km / (_KM_PER_DEGREE_LAT * cos_lat) >= 180:
+        column_spans = [(0, _LNG_COLUMNS - 1)]
+    else:
+        lng_delta = radius_km / (_KM_PER_DEGREE_LAT * cos_lat)
+        first = int(math.floor((lng - lng_delta + 180) / GRID_CELL_DEGREES))
+        last = int(math.floor((lng + lng_delta + 180) / GRID_CELL_DEGREES))
+        if last - first + 1 >= _LNG_COLUMNS:
+            column_spans = [(0, _LNG_COLUMNS - 1)]
+        elif first < 0:
+            column_spans = [(first % _LNG_COLUMNS, _LNG_COLUMNS - 1), (0, last)]
+        elif last >= _LNG_COLUMNS:
+            column_spans = [(first, _LNG_COLUMNS - 1), (0, last % _LNG_COLUMNS)]
+        else:
+            column_spans = [(first, last)]
+
+    ranges = []
+    for row in range(_lat_row(min_lat), _lat_row(max_lat) + 1):
+        base = row * _LNG_COLUMNS
+        for first, last in column_spans:
+            ranges.append((base + first, base + last))
+    return ranges
+
+
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Great-circle distance between two points in kilometres."""
+    return haversine_many_km(lat1, lng1, [(lat2, lng2)])[0]
+
+
+def haversine_many_km(lat: float, lng: float, points: Iterable[Sequence[float]]) -> List[float]:
+    """
+    Distances from one origin to many points in kilometres.
+
+    The origin's radians and cosine are computed once for the whole batch.
+    """
+    origin_lat = math.radians(lat)
+    origin_lng = math.radians(lng)
+    cos_origin = math.cos(origin_lat)
+    sin, cos, asin, sqrt, radians = math.sin, math.cos, math.asin, math.sqrt, math.radians
+
+    distances = []
+    for point_lat, point_lng in points:
+        phi = radians(point_lat)
+        half_dphi = (phi - origin_lat) / 2
+        half_dlambda = (radians(point_lng) - origin_lng) / 2
+        h = sin(half_dphi) ** 2 + cos_origin * cos(phi) * sin(half_dlambda) ** 2
+        distances.append(2 * EARTH_RADIUS_KM * asin(sqrt(min(h, 1.0))))
+    return distances
@@ -0,0 +1,94 @@
+"""
+Incremental NDJSON/CSV record readers for bulk imports.
+
+Both readers take a binary stream (a request body, a file opened in 'rb',
+stdin's buffer) and read it in fixed-size blocks, so only the current block
+and the record being parsed are ever in memory. Each record comes out as
+(line_number, row, error): row is a dict of raw values when the record
+parsed, otherwise error says why not. Validation is left to the caller.
+
+CSV files need a header row. Empty cells are left out of the row (so the
+schema defaults apply) and the genres column holds names separated by ';'.
+"""
+import csv
+import json
+from typing import Any, BinaryIO, Dict, Iterator, Optional, Tuple
+
+IMPORT_FORMATS = ('ndjson', 'csv')
+
+# Content types that select a format when none is given explicitly
+IMPORT_MIMETYPES = {
+    'application/x-ndjson': 'ndjson',
+    'application/jsonl': 'ndjson',
+    'text/csv': 'csv',
+}
+
+LIST_SEPARATOR = ';'
+
+Record = Tuple[int, Optional[Dict[str, Any]], Optional[str]]
+
+
+def iter_lines(stream: BinaryIO, block_size: int = 64 * 1024) -> Iterator[str]:
+    """Decoded lines of `stream`, newline included, read `block_size` bytes at a time."""
+    pending = b''
+    first = True
+    while True:
+        block = stream.read(block_size)
+        if not block:
+            break
+        if first:
+            block = block.removeprefix(b'\xef\xbb\xbf')
+            first = False
+        pending += block
+        *lines, pending = pending.split(b'\n')
+        for line in lines:
+            yield line.decode('utf-8', errors='replace') + '\n'
+    if pending:
+        yield pending.decode('utf-8', errors='replace')
+
+
+def iter_ndjson_records(stream: BinaryIO) -> Iterator[Record]:
+    """One record per non-blank line; each line must hold a JSON object."""
+    for line_number, line in enumerate(iter_lines(stream), start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            yield line_number, None, f'Invalid JSON: {e}'
+            continue
+        if not isinstance(row, dict):
+            yield line_number, None, 'Expected a JSON object'
+            continue
+        yield line_number, row, None
+
+
+def iter_csv_records(stream: BinaryIO) -> Iterator[Record]:
+    """One record per CSV row, keyed by the header; line numbers count the header as line 1."""
+    reader = csv.reader(iter_lines(stream))
+    header = next(reader, None)
+    if header is None:
+        return
+    header = [name.strip() for name in header]
+    
+    line_number = reader.line_num + 1
+    for values in reader:
+        start, line_number = line_number, reader.line_num + 1
+        if not any(value.strip() for value in values):
+            continue
+        if len(values) != len(header):
+            yield start, None, f'Expected {len(header)} columns, got {len(values)}'
+            continue
+        row: Dict[str, Any] = {name: value for name, value in zip(header, values) if value != ''}
+        if 'genres' in row:
+            row['genres'] = [name.strip() for name in row['genres'].split(LIST_SEPARATOR) if name.strip()]
+        yield start, row, None
+
+
+def iter_records(stream: BinaryIO, fmt: str) -> Iterator[Record]:
+    """Records of `stream` in one of IMPORT_FORMATS."""
+    if fmt == 'csv':
+        return iter_csv_records(stream)
+    if fmt == 'ndjson':
+        return iter_ndjson_records(stream)
+    raise ValueError(f"Unknown import format '{fmt}' (expected one of: {', '.join(IMPORT_FORMATS)})")
@@ -0,0 +1,131 @@
+"""
+Flask JSON provider backed by orjson when it is installed.
+
+datetime/date/time values are written as ISO 8601, Pydantic URLs as plain
+strings and Pydantic models as their JSON-mode dump, so views can pass
+`model_dump()` output straight to `jsonify`. Keys keep their insertion order
+(no sorting). Without orjson the same rules run on the stdlib encoder.
+
+When the msgpack package is installed, `jsonify` responses are also offered
+as MessagePack: a request whose Accept prefers `application/msgpack` gets
+the same payload packed with the same conversions, except that datetimes
+become Timestamp extensions (naive values are UTC, as everywhere in the app).
+"""
+import dataclasses
+import decimal
+import json
+import uuid
+from datetime import date, datetime, time, timezone
+from typing import Any, Union
+
+from flask import Response, has_request_context, request
+from flask.json.provider import JSONProvider
+from pydantic import AnyUrl, BaseModel
+
+try:
+    import orjson
+except ImportError:  # optional speedup
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # optional; without it every client gets JSON
+    msgpack = None
+
+MSGPACK_MIMETYPE = 'application/msgpack'
+
+
+def _default(o: Any) -> Any:
+    """Convert values neither encoder handles by itself."""
+    if isinstance(o, (datetime, date, time)):
+        return o.isoformat()
+    if isinstance(o, AnyUrl):
+        return str(o)
+    if isinstance(o, BaseModel):
+        return o.model_dump(mode='json')
+    if isinstance(o, (decimal.Decimal, uuid.UUID)):
+        return str(o)
+    if dataclasses.is_dataclass(o) and not isinstance(o, type):  # stdlib only; orjson encodes them natively
+        return dataclasses.asdict(o)
+    if hasattr(o, '__html__'):
+        return str(o.__html__())
+    raise TypeError(f'Object of type {type(o).__name__} is not JSON serializable')
+
+
+def _msgpack_default(o: Any) -> Any:
+    """The JSON conversions, with datetimes kept as timestamps."""
+    if isinstance(o, datetime):
+        # Aware datetimes are packed natively (datetime=True); naive ones are UTC
+        return o.replace(tzinfo=timezone.utc)
+    if isinstance(o, BaseModel):
+        return o.model_dump()  # python mode, so nested datetimes come back here
+    return _default(o)
+
+
+def wants_msgpack() -> bool:
+    """True when msgpack is available and the client prefers it over JSON."""
+    if msgpack is None or not has_request_context():
+        return False
+    return request.accept_mimetypes.best_match(['application/json', MSGPACK_MIMETYPE]) == MSGPACK_MIMETYPE
+
+
+class FastJSONProvider(JSONProvider):
+    """JSON provider used by `jsonify`, `request.get_json` and the `tojson` filter."""
+    
+    mimetype = 'application/json'
+    
+    def __init__(self, app, use_orjson: bool = True):
+        super().__init__(app)
+        self._orjson = orjson if use_orjson else None
+    
+    @property
+    def backend(self) -> str:
+        return 'orjson' if self._orjson is not None else 'json'
+    
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        # Callers asking for stdlib-only options (indent=4, sort_keys...) get the stdlib encoder
+        if not kwargs:
+            return self.dumpb(obj).decode()
+        kwargs.setdefault('default', _default)
+        kwargs.setdefault('ensure_ascii', False)
+        return json.dumps(obj, **kwargs)
+    
+    def loads(self, s: Union[str, bytes], **kwargs: Any) -> Any:
+        if self._orjson is not None and not kwargs:
+            return self._orjson.loads(s)
+        return json.loads(s, **kwargs)
+    
+    def dumpb(self, obj: Any, pretty: bool = False) -> bytes:
+        """Serialize straight to UTF-8 bytes (what responses and streams need)."""
+        if self._orjson is not None:
+            options = self._orjson.OPT_NON_STR_KEYS | (self._orjson.OPT_INDENT_2 if pretty else 0)
+            try:
+                return self._orjson.dumps(obj, default=_default, option=options)
+            except self._orjson.JSONEncodeError:
+                # e.g. integers beyond 64 bits; let the stdlib encoder decide
+                pass
+        if pretty:
+            return json.dumps(obj, default=_default, ensure_ascii=False, indent=2).encode()
+        return json.dumps(obj, default=_default, ensure_ascii=False, separators=(',', ':')).encode()
+    
+    def packb(self, obj: Any) -> bytes:
+        """Serialize to MessagePack (requires the msgpack package)."""
+        return msgpack.packb(obj, default=_msgpack_default, datetime=True)
+    
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        """Build the `jsonify` response: MessagePack when the client asks for it, JSON otherwise."""
+        if wants_msgpack():
+            response = self._app.response_class(
+                self.packb(self._prepare_response_obj(args, kwargs)), mimetype=MSGPACK_MIMETYPE
+            )
+        else:
+            response = self.json_response(*args, **kwargs)
+        if msgpack is not None:
+            response.vary.add('Accept')
+        return response
+    
+    def json_response(self, *args: Any, **kwargs: Any) -> Response:
+        """Build a JSON response, indented in debug mode like Flask's default provider."""
+        obj = self._prepare_response_obj(args, kwargs)
+        body = self.dumpb(obj, pretty=self._app.debug) + b'\n'
+        return self._app.response_class(body, mimetype=self.mimetype)
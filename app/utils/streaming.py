@@ -0,0 +1,54 @@
+"""
+Newline-delimited JSON (NDJSON) streaming for large list endpoints.
+
+A client sending `Accept: application/x-ndjson` gets one JSON document per
+line, serialized row by row from a generator and flushed in chunks of about
+NDJSON_CHUNK_SIZE bytes. Paired with a yield_per query, memory use stays
+flat no matter how many rows the endpoint returns.
+"""
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+from flask import Response, current_app, request, stream_with_context
+
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+
+def wants_ndjson() -> bool:
+    """True when the client prefers NDJSON over a JSON array."""
+    return request.accept_mimetypes.best_match(['application/json', NDJSON_MIMETYPE]) == NDJSON_MIMETYPE
+
+
+def iter_ndjson_chunks(rows: Iterable[Any], serialize: Callable[[Any], bytes],
+                       chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+    """Serialize rows one per line, yielding roughly `chunk_size` bytes at a time."""
+    buffer = bytearray()
+    for row in rows:
+        buffer += serialize(row)
+        buffer += b'\n'
+        if len(buffer) >= chunk_size:
+            yield bytes(buffer)
+            buffer.clear()
+    if buffer:
+        yield bytes(buffer)
+
+
+def ndjson_response(rows: Iterable[Any], transform: Optional[Callable[[Any], Any]] = None) -> Response:
+    """
+    Stream `rows` as NDJSON.
+
+    `transform` maps each row to something JSON-serializable (e.g. a model's
+    to_dict); the request context stays open while the body is generated.
+    """
+    provider = current_app.json
+    dumpb = getattr(provider, 'dumpb', None) or (lambda obj: provider.dumps(obj).encode())
+    serialize = dumpb if transform is None else (lambda row: dumpb(transform(row)))
+    chunk_size = current_app.config.get('NDJSON_CHUNK_SIZE', 64 * 1024)
+    
+    response = Response(
+        stream_with_context(iter_ndjson_chunks(rows, serialize, chunk_size)),
+        mimetype=NDJSON_MIMETYPE
+    )
+    response.vary.add('Accept')
+    # Ask nginx-style proxies to pass chunks through instead of buffering the stream
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
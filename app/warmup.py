@@ -0,0 +1,112 @@
+"""
+Worker warm-up.
+
+Everything that is otherwise paid for by the first requests a fresh worker
+serves is done once at boot instead: SQLAlchemy mapper configuration, Jinja
+template compilation, opening the connection pool, and priming the genre,
+show-statistics and homepage caches. Each step is timed; a failing step is
+logged and skipped so a cold database never keeps a worker from starting.
+
+create_app runs the warm-up unless WARMUP_ENABLED is off, the app is built
+by the `flask` CLI, or the caller passes warm_up=False (tests and scripts).
+With gunicorn's preload_app, disable it in create_app and call warm_up(app)
+from a post_fork hook instead, so pooled connections are not shared.
+"""
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import configure_mappers
+from sqlalchemy.pool import QueuePool
+
+from app.models import db
+
+
+def _configure_mappers(app) -> int:
+    configure_mappers()
+    return len(db.Model.registry.mappers)
+
+
+def _compile_templates(app) -> int:
+    names = app.jinja_env.list_templates(extensions=('html',))
+    for name in names:
+        app.jinja_env.get_template(name)
+    return len(names)
+
+
+def _fill_pool(app) -> int:
+    engine = db.engine
+    size = app.config.get('WARMUP_POOL_SIZE')
+    if size is None:
+        size = engine.pool.size() if isinstance(engine.pool, QueuePool) else 1
+    
+    # Hold every connection at once, otherwise the pool hands back the same one
+    connections = [engine.connect() for _ in range(size)]
+    try:
+        for connection in connections:
+            connection.execute(text('SELECT 1'))
+    finally:
+        for connection in connections:
+            connection.close()
+    return size
+
+
+def _prime_genres(app) -> int:
+    from app.services import GenreService
+    return len(GenreService().get_popular_genres())
+
+
+def _prime_stats(app) -> int:
+    from app.services import ShowService
+    return ShowService().get_show_statistics()['total_shows']
+
+
+def _prime_homepage(app) -> int:
+    snapshot = app.extensions.get('snapshots', {}).get('homepage')
+    if snapshot is None:
+        return 0
+    return len(snapshot.refresh()['venues'])
+
+
+WARMUP_STEPS: List[Tuple[str, Callable[[Any], int]]] = [
+    ('mappers', _configure_mappers),
+    ('templates', _compile_templates),
+    ('pool', _fill_pool),
+    ('genres', _prime_genres),
+    ('stats', _prime_stats),
+    ('homepage', _prime_homepage),
+]
+
+
+def warm_up(app) -> Dict[str, Any]:
+    """
+    Run every warm-up step and report how long each took.
+
+    Returns {'steps': {name: {'ms', 'items'}}, 'errors': {name: message},
+    'total_ms'}; the report is also kept in app.extensions['warmup'].
+    """
+    report: Dict[str, Any] = {'steps': {}, 'errors': {}}
+    started = time.perf_counter()
+    
+    with app.app_context():
+        for name, step in WARMUP_STEPS:
+            step_started = time.perf_counter()
+            try:
+                items = step(app)
+            except Exception as e:
+                app.logger.warning('Warm-up step %s failed: %s', name, e)
+                report['errors'][name] = str(e)
+                items = None
+            report['steps'][name] = {
+                'ms': round((time.perf_counter() - step_started) * 1000, 2),
+                'items': items
+            }
+    
+    report['total_ms'] = round((time.perf_counter() - started) * 1000, 2)
+    app.extensions['warmup'] = report
+    app.logger.info(
+        'Warm-up finished in %.1f ms (%s)', report['total_ms'],
+        ', '.join(f"{name}={step['ms']:.1f}ms" for name, step in report['steps'].items())
+    )
+    return report
+
@@ -14,6 +14,8 @@ class Config:
     
     # Security
     SECRET_KEY = os.environ.get('SECRET_KEY') or os.urandom(32)
+    # A random per-process fallback differs between workers (see CACHE_BACKEND)
+    SECRET_KEY_IS_EPHEMERAL = not os.environ.get('SECRET_KEY')
     WTF_CSRF_ENABLED = True
     WTF_CSRF_TIME_LIMIT = None
     
@@ -27,6 +29,77 @@ class Config:
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     SQLALCHEMY_ECHO = False
     
+    # Cache storage (see app/cache/backends.py): 'memory' is private to each
+    # worker process; 'sqlite' adds a shared L2 file so every worker on the
+    # host reuses the same entries
+    CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'memory')
+    # Defaults to the instance folder; the file must be private to the app's user.
+    # Entries are signed with SECRET_KEY: 'sqlite' refuses to start unless it comes from the environment.
+    CACHE_SQLITE_PATH = os.environ.get('CACHE_SQLITE_PATH')
+    CACHE_DEFAULT_TTL = 300  # seconds
+    CACHE_MAX_ENTRIES = 10000  # shared L2
+    CACHE_L1_MAX_ENTRIES = 1024  # per process
+    CACHE_L1_TTL = 5  # seconds an L1 copy may outlive a remote invalidation
+    
+    # Response cache for the JSON API (see app/cache)
+    RESPONSE_CACHE_ENABLED = True
+    
+    # Memoized, coalesced service reads (see app/cache/singleflight.py)
+    SERVICE_CACHE_ENABLED = True
+    
+    # Known-missing ids answered without a query (per entity); needs the shared
+    # CACHE_BACKEND='sqlite', so other workers see newly created ids
+    NEGATIVE_CACHE_ENABLED = True
+    NEGATIVE_CACHE_MAX_ENTRIES = 10000
+    NEGATIVE_CACHE_TTL = 300  # seconds
+    
+    # Seconds between sweeps of started shows into the past-show aggregates
+    # (0 disables the in-process sweeper; `flask sweep-show-aggregates` can run from cron)
+    SHOW_AGGREGATE_SWEEP_INTERVAL = 60
+    
+    # Rendered template fragments ({% cache %} blocks)
+    FRAGMENT_CACHE_ENABLED = True
+    
+    # Publishing mode: serve artist/venue pages pre-rendered to static files
+    PAGE_PUBLISHING_ENABLED = os.environ.get('PAGE_PUBLISHING_ENABLED', '').lower() in ('1', 'true', 'yes')
+    PAGE_PUBLISH_DIR = os.environ.get('PAGE_PUBLISH_DIR') or \
+        os.path.join(os.path.dirname(__file__), 'instance', 'published')
+    
+    # Artist/venue API documents served from the read_documents table
+    READ_MODEL_ENABLED = True
+    
+    # NDJSON streaming of the list APIs (Accept: application/x-ndjson)
+    NDJSON_BATCH_SIZE = 500  # rows fetched per round trip
+    NDJSON_CHUNK_SIZE = 65536  # bytes buffered before each flush
+    
+    # Response compression (see app/utils/compression.py); br/zstd need the
+    # optional brotli/zstandard packages, gzip is always available
+    COMPRESSION_ENABLED = True
+    COMPRESSION_MIN_SIZE = 1024  # bytes; smaller bodies are sent as-is
+    COMPRESSION_ALGORITHMS = ('br', 'zstd', 'gzip')  # server preference on equal client q-values
+    COMPRESSION_LEVELS = {'br': 5, 'zstd': 3, 'gzip': 6}
+    
+    # Sub-requests accepted by one POST /api/batch (see app/utils/batch.py)
+    BATCH_MAX_REQUESTS = 20
+    
+    # Entries per page of GET /api/changes (clients may ask for fewer with ?limit=)
+    CHANGE_FEED_PAGE_SIZE = 500
+    
+    # Bulk imports (POST /api/import, flask import-data; see app/services/import_service.py)
+    IMPORT_CHUNK_SIZE = 500  # rows validated and committed per transaction
+    IMPORT_MAX_ERRORS = 1000  # row errors reported; later ones are only counted
+    
+    # Last-Modified / If-Modified-Since on the detail routes (see app/cache/conditional.py)
+    CONDITIONAL_GET_ENABLED = True
+    
+    # Homepage data served from a background-refreshed snapshot
+    HOMEPAGE_SNAPSHOT_ENABLED = True
+    HOMEPAGE_SNAPSHOT_MAX_AGE = 60  # seconds
+    
+    # Worker warm-up at boot (see app/warmup.py)
+    WARMUP_ENABLED = os.environ.get('WARMUP_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+    WARMUP_POOL_SIZE = None  # connections to open; defaults to the pool's size
+    
     # Flask-Migrate
     MIGRATION_DIR = os.path.join(os.path.dirname(__file__), 'migrations')
     
@@ -60,6 +133,18 @@ class TestingConfig(Config):
     
     # Disable CSRF for testing
     WTF_CSRF_ENABLED = False
+    
+    # Tests opt in to caching explicitly
+    RESPONSE_CACHE_ENABLED = False
+    SERVICE_CACHE_ENABLED = False
+    HOMEPAGE_SNAPSHOT_ENABLED = False
+    FRAGMENT_CACHE_ENABLED = False
+    PAGE_PUBLISHING_ENABLED = False
+    NEGATIVE_CACHE_ENABLED = False
+    READ_MODEL_ENABLED = False
+    COMPRESSION_ENABLED = False
+    SHOW_AGGREGATE_SWEEP_INTERVAL = 0
+    WARMUP_ENABLED = False
 
 
 class ProductionConfig(Config):
@@ -0,0 +1,94 @@
+"""Add normalized lookup keys to artists and venues
+
+Revision ID: 3f9a1c2d7b84
+Revises: c7d504eff853
+Create Date: 2026-10-19 09:12:41.518204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f9a1c2d7b84'
+down_revision = 'c7d504eff853'
+branch_labels = None
+depends_on = None
+
+BACKFILL_BATCH_SIZE = 1000
+
+
+def _normalize_key(value):
+    """Mirror of app.utils.formatters.normalize_key, frozen for this migration."""
+    if value is None:
+        return None
+    return ' '.join(value.split()).lower()
+
+
+def _backfill(table_name):
+    """Populate the key columns of an existing table in id-ordered batches."""
+    connection = op.get_bind()
+    table = sa.table(
+        table_name,
+        sa.column('id', sa.Integer),
+        sa.column('name', sa.String),
+        sa.column('city', sa.String),
+        sa.column('state', sa.String),
+        sa.column('name_key', sa.String),
+        sa.column('city_key', sa.String),
+        sa.column('state_key', sa.String),
+    )
+    update = table.update().where(table.c.id == sa.bindparam('row_id')).values(
+        name_key=sa.bindparam('new_name_key'),
+        city_key=sa.bindparam('new_city_key'),
+        state_key=sa.bindparam('new_state_key'),
+    )
+
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            sa.select(table.c.id, table.c.name, table.c.city, table.c.state)
+            .where(table.c.id > last_id)
+            .order_by(table.c.id)
+            .limit(BACKFILL_BATCH_SIZE)
+        ).fetchall()
+        if not rows:
+            break
+
+        connection.execute(update, [
+            {
+                'row_id': row.id,
+                'new_name_key': _normalize_key(row.name),
+                'new_city_key': _normalize_key(row.city),
+                'new_state_key': _normalize_key(row.state),
+            }
+            for row in rows
+        ])
+        last_id = rows[-1].id
+
+
+def upgrade():
+    for table_name, prefix in (('artists', 'artist'), ('venues', 'venue')):
+        with op.batch_alter_table(table_name) as batch_op:
+            batch_op.add_column(sa.Column('name_key', sa.String(length=255), nullable=True))
+            batch_op.add_column(sa.Column('city_key', sa.String(length=120), nullable=True))
+            batch_op.add_column(sa.Column('state_key', sa.String(length=2), nullable=True))
+
+        _backfill(table_name)
+
+        with op.batch_alter_table(table_name) as batch_op:
+            batch_op.alter_column('name_key', existing_type=sa.String(length=255), nullable=False)
+            batch_op.alter_column('city_key', existing_type=sa.String(length=120), nullable=False)
+            batch_op.alter_column('state_key', existing_type=sa.String(length=2), nullable=False)
+            batch_op.create_index(f'idx_{prefix}_name_city_key', ['name_key', 'city_key'], unique=False)
+            batch_op.create_index(f'idx_{prefix}_city_state_key', ['city_key', 'state_key'], unique=False)
+
+
+def downgrade():
+    for table_name, prefix in (('venues', 'venue'), ('artists', 'artist')):
+        with op.batch_alter_table(table_name) as batch_op:
+            batch_op.drop_index(f'idx_{prefix}_city_state_key')
+            batch_op.drop_index(f'idx_{prefix}_name_city_key')
+            batch_op.drop_column('state_key')
+            batch_op.drop_column('city_key')
+            batch_op.drop_column('name_key')
@@ -0,0 +1,33 @@
+"""Add optional venue location with grid cell index
+
+Revision ID: 5b7c9e0a2f14
+Revises: 8d2e4b6f1a37
+Create Date: 2026-10-19 13:27:55.140263
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5b7c9e0a2f14'
+down_revision = '8d2e4b6f1a37'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Existing venues have no coordinates, so there is nothing to backfill
+    with op.batch_alter_table('venues') as batch_op:
+        batch_op.add_column(sa.Column('latitude', sa.Float(), nullable=True))
+        batch_op.add_column(sa.Column('longitude', sa.Float(), nullable=True))
+        batch_op.add_column(sa.Column('grid_cell', sa.Integer(), nullable=True))
+        batch_op.create_index('idx_venue_grid_cell', ['grid_cell'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('venues') as batch_op:
+        batch_op.drop_index('idx_venue_grid_cell')
+        batch_op.drop_column('grid_cell')
+        batch_op.drop_column('longitude')
+        batch_op.drop_column('latitude')
@@ -0,0 +1,38 @@
+"""Add the timestamp columns the models declare but earlier migrations missed
+
+Revision ID: 7e3a9d51c6b2
+Revises: e2b8d4f61c05
+Create Date: 2026-10-19 17:48:05.118342
+
+"""
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7e3a9d51c6b2'
+down_revision = 'e2b8d4f61c05'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # shows.updated_at backs Last-Modified and the change log backfill
+    with op.batch_alter_table('shows') as batch_op:
+        batch_op.add_column(sa.Column('updated_at', sa.DateTime(), nullable=True))
+    
+    # genres never got BaseModel's timestamps, so every ORM query on Genre failed
+    with op.batch_alter_table('genres') as batch_op:
+        batch_op.add_column(sa.Column('created_at', sa.DateTime(), nullable=True))
+        batch_op.add_column(sa.Column('updated_at', sa.DateTime(), nullable=True))
+    op.get_bind().execute(sa.text("UPDATE genres SET created_at = :now"), {'now': datetime.utcnow()})
+
+
+def downgrade():
+    with op.batch_alter_table('genres') as batch_op:
+        batch_op.drop_column('updated_at')
+        batch_op.drop_column('created_at')
+    with op.batch_alter_table('shows') as batch_op:
+        batch_op.drop_column('updated_at')
@@ -0,0 +1,53 @@
+"""Add genre bitmask to artists and venues
+
+Revision ID: 8d2e4b6f1a37
+Revises: 3f9a1c2d7b84
+Create Date: 2026-10-19 11:04:17.302956
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8d2e4b6f1a37'
+down_revision = '3f9a1c2d7b84'
+branch_labels = None
+depends_on = None
+
+# Frozen copy of app.utils.constants.GENRE_BIT_ORDER at the time of this migration
+GENRE_BIT_ORDER = (
+    'Alternative', 'Blues', 'Classical', 'Country', 'Electronic',
+    'Folk', 'Funk', 'Hip-Hop', 'Heavy Metal', 'Instrumental',
+    'Jazz', 'Musical Theatre', 'Pop', 'Punk', 'R&B',
+    'Reggae', 'Rock n Roll', 'Soul', 'Other'
+)
+
+
+def upgrade():
+    for table_name in ('artists', 'venues'):
+        with op.batch_alter_table(table_name) as batch_op:
+            batch_op.add_column(sa.Column('genre_mask', sa.Integer(), nullable=False, server_default='0'))
+
+    # Backfill: one set-based UPDATE per genre bit and table
+    connection = op.get_bind()
+    for table_name, link_table, fk in (
+        ('artists', 'artist_genres', 'artist_id'),
+        ('venues', 'venue_genres', 'venue_id'),
+    ):
+        for position, genre_name in enumerate(GENRE_BIT_ORDER):
+            connection.execute(
+                sa.text(
+                    f"UPDATE {table_name} SET genre_mask = genre_mask | :bit "
+                    f"WHERE id IN (SELECT {link_table}.{fk} FROM {link_table} "
+                    f"JOIN genres ON genres.id = {link_table}.genre_id "
+                    f"WHERE genres.name = :name)"
+                ),
+                {'bit': 1 << position, 'name': genre_name}
+            )
+
+
+def downgrade():
+    for table_name in ('venues', 'artists'):
+        with op.batch_alter_table(table_name) as batch_op:
+            batch_op.drop_column('genre_mask')
@@ -0,0 +1,54 @@
+"""Add materialized show aggregates to artists and venues
+
+Revision ID: a4e61c8d9b23
+Revises: 5b7c9e0a2f14
+Create Date: 2026-10-19 16:27:05.184392
+
+"""
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a4e61c8d9b23'
+down_revision = '5b7c9e0a2f14'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    for table_name, prefix in (('artists', 'artist'), ('venues', 'venue')):
+        with op.batch_alter_table(table_name) as batch_op:
+            batch_op.add_column(sa.Column('num_upcoming_shows', sa.Integer(), nullable=False, server_default='0'))
+            batch_op.add_column(sa.Column('num_past_shows', sa.Integer(), nullable=False, server_default='0'))
+            batch_op.add_column(sa.Column('next_show_at', sa.DateTime(), nullable=True))
+            batch_op.add_column(sa.Column('last_show_at', sa.DateTime(), nullable=True))
+            batch_op.create_index(f'idx_{prefix}_next_show_at', ['next_show_at'], unique=False)
+    
+    # Backfill: one set-based UPDATE per table with correlated subqueries
+    connection = op.get_bind()
+    now = datetime.utcnow()
+    for table_name, fk in (('artists', 'artist_id'), ('venues', 'venue_id')):
+        owned = f"FROM shows WHERE shows.{fk} = {table_name}.id"
+        connection.execute(
+            sa.text(
+                f"UPDATE {table_name} SET "
+                f"num_upcoming_shows = (SELECT COUNT(*) {owned} AND shows.start_time > :now), "
+                f"num_past_shows = (SELECT COUNT(*) {owned} AND shows.start_time <= :now), "
+                f"next_show_at = (SELECT MIN(shows.start_time) {owned} AND shows.start_time > :now), "
+                f"last_show_at = (SELECT MAX(shows.start_time) {owned} AND shows.start_time <= :now)"
+            ),
+            {'now': now}
+        )
+
+
+def downgrade():
+    for table_name, prefix in (('venues', 'venue'), ('artists', 'artist')):
+        with op.batch_alter_table(table_name) as batch_op:
+            batch_op.drop_index(f'idx_{prefix}_next_show_at')
+            batch_op.drop_column('last_show_at')
+            batch_op.drop_column('next_show_at')
+            batch_op.drop_column('num_past_shows')
+            batch_op.drop_column('num_upcoming_shows')
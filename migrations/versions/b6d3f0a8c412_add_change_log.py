@@ -0,0 +1,43 @@
+"""Add change log behind the /api/changes sync feed
+
+Revision ID: b6d3f0a8c412
+Revises: 7e3a9d51c6b2
+Create Date: 2026-10-19 18:11:26.402731
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b6d3f0a8c412'
+down_revision = '7e3a9d51c6b2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'change_log',
+        sa.Column('seq', sa.Integer(), nullable=False),
+        sa.Column('kind', sa.String(length=16), nullable=False),
+        sa.Column('entity_id', sa.Integer(), nullable=False),
+        sa.Column('operation', sa.String(length=8), nullable=False),
+        sa.Column('changed_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('seq'),
+        sqlite_autoincrement=True
+    )
+    op.create_index('idx_change_log_entity', 'change_log', ['kind', 'entity_id'], unique=False)
+    
+    # Backfill: every existing entity is 'created', so a client syncing from 0 gets all of them
+    connection = op.get_bind()
+    for kind in ('artists', 'venues', 'shows'):
+        connection.execute(sa.text(
+            f"INSERT INTO change_log (kind, entity_id, operation, changed_at) "
+            f"SELECT '{kind}', id, 'created', COALESCE(updated_at, created_at) FROM {kind} ORDER BY id"
+        ))
+
+
+def downgrade():
+    op.drop_index('idx_change_log_entity', table_name='change_log')
+    op.drop_table('change_log')
@@ -0,0 +1,35 @@
+"""Add read-model document table for the artist and venue API
+
+Revision ID: e2b8d4f61c05
+Revises: a4e61c8d9b23
+Create Date: 2026-10-19 17:02:41.593017
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2b8d4f61c05'
+down_revision = 'a4e61c8d9b23'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Documents are built lazily and by `flask rebuild-read-model`, so nothing to backfill
+    op.create_table(
+        'read_documents',
+        sa.Column('kind', sa.String(length=16), nullable=False),
+        sa.Column('entity_id', sa.Integer(), nullable=False),
+        sa.Column('body', sa.LargeBinary(), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.Column('source_updated_at', sa.DateTime(), nullable=True),
+        sa.Column('expires_at', sa.DateTime(), nullable=True),
+        sa.Column('built_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('kind', 'entity_id')
+    )
+
+
+def downgrade():
+    op.drop_table('read_documents')
@@ -0,0 +1,102 @@
+"""
+Benchmark the columnar /shows/api encoding against the default one.
+
+Seeds shows spread over a few artists and venues, then reports payload size
+(raw and gzipped) and build + encode time for the default row encoding
+(Show.to_dict() over ORM objects, as the endpoint does) and the columnar one
+(plain column rows plus lookup tables).
+
+Usage: python scripts/bench_columnar.py [--shows 20000] [--artists 50] [--venues 20] [--repeat 5]
+"""
+import sys
+import os
+import argparse
+import gzip
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import create_app
+from app.models import db, Venue, Artist, Show
+from app.services import ShowService
+
+
+def seed_shows(show_count, artist_count, venue_count):
+    """Create `show_count` shows over `artist_count` artists and `venue_count` venues."""
+    artists = [
+        Artist(name=f'Bench Artist {i}', city='San Francisco', state='CA',
+               image_link=f'https://images.example.com/artists/{i}.jpg')
+        for i in range(artist_count)
+    ]
+    venues = [
+        Venue(name=f'Bench Venue {i}', city='San Francisco', state='CA', address=f'{i} Bench St',
+              image_link=f'https://images.example.com/venues/{i}.jpg')
+        for i in range(venue_count)
+    ]
+    db.session.add_all(artists + venues)
+    db.session.flush()
+    
+    now = datetime.utcnow()
+    db.session.add_all([
+        Show(
+            artist_id=artists[i % len(artists)].id,
+            venue_id=venues[i % len(venues)].id,
+            start_time=now + timedelta(hours=i - show_count // 2)
+        )
+        for i in range(show_count)
+    ])
+    db.session.commit()
+
+
+def measure(app, build, repeat):
+    """Average milliseconds to build and serialize a payload, and the body it produced."""
+    started = time.perf_counter()
+    for _ in range(repeat):
+        db.session.expunge_all()  # every run loads its rows afresh
+        body = app.json.response(build()).get_data()
+    return (time.perf_counter() - started) * 1000 / repeat, body
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--shows', type=int, default=20000)
+    parser.add_argument('--artists', type=int, default=50)
+    parser.add_argument('--venues', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    
+    db_fd, db_path = tempfile.mkstemp()
+    app = create_app('testing')
+    app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{db_path}'
+    
+    try:
+        with app.app_context():
+            db.create_all()
+            seed_shows(args.shows, args.artists, args.venues)
+            service = ShowService()
+            encodings = [
+                ('default (rows)', lambda: [show.to_dict() for show in service.get_all()]),
+                ('columnar', service.get_show_columns),
+            ]
+            
+            print(f"/shows/api with {args.shows} shows, {args.artists} artists, {args.venues} venues "
+                  f"({args.repeat} runs each, JSON backend: {getattr(app.json, 'backend', 'json')})")
+            baseline = None
+            for name, build in encodings:
+                ms, body = measure(app, build, args.repeat)
+                gzipped = len(gzip.compress(body, compresslevel=6))
+                baseline = baseline or (ms, len(body), gzipped)
+                print(f"   • {name:<15} {len(body) / 1024:9.1f} KiB ({baseline[1] / len(body):4.1f}x smaller)  "
+                      f"gzip {gzipped / 1024:8.1f} KiB ({baseline[2] / gzipped:4.1f}x)  "
+                      f"{ms:8.2f} ms ({baseline[0] / ms:4.1f}x faster)")
+            db.drop_all()
+    finally:
+        os.close(db_fd)
+        os.unlink(db_path)
+
+
+if __name__ == '__main__':
+    main()
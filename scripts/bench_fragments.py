@@ -0,0 +1,87 @@
+"""
+Benchmark template fragment caching on a venue page with many shows.
+
+Usage: python scripts/bench_fragments.py [--shows 1000] [--repeat 20]
+"""
+import sys
+import os
+import argparse
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from flask import render_template
+from app import create_app
+from app.models import db, Venue, Artist, Show, Genre
+from app.services import VenueService
+
+
+def seed_venue(show_count):
+    """Create one venue with `show_count` shows split between past and upcoming."""
+    venue = Venue(name='Benchmark Hall', city='San Francisco', state='CA', address='1 Bench St')
+    venue.genres.append(Genre(name='Jazz'))
+    artists = [Artist(name=f'Bench Artist {i}', city='San Francisco', state='CA') for i in range(50)]
+    db.session.add(venue)
+    db.session.add_all(artists)
+    db.session.flush()
+    
+    now = datetime.utcnow()
+    db.session.add_all([
+        Show(
+            venue_id=venue.id,
+            artist_id=artists[i % len(artists)].id,
+            start_time=now + timedelta(days=i - show_count // 2, hours=1)
+        )
+        for i in range(show_count)
+    ])
+    db.session.commit()
+    return venue.id
+
+
+def time_renders(app, venue, repeat):
+    """Average milliseconds per render of the venue page."""
+    with app.test_request_context(f'/venues/{venue.id}'):
+        started = time.perf_counter()
+        for _ in range(repeat):
+            render_template('pages/show_venue.html', venue=venue)
+        return (time.perf_counter() - started) * 1000 / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--shows', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+    
+    db_fd, db_path = tempfile.mkstemp()
+    app = create_app('testing')
+    app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{db_path}'
+    
+    try:
+        with app.app_context():
+            db.create_all()
+            venue_id = seed_venue(args.shows)
+            venue = VenueService().get_venue_response(venue_id)
+            
+            app.config['FRAGMENT_CACHE_ENABLED'] = False
+            uncached = time_renders(app, venue, args.repeat)
+            
+            app.config['FRAGMENT_CACHE_ENABLED'] = True
+            time_renders(app, venue, 1)  # fill the cache
+            cached = time_renders(app, venue, args.repeat)
+            
+            print(f"Venue page with {args.shows} shows ({args.repeat} renders each)")
+            print(f"   • Without fragment cache: {uncached:8.2f} ms/render")
+            print(f"   • With fragment cache:    {cached:8.2f} ms/render")
+            print(f"   • Speed-up:               {uncached / cached:8.1f}x")
+            db.drop_all()
+    finally:
+        os.close(db_fd)
+        os.unlink(db_path)
+
+
+if __name__ == '__main__':
+    main()
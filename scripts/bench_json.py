@@ -0,0 +1,118 @@
+"""
+Benchmark JSON serialization of /shows/api payloads.
+
+Compares Flask's default provider with FastJSONProvider on both of its
+backends (orjson when installed, stdlib otherwise), serializing the shows
+list as `to_dict()` rows and as rows holding raw datetimes (as
+`model_dump()` returns them), then measures
+end-to-end requests per second on the endpoint itself.
+
+Usage: python scripts/bench_json.py [--shows 20000] [--repeat 10]
+"""
+import sys
+import os
+import argparse
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from flask.json.provider import DefaultJSONProvider
+from app import create_app
+from app.models import db, Venue, Artist, Show
+from app.services import ShowService
+from app.utils.json_provider import FastJSONProvider, orjson
+
+
+def seed_shows(show_count):
+    """Create `show_count` shows spread over 50 artists and 20 venues."""
+    artists = [
+        Artist(name=f'Bench Artist {i}', city='San Francisco', state='CA',
+               image_link=f'https://images.example.com/artists/{i}.jpg')
+        for i in range(50)
+    ]
+    venues = [
+        Venue(name=f'Bench Venue {i}', city='San Francisco', state='CA', address=f'{i} Bench St',
+              image_link=f'https://images.example.com/venues/{i}.jpg')
+        for i in range(20)
+    ]
+    db.session.add_all(artists + venues)
+    db.session.flush()
+    
+    now = datetime.utcnow()
+    db.session.add_all([
+        Show(
+            artist_id=artists[i % len(artists)].id,
+            venue_id=venues[i % len(venues)].id,
+            start_time=now + timedelta(hours=i - show_count // 2)
+        )
+        for i in range(show_count)
+    ])
+    db.session.commit()
+
+
+def time_serialization(provider, payload, repeat):
+    """Average milliseconds to build one JSON response from `payload`."""
+    started = time.perf_counter()
+    for _ in range(repeat):
+        body = provider.response(payload).get_data()
+    return (time.perf_counter() - started) * 1000 / repeat, len(body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--shows', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+    
+    db_fd, db_path = tempfile.mkstemp()
+    app = create_app('testing')
+    app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{db_path}'
+    
+    providers = [('Flask default', DefaultJSONProvider(app))]
+    if orjson is not None:
+        providers.append(('Fast (orjson)', FastJSONProvider(app)))
+    providers.append(('Fast (stdlib)', FastJSONProvider(app, use_orjson=False)))
+    
+    try:
+        with app.app_context():
+            db.create_all()
+            seed_shows(args.shows)
+            shows = ShowService().get_all()
+            payloads = {
+                'to_dict() rows': [show.to_dict() for show in shows],
+                # Datetimes left for the encoder (Flask's default writes them as HTTP dates)
+                'raw rows': [
+                    {**show.to_dict(), 'start_time': show.start_time, 'created_at': show.created_at}
+                    for show in shows
+                ],
+            }
+            
+            print(f"/shows/api payload with {args.shows} shows ({args.repeat} runs each)")
+            for payload_name, payload in payloads.items():
+                print(f"   {payload_name}:")
+                baseline = None
+                for name, provider in providers:
+                    ms, size = time_serialization(provider, payload, args.repeat)
+                    baseline = baseline or ms
+                    print(f"   • {name:<14} {ms:8.2f} ms  {size / ms / 1000:7.1f} MB/s  {baseline / ms:5.1f}x")
+            
+            print("   End to end (GET /shows/api, no response cache):")
+            client = app.test_client()
+            for name, provider in providers:
+                app.json = provider
+                started = time.perf_counter()
+                for _ in range(args.repeat):
+                    assert client.get('/shows/api').status_code == 200
+                elapsed = time.perf_counter() - started
+                print(f"   • {name:<14} {args.repeat / elapsed:8.2f} req/s")
+            db.drop_all()
+    finally:
+        os.close(db_fd)
+        os.unlink(db_path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""
+Benchmark MessagePack against JSON for the payloads internal services poll.
+
+Seeds shows, then for /api/stats, /shows/api/upcoming and a show detail
+reports body size and encode/decode time of each representation, going
+through the same provider pipeline as the endpoints: JSON on orjson (when
+installed) and on the stdlib encoder, and MessagePack.
+
+Usage: python scripts/bench_msgpack.py [--shows 5000] [--repeat 20]
+"""
+import sys
+import os
+import argparse
+import json
+import tempfile
+import time
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import create_app
+from app.models import db
+from app.repositories import SHOW_FIELDS
+from app.services import ShowService
+from app.utils.json_provider import FastJSONProvider, msgpack
+from scripts.bench_json import seed_shows
+
+
+def per_call_ms(function, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        result = function()
+    return (time.perf_counter() - started) * 1000 / repeat, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--shows', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+    if msgpack is None:
+        sys.exit('msgpack is not installed (pip install msgpack)')
+    
+    db_fd, db_path = tempfile.mkstemp()
+    app = create_app('testing')
+    app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{db_path}'
+    provider = app.json
+    stdlib = FastJSONProvider(app, use_orjson=False)
+    
+    try:
+        with app.app_context():
+            db.create_all()
+            seed_shows(args.shows)
+            service = ShowService()
+            serialize = SHOW_FIELDS.serializer()
+            payloads = {
+                '/api/stats': {'venues': 20, 'artists': 50, 'shows': args.shows,
+                               'show_stats': service.get_show_statistics()},
+                '/shows/api/upcoming': [serialize(show) for show in service.get_upcoming_shows()],
+                '/shows/api/<id>': service.get_show_response(1).model_dump(),
+            }
+            
+            print(f"{args.shows} shows ({args.repeat} runs each, JSON backend: {provider.backend})")
+            for name, payload in payloads.items():
+                print(f"   {name}:")
+                encodings = (
+                    (f'JSON ({provider.backend})', provider.dumpb, provider.loads),
+                    ('JSON (stdlib)', stdlib.dumpb, json.loads),
+                    ('MessagePack', provider.packb, lambda body: msgpack.unpackb(body, timestamp=3)),
+                )
+                for label, dump, load in encodings:
+                    encode_ms, body = per_call_ms(lambda: dump(payload), args.repeat)
+                    decode_ms, _ = per_call_ms(lambda: load(body), args.repeat)
+                    print(f"   • {label:<14} {len(body) / 1024:9.1f} KiB  encode {encode_ms:8.3f} ms  decode {decode_ms:8.3f} ms")
+            db.drop_all()
+    finally:
+        os.close(db_fd)
+        os.unlink(db_path)
+
+
+if __name__ == '__main__':
+    main()
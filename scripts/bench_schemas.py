@@ -0,0 +1,131 @@
+"""
+Micro-benchmark the per-object cost of building and dumping response schemas.
+
+Compares building and dumping a response with the previous schemas (which
+inherited the write-side validators, patterns and HttpUrl parsing) and with
+the read-side schemas, built normally and with model_construct(); then
+dumping a list one model at a time against one call through the cached
+TypeAdapter.
+
+Usage: python scripts/bench_schemas.py [--objects 5000] [--repeat 5]
+"""
+import sys
+import os
+import argparse
+import time
+from datetime import datetime, timedelta
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from pydantic import TypeAdapter
+from typing import List
+from app.schemas import ArtistResponse, ShowResponse, ShowListItem, TimestampMixin
+from app.schemas.artist_schema import ArtistBase
+from app.schemas.show_schema import ShowBase
+
+
+class PreviousArtistResponse(ArtistBase, TimestampMixin):
+    """ArtistResponse as it was declared before the read-side split."""
+    id: int
+    num_upcoming_shows: int = 0
+    num_past_shows: int = 0
+    past_shows: List[dict] = []
+    upcoming_shows: List[dict] = []
+
+
+class PreviousShowResponse(ShowBase, TimestampMixin):
+    """ShowResponse as it was declared before the read-side split."""
+    id: int
+    artist_name: str
+    artist_image_link: str | None = None
+    venue_name: str
+    venue_image_link: str | None = None
+
+
+def artist_values(i, now):
+    shows = [
+        dict(artist_id=i, artist_name=f'Bench Artist {i}', artist_image_link=f'https://images.example.com/a/{i}.jpg',
+             venue_id=day, venue_name=f'Bench Venue {day}', venue_image_link=f'https://images.example.com/v/{day}.jpg',
+             start_time=now + timedelta(days=day))
+        for day in range(1, 4)
+    ]
+    return dict(
+        id=i, name=f'Bench Artist {i}', city='San Francisco', state='CA', phone='415-000-0000',
+        image_link=f'https://images.example.com/a/{i}.jpg', facebook_link=f'https://facebook.com/artist{i}',
+        website_link=f'https://artist{i}.example.com', genres=['Jazz', 'Blues'], seeking_venue=False,
+        seeking_description=None, created_at=now, updated_at=now,
+        num_upcoming_shows=len(shows), num_past_shows=0, upcoming_shows=shows, past_shows=[]
+    )
+
+
+def show_values(i, now):
+    return dict(id=i, artist_id=i % 50 + 1, artist_name=f'Bench Artist {i % 50}',
+                artist_image_link=f'https://images.example.com/a/{i % 50}.jpg', venue_id=i % 20 + 1,
+                venue_name=f'Bench Venue {i % 20}', venue_image_link=f'https://images.example.com/v/{i % 20}.jpg',
+                start_time=now + timedelta(hours=i + 1), created_at=now, updated_at=now)
+
+
+def per_object_us(function, items, repeat):
+    """Average microseconds per item for function(item)."""
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for item in items:
+            function(item)
+    return (time.perf_counter() - started) * 1e6 / repeat / len(items)
+
+
+def per_list_us(function, items, repeat):
+    """Average microseconds per item for one function(items) call."""
+    started = time.perf_counter()
+    for _ in range(repeat):
+        function(items)
+    return (time.perf_counter() - started) * 1e6 / repeat / len(items)
+
+
+def report(title, rows):
+    print(f"   {title}:")
+    baseline = rows[0][1]
+    for name, us in rows:
+        print(f"   • {name:<36} {us:8.2f} µs/object  {baseline / us:5.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--objects', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    
+    now = datetime.utcnow()
+    artists = [artist_values(i, now) for i in range(args.objects)]
+    shows = [show_values(i, now) for i in range(args.objects)]
+    list_rows = [{name: values[name] for name in ShowListItem.model_fields} for values in shows]
+    
+    print(f"{args.objects} objects ({args.repeat} runs each)")
+    def build_and_dump(schema):
+        return lambda values: schema(**values).model_dump(mode='json')
+    
+    report('ArtistResponse build + model_dump(mode=json)', [
+        ('previous (write-side rules)', per_object_us(build_and_dump(PreviousArtistResponse), artists, args.repeat)),
+        ('read schema', per_object_us(build_and_dump(ArtistResponse), artists, args.repeat)),
+    ])
+    report('ShowResponse build + model_dump(mode=json)', [
+        ('previous (write-side rules)', per_object_us(build_and_dump(PreviousShowResponse), shows, args.repeat)),
+        ('read schema', per_object_us(build_and_dump(ShowResponse), shows, args.repeat)),
+        ('read schema, model_construct()', per_object_us(build_and_dump(ShowResponse.model_construct),
+                                                         shows, args.repeat)),
+    ])
+    
+    items = [ShowListItem(**values) for values in list_rows]
+    adapter = TypeAdapter(List[ShowListItem])
+    report('ShowListItem list dump (JSON mode)', [
+        ('model_dump() per object', per_list_us(
+            lambda xs: [x.model_dump(mode='json') for x in xs], items, args.repeat)),
+        ('new TypeAdapter per call', per_list_us(
+            lambda xs: TypeAdapter(List[ShowListItem]).dump_python(xs, mode='json'), items, args.repeat)),
+        ('cached TypeAdapter', per_list_us(lambda xs: adapter.dump_python(xs, mode='json'), items, args.repeat)),
+    ])
+
+
+if __name__ == '__main__':
+    main()
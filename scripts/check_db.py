@@ -15,7 +15,7 @@ def check_connection():
     """Check database connection."""
     print("🔍 Checking database connection...")
     
-    app = create_app('development')
+    app = create_app('development', warm_up=False)
     
     with app.app_context():
         try:
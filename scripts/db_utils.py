@@ -40,15 +40,84 @@ def seed_db_command():
     click.echo('✓ Database seeded')
 
 
+@click.command('publish-pages')
+@click.option('--config', 'config_name', default='development', help='Configuration used by worker processes')
+@click.option('--workers', default=0, help='Worker processes (0 = one per CPU, 1 = in-process)')
+@with_appcontext
+def publish_pages_command(config_name, workers):
+    """Pre-render every artist and venue page to static files."""
+    from flask import current_app
+    from app.cache import publish_all
+    
+    published = publish_all(current_app._get_current_object(), config_name, workers=workers)
+    click.echo(f'✓ Published {published} pages to {current_app.config["PAGE_PUBLISH_DIR"]}')
+
+
+@click.command('sweep-show-aggregates')
+@click.option('--rebuild', is_flag=True, help='Recompute every artist and venue, not just stale ones')
+@with_appcontext
+def sweep_show_aggregates_command(rebuild):
+    """Refresh materialized artist/venue show aggregates."""
+    from app.services import ShowService
+    
+    if rebuild:
+        updated = ShowService().repository.rebuild_aggregates()
+        click.echo(f'✓ Rebuilt show aggregates for {updated} artists and venues')
+    else:
+        swept = ShowService().sweep_show_aggregates()
+        click.echo(f"✓ Swept {swept['artists']} artists and {swept['venues']} venues")
+
+
+@click.command('rebuild-read-model')
+@with_appcontext
+def rebuild_read_model_command():
+    """Rebuild every artist and venue API document in the read model."""
+    from flask import current_app
+    from app.cache import DocumentStore
+    
+    counts = DocumentStore(current_app._get_current_object()).rebuild_all()
+    click.echo(f"✓ Rebuilt {counts['artists']} artist and {counts['venues']} venue documents")
+
+
+@click.command('import-data')
+@click.argument('kind', type=click.Choice(['artists', 'venues', 'shows']))
+@click.argument('source', type=click.File('rb'), default='-')
+@click.option('--format', 'fmt', type=click.Choice(['ndjson', 'csv']), default=None,
+              help='Input format (default: from the file extension, else ndjson)')
+@click.option('--chunk-size', default=None, type=int, help='Rows per transaction (default: IMPORT_CHUNK_SIZE)')
+@with_appcontext
+def import_data_command(kind, source, fmt, chunk_size):
+    """Import artists, venues or shows from an NDJSON or CSV file (or stdin)."""
+    from flask import current_app
+    from app.services import ImportService
+    from app.utils.ingest import iter_records
+    
+    fmt = fmt or ('csv' if source.name.lower().endswith('.csv') else 'ndjson')
+    summary = ImportService().import_records(
+        kind, iter_records(source, fmt),
+        chunk_size=chunk_size or current_app.config['IMPORT_CHUNK_SIZE'],
+        max_errors=current_app.config['IMPORT_MAX_ERRORS']
+    )
+    for error in summary['errors']:
+        click.echo(f"line {error['line']}: {error['error']}", err=True)
+    if summary['errors_truncated']:
+        click.echo('... more errors not shown', err=True)
+    click.echo(f"✓ Imported {summary['imported']} {kind}, {summary['failed']} rows failed")
+
+
 def register_commands(app):
     """Register CLI commands."""
     app.cli.add_command(init_db_command)
     app.cli.add_command(reset_db_command)
     app.cli.add_command(seed_db_command)
+    app.cli.add_command(publish_pages_command)
+    app.cli.add_command(sweep_show_aggregates_command)
+    app.cli.add_command(rebuild_read_model_command)
+    app.cli.add_command(import_data_command)
 
 
 if __name__ == '__main__':
-    app = create_app('development')
+    app = create_app('development', warm_up=False)
     register_commands(app)
     
     with app.app_context():
@@ -221,7 +221,7 @@ def main():
     """Main seed function."""
     print("🌱 Starting Fyyur database seed...")
     
-    app = create_app('development')
+    app = create_app('development', warm_up=False)
     
     with app.app_context():
         try:
@@ -0,0 +1,893 @@
+"""
+Unit tests for the caching layer.
+"""
+import os
+import pytest
+from datetime import datetime, timedelta, timezone
+from app.models import db, Artist, Venue, Show, Genre
+from app.cache import (
+    LRUCache, MemoryBackend, SQLiteBackend, TieredCache, MemoEntry, SingleFlight, NegativeCache,
+    init_response_cache, get_response_cache, get_singleflight, should_refresh_early,
+    register_snapshot, create_cache_backend
+)
+
+
+@pytest.fixture
+def cached_app(app):
+    """App with the response cache enabled."""
+    app.config['RESPONSE_CACHE_ENABLED'] = True
+    init_response_cache(app)
+    return app
+
+
+class TestLRUCache:
+    """Test cases for LRUCache."""
+    
+    def test_get_set_and_stats(self):
+        """Test hits and misses are counted."""
+        cache = LRUCache(max_entries=2)
+        assert cache.get('a') is None
+        cache.set('a', 1)
+        assert cache.get('a') == 1
+        
+        stats = cache.stats()
+        assert stats['hits'] == 1
+        assert stats['misses'] == 1
+        assert stats['hit_ratio'] == 0.5
+    
+    def test_evicts_least_recently_used(self):
+        """Test the least recently used entry is evicted first."""
+        cache = LRUCache(max_entries=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+        
+        assert cache.get('b') is None
+        assert cache.get('a') == 1
+        assert cache.get('c') == 3
+        assert cache.stats()['evictions'] == 1
+    
+    def test_ttl_expiry(self, monkeypatch):
+        """Test entries expire after their TTL."""
+        now = [1000.0]
+        monkeypatch.setattr('app.cache.lru.time.monotonic', lambda: now[0])
+        cache = LRUCache(max_entries=10, default_ttl=5)
+        cache.set('a', 1)
+        cache.set('b', 2, ttl=0)
+        
+        now[0] += 6
+        assert cache.get('a') is None
+        assert cache.get('b') == 2
+        assert cache.stats()['expirations'] == 1
+    
+    def test_delete_where(self):
+        """Test predicate-based eviction."""
+        cache = LRUCache()
+        cache.set('artists:1?', 1)
+        cache.set('artists:10?', 2)
+        cache.set('venues:1?', 3)
+        
+        assert cache.delete_where(lambda key: key.startswith('artists:1?')) == 1
+        assert cache.get('artists:10?') == 2
+
+
+class TestCacheBackends:
+    """Test cases for the pluggable cache backends."""
+    
+    def test_memory_backend_invalidates_by_tag(self):
+        """Test tag invalidation removes only the tagged keys."""
+        backend = MemoryBackend()
+        backend.set('a', 1, tags=('artists:list',))
+        backend.set('b', 2, tags=('artists:list', 'stats'))
+        backend.set('c', 3, tags=('venues:list',))
+        
+        assert backend.invalidate_tags(['artists:list']) == 2
+        assert backend.get('b') is None
+        assert backend.get('c') == 3
+    
+    def test_sqlite_backend_is_shared_between_instances(self, tmp_path):
+        """Test two handles on one file (two workers) see the same entries."""
+        path = str(tmp_path / 'cache.sqlite3')
+        worker_a = SQLiteBackend(path, 'secret')
+        worker_b = SQLiteBackend(path, 'secret')
+        
+        worker_a.set('artists:list?', {'data': [1, 2]}, tags=('artists:list',))
+        assert worker_b.get('artists:list?') == {'data': [1, 2]}
+        
+        worker_b.invalidate_tags(['artists:list'])
+        assert worker_a.get('artists:list?') is None
+        assert worker_a.generation() == 1
+    
+    def test_sqlite_backend_file_is_private_and_signed(self, tmp_path):
+        """Test the file is created 0600, shared files are refused and unsigned payloads never load."""
+        path = str(tmp_path / 'cache.sqlite3')
+        backend = SQLiteBackend(path, secret='one')
+        backend.set('key', 'value')
+        assert os.stat(path).st_mode & 0o777 == 0o600
+        assert SQLiteBackend(path, secret='one').get('key') == 'value'
+        
+        # A payload written under another key (or planted) is a miss and is dropped
+        assert SQLiteBackend(path, secret='two').get('key') is None
+        assert backend.get('key') is None
+        
+        os.chmod(path, 0o666)
+        with pytest.raises(PermissionError):
+            SQLiteBackend(path, secret='one')
+    
+    def test_create_cache_backend_defaults_to_instance_folder(self, tmp_path):
+        """Test the shared file lives in the instance folder, not the world-writable temp dir."""
+        backend = create_cache_backend({'CACHE_BACKEND': 'sqlite', 'SECRET_KEY': 'k'}, str(tmp_path))
+        assert backend.l2.path == str(tmp_path / 'fyyur_cache.sqlite3')
+    
+    def test_sqlite_backend_needs_a_shared_secret(self, tmp_path):
+        """Test there is no unsigned mode and a per-process random SECRET_KEY is refused."""
+        with pytest.raises(ValueError):
+            SQLiteBackend(str(tmp_path / 'cache.sqlite3'), None)
+        with pytest.raises(ValueError):
+            create_cache_backend({'CACHE_BACKEND': 'sqlite'}, str(tmp_path))
+        with pytest.raises(ValueError):
+            create_cache_backend({'CACHE_BACKEND': 'sqlite', 'SECRET_KEY': os.urandom(32),
+                                  'SECRET_KEY_IS_EPHEMERAL': True}, str(tmp_path))
+    
+    def test_sqlite_backend_ttl_and_size_bound(self, tmp_path):
+        """Test expired entries miss and pruning keeps max_entries."""
+        backend = SQLiteBackend(str(tmp_path / 'cache.sqlite3'), 'secret', max_entries=3)
+        backend.set('expired', 1, ttl=-1)
+        assert backend.get('expired') is None
+        
+        for index in range(5):
+            backend.set(f'k{index}', index)
+        backend.prune()
+        assert backend.stats()['size'] == 3
+    
+    def test_tiered_cache_reports_layer_hit_ratios(self, tmp_path):
+        """Test L2 hits fill L1 and stats are split per layer."""
+        path = str(tmp_path / 'cache.sqlite3')
+        SQLiteBackend(path, 'secret').set('key', 'value')
+        tiered = TieredCache(MemoryBackend(), SQLiteBackend(path, 'secret'))
+        
+        assert tiered.get('key') == 'value'  # L1 miss, L2 hit
+        assert tiered.get('key') == 'value'  # L1 hit
+        stats = tiered.stats()
+        assert stats['hit_ratio'] == 1.0
+        assert stats['l1']['hit_ratio'] == 0.5
+        assert stats['l2']['hits'] == 1
+    
+    def test_tiered_cache_drops_l1_after_remote_invalidation(self, tmp_path):
+        """Test an invalidation by another worker clears this worker's L1."""
+        path = str(tmp_path / 'cache.sqlite3')
+        worker_a = TieredCache(MemoryBackend(), SQLiteBackend(path, 'secret'), sync_interval=0)
+        worker_b = TieredCache(MemoryBackend(), SQLiteBackend(path, 'secret'), sync_interval=0)
+        
+        worker_a.set('artists:detail:1?', 'old', tags=('artists:detail:1',))
+        assert worker_a.get('artists:detail:1?') == 'old'
+        
+        worker_b.invalidate_tags(['artists:detail:1'])
+        assert worker_a.get('artists:detail:1?') is None
+
+
+class TestResponseCache:
+    """Test cases for the HTTP response cache."""
+    
+    def test_disabled_in_testing_config(self, app):
+        """Test the cache is off unless enabled."""
+        with app.app_context():
+            assert get_response_cache() is None
+    
+    def test_serves_cached_body_with_etag(self, client, cached_app):
+        """Test a repeat request is served from the cache with the same ETag."""
+        with cached_app.app_context():
+            db.session.add(Artist(name='Cached Artist', city='Test City', state='TC'))
+            db.session.commit()
+            
+            first = client.get('/artists/api')
+            assert first.status_code == 200
+            assert first.headers['ETag']
+            assert 'max-age=30' in first.headers['Cache-Control']
+            
+            # A raw SQL write bypasses ORM invalidation, so the cached body is served
+            db.session.execute(db.text(
+                "UPDATE artists SET name = 'Renamed Artist' WHERE name = 'Cached Artist'"
+            ))
+            db.session.commit()
+            
+            second = client.get('/artists/api')
+            assert second.get_data() == first.get_data()
+            assert second.headers['ETag'] == first.headers['ETag']
+            assert get_response_cache().stats()['hits'] == 1
+    
+    def test_if_none_match_returns_304(self, client, cached_app):
+        """Test a matching If-None-Match gets a 304 without a body."""
+        with cached_app.app_context():
+            etag = client.get('/api/stats').headers['ETag']
+            
+            response = client.get('/api/stats', headers={'If-None-Match': etag})
+            assert response.status_code == 304
+            assert response.get_data() == b''
+            assert get_response_cache().stats()['not_modified'] == 1
+    
+    def test_query_strings_are_separate_entries(self, client, cached_app):
+        """Test different query strings do not share an entry."""
+        with cached_app.app_context():
+            client.get('/artists/api?genre=Jazz')
+            client.get('/artists/api?genre=Blues')
+            assert get_response_cache().stats()['size'] == 2
+    
+    def test_negotiated_media_types_are_separate_entries(self, client, cached_app):
+        """Test a representation chosen through Accept is not served to plain JSON clients."""
+        with cached_app.app_context():
+            columnar = {'Accept': 'application/vnd.fyyur.columnar+json'}
+            assert client.get('/shows/api', headers=columnar).mimetype == 'application/vnd.fyyur.columnar+json'
+            assert client.get('/shows/api').mimetype == 'application/json'
+            assert client.get('/shows/api', headers=columnar).mimetype == 'application/vnd.fyyur.columnar+json'
+            assert client.get('/shows/api', headers={'Accept': 'application/msgpack'}).status_code == 200
+            assert get_response_cache().stats()['size'] == 3
+    
+    def test_errors_are_not_cached(self, client, cached_app):
+        """Test non-200 responses bypass the cache."""
+        with cached_app.app_context():
+            assert client.get('/venues/api/nearby?lat=1').status_code == 400
+            assert get_response_cache().stats()['size'] == 0
+    
+    def test_stores_compressed_variants(self, client, cached_app):
+        """Test a cached body is compressed once and the encoded copy reused."""
+        import gzip
+        from app.utils import init_compression
+        cached_app.config['COMPRESSION_ENABLED'] = True
+        cached_app.config['COMPRESSION_MIN_SIZE'] = 0
+        counters = init_compression(cached_app)
+        with cached_app.app_context():
+            plain = client.get('/api/stats')
+            first = client.get('/api/stats', headers={'Accept-Encoding': 'gzip'})
+            second = client.get('/api/stats', headers={'Accept-Encoding': 'gzip'})
+            assert first.headers['Content-Encoding'] == second.headers['Content-Encoding'] == 'gzip'
+            assert gzip.decompress(second.data) == plain.data
+            assert (counters.compressed, counters.cached) == (1, 1)
+            
+            assert first.headers['ETag'] == f'W/{plain.headers["ETag"]}'
+            response = client.get('/api/stats', headers={'Accept-Encoding': 'gzip', 'If-None-Match': first.headers['ETag']})
+            assert response.status_code == 304
+    
+    def test_replays_last_modified(self, client, cached_app):
+        """Test a cached detail response keeps Last-Modified and answers If-Modified-Since itself."""
+        with cached_app.app_context():
+            artist = Artist(name='Dated Artist', city='Test City', state='TC',
+                            created_at=datetime.utcnow() - timedelta(hours=1))
+            db.session.add(artist)
+            db.session.commit()
+            
+            stamp = client.get(f'/artists/api/{artist.id}').headers['Last-Modified']
+            assert client.get(f'/artists/api/{artist.id}').headers['Last-Modified'] == stamp
+            response = client.get(f'/artists/api/{artist.id}', headers={'If-Modified-Since': stamp})
+            assert response.status_code == 304
+            assert get_response_cache().stats()['not_modified'] == 1
+    
+    def test_cache_stats_endpoint(self, client, cached_app):
+        """Test the statistics endpoint."""
+        with cached_app.app_context():
+            client.get('/api/stats')
+            client.get('/api/stats')
+            data = client.get('/api/cache/stats').get_json()
+            assert data['enabled'] is True
+            assert data['hits'] == 1
+            assert data['misses'] == 1
+
+
+class TestCacheInvalidation:
+    """Test cases for commit-driven cache invalidation."""
+    
+    def _record(self, app):
+        seen = []
+        app.extensions['cache_invalidation'].subscribe(seen.append)
+        return seen
+    
+    def test_commit_dispatches_entity_and_dependent_keys(self, app):
+        """Test a committed show evicts both counterparties and the listings."""
+        with app.app_context():
+            from datetime import datetime, timedelta
+            artist = Artist(name='Inv Artist', city='Test City', state='TC')
+            venue = Venue(name='Inv Venue', city='Test City', state='TC', address='1 Main St')
+            db.session.add_all([artist, venue])
+            db.session.commit()
+            
+            seen = self._record(app)
+            show = Show(artist_id=artist.id, venue_id=venue.id, start_time=datetime.utcnow() + timedelta(days=3))
+            db.session.add(show)
+            db.session.commit()
+            
+            assert len(seen) == 1
+            change_set = seen[0]
+            assert ('show', show.id) in change_set.created
+            assert f'artists:detail:{artist.id}' in change_set.keys
+            assert f'venues:detail:{venue.id}' in change_set.keys
+            assert {'shows:list', 'stats'} <= change_set.keys
+    
+    def test_aggregate_sweep_evicts_swept_details_and_logs_them(self, app):
+        """Test the sweep's raw aggregate updates evict detail keys and reach the change feed."""
+        from app.models import ChangeLogEntry
+        from app.services import ShowService
+        with app.app_context():
+            artist = Artist(name='Swept Artist', city='Test City', state='TC')
+            venue = Venue(name='Swept Venue', city='Test City', state='TC', address='1 Main St')
+            db.session.add_all([artist, venue])
+            db.session.flush()
+            db.session.add(Show(artist_id=artist.id, venue_id=venue.id, start_time=datetime.utcnow() + timedelta(days=1)))
+            db.session.commit()
+            # The show starts: rewrite the clock-dependent columns behind the ORM's back
+            started = datetime.utcnow() - timedelta(minutes=5)
+            db.session.execute(db.text('UPDATE shows SET start_time = :t'), {'t': started})
+            for table in ('artists', 'venues'):
+                db.session.execute(db.text(f'UPDATE {table} SET next_show_at = :t'), {'t': started})
+            db.session.commit()
+            cursor = db.session.query(db.func.max(ChangeLogEntry.seq)).scalar()
+            
+            seen = self._record(app)
+            assert ShowService().sweep_show_aggregates() == {'artists': 1, 'venues': 1}
+            
+            assert len(seen) == 1
+            assert {f'artists:detail:{artist.id}', f'venues:detail:{venue.id}', 'artists:list'} <= seen[0].keys
+            logged = db.session.query(ChangeLogEntry).filter(ChangeLogEntry.seq > cursor).all()
+            assert {(entry.kind, entry.entity_id, entry.operation) for entry in logged} == {
+                ('artists', artist.id, 'updated'), ('venues', venue.id, 'updated')
+            }
+    
+    def test_artist_update_evicts_counterparty_venue_pages(self, app):
+        """Test renaming an artist evicts the detail pages of venues it plays."""
+        with app.app_context():
+            from datetime import datetime, timedelta
+            artist = Artist(name='Old Name', city='Test City', state='TC')
+            venue = Venue(name='Host Venue', city='Test City', state='TC', address='1 Main St')
+            db.session.add_all([artist, venue])
+            db.session.flush()
+            db.session.add(Show(artist_id=artist.id, venue_id=venue.id, start_time=datetime.utcnow() + timedelta(days=3)))
+            db.session.commit()
+            
+            seen = self._record(app)
+            artist.name = 'New Name'
+            db.session.commit()
+            
+            assert ('artist', artist.id) in seen[0].updated
+            assert f'venues:detail:{venue.id}' in seen[0].keys
+    
+    def test_genre_association_changes_are_recorded(self, app):
+        """Test genre link edits show up as association changes."""
+        with app.app_context():
+            jazz = Genre(name='Jazz')
+            artist = Artist(name='Genre Artist', city='Test City', state='TC')
+            db.session.add_all([jazz, artist])
+            db.session.commit()
+            
+            seen = self._record(app)
+            artist.genres.append(jazz)
+            db.session.commit()
+            
+            assert ('artist_genres', artist.id, jazz.id) in seen[0].associations
+    
+    def test_rollback_discards_pending_keys(self, app):
+        """Test nothing is dispatched for a rolled back transaction."""
+        with app.app_context():
+            seen = self._record(app)
+            db.session.add(Artist(name='Ghost', city='Test City', state='TC'))
+            db.session.flush()
+            db.session.rollback()
+            db.session.commit()
+            
+            assert seen == []
+    
+    def test_response_cache_evicted_after_commit(self, client, cached_app):
+        """Test cached API responses are refreshed after an edit commits."""
+        with cached_app.app_context():
+            artist = Artist(name='Before', city='Test City', state='TC')
+            db.session.add(artist)
+            db.session.commit()
+            
+            assert client.get('/artists/api').get_json()[0]['name'] == 'Before'
+            
+            artist.name = 'After'
+            db.session.commit()
+            
+            assert client.get('/artists/api').get_json()[0]['name'] == 'After'
+
+
+class TestSingleFlight:
+    """Test cases for request coalescing and memoized service reads."""
+    
+    def test_concurrent_callers_share_one_execution(self):
+        """Test callers arriving while a computation runs wait for its result."""
+        import threading
+        flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+        results = []
+        
+        def slow():
+            started.set()
+            release.wait()
+            return 42
+        
+        leader = threading.Thread(target=lambda: results.append(flight.do('key', slow)))
+        leader.start()
+        started.wait()
+        followers = [threading.Thread(target=lambda: results.append(flight.do('key', slow))) for _ in range(5)]
+        for thread in followers:
+            thread.start()
+        while flight.stats()['waits'] < 5:
+            pass
+        release.set()
+        for thread in [leader, *followers]:
+            thread.join()
+        
+        assert results == [42] * 6
+        assert flight.stats()['executions'] == 1
+        assert flight.stats()['waits'] == 5
+        assert flight.in_flight() == 0
+    
+    def test_errors_are_not_remembered(self):
+        """Test a failed computation is retried by the next caller."""
+        flight = SingleFlight()
+        with pytest.raises(ValueError):
+            flight.do('key', lambda: (_ for _ in ()).throw(ValueError('boom')))
+        assert flight.do('key', lambda: 'ok') == 'ok'
+        assert flight.stats()['errors'] == 1
+    
+    def test_early_refresh_probability(self, monkeypatch):
+        """Test refreshes start before expiry only for slow, nearly expired entries."""
+        monkeypatch.setattr('app.cache.singleflight.random.random', lambda: 0.5)
+        entry = MemoEntry(value=1, expires_at=100.0, delta=2.0)
+        
+        assert should_refresh_early(entry, now=90.0) is False
+        assert should_refresh_early(entry, now=99.0) is True
+        assert should_refresh_early(entry, beta=0, now=99.0) is False
+        assert should_refresh_early(entry, beta=0, now=100.0) is True
+    
+    def test_service_reads_are_memoized_until_commit(self, app):
+        """Test statistics are served from the cache until a write invalidates them."""
+        from datetime import datetime, timedelta
+        from app.services import ShowService
+        app.config['SERVICE_CACHE_ENABLED'] = True
+        with app.app_context():
+            service = ShowService()
+            assert service.get_show_statistics()['total_shows'] == 0
+            assert service.get_show_statistics()['total_shows'] == 0
+            assert get_singleflight().stats()['executions'] == 1
+            
+            artist = Artist(name='Memo Artist', city='Test City', state='TC')
+            venue = Venue(name='Memo Venue', city='Test City', state='TC', address='1 Main St')
+            db.session.add_all([artist, venue])
+            db.session.flush()
+            db.session.add(Show(artist_id=artist.id, venue_id=venue.id, start_time=datetime.utcnow() + timedelta(days=3)))
+            db.session.commit()
+            
+            assert service.get_show_statistics()['total_shows'] == 1
+            assert get_singleflight().stats()['executions'] == 2
+
+
+class TestSnapshot:
+    """Test cases for background-refreshed snapshots."""
+    
+    @pytest.fixture
+    def homepage(self, app):
+        from app.services import HomepageService
+        return register_snapshot(
+            app, 'homepage', lambda: HomepageService().get_homepage_data(),
+            tags=('venues:list', 'artists:list', 'shows:list'), max_age=60, empty=HomepageService.EMPTY
+        )
+    
+    def test_first_request_serves_empty_bundle_and_builds(self, client, app, homepage):
+        """Test the first hit never waits on the database."""
+        with app.app_context():
+            assert client.get('/').status_code == 200
+            assert homepage.stats()['empty_serves'] == 1
+            
+            homepage.wait()
+            assert homepage.stats()['refreshes'] == 1
+            assert homepage.is_stale is False
+    
+    def test_commit_triggers_background_refresh(self, app, homepage):
+        """Test a write touching the snapshot's tags rebuilds it."""
+        with app.app_context():
+            homepage.refresh()
+            assert homepage.get()['venues'] == []
+            
+            db.session.add(Venue(name='Fresh Venue', city='Test City', state='TC', address='1 Main St'))
+            db.session.commit()
+            homepage.wait()
+            
+            assert homepage.get()['venues'][0]['name'] == 'Fresh Venue'
+            assert homepage.is_stale is False
+    
+    def test_stale_value_is_served_while_refreshing(self, app, homepage):
+        """Test an expired snapshot is still returned immediately."""
+        with app.app_context():
+            homepage.refresh()
+            homepage.max_age = 0
+            
+            assert homepage.get() == {'venues': [], 'artists': [], 'shows': []}
+            assert homepage.stats()['stale_serves'] == 1
+            homepage.wait()
+
+
+class TestFragmentCache:
+    """Test cases for the {% cache %} template tag."""
+    
+    TEMPLATE = "{% cache ('tile', item_id), 60, ['items:' ~ item_id] %}{{ render() }}{% endcache %}"
+    
+    def _renderer(self):
+        calls = []
+        
+        def render():
+            calls.append(1)
+            return f'<b>{len(calls)}</b>'
+        return render, calls
+    
+    def test_fragment_is_rendered_once(self, app):
+        """Test repeat renders reuse the stored HTML unescaped."""
+        from flask import render_template_string
+        app.config['FRAGMENT_CACHE_ENABLED'] = True
+        render, calls = self._renderer()
+        with app.test_request_context():
+            first = render_template_string(self.TEMPLATE, item_id=1, render=render)
+            second = render_template_string(self.TEMPLATE, item_id=1, render=render)
+            
+            assert first == second == '&lt;b&gt;1&lt;/b&gt;'
+            assert len(calls) == 1
+            render_template_string(self.TEMPLATE, item_id=2, render=render)
+            assert len(calls) == 2
+    
+    def test_tags_evict_fragments(self, app):
+        """Test invalidating a fragment's tag forces a re-render."""
+        from flask import render_template_string
+        from app.cache import get_cache
+        app.config['FRAGMENT_CACHE_ENABLED'] = True
+        render, calls = self._renderer()
+        with app.test_request_context():
+            render_template_string(self.TEMPLATE, item_id=1, render=render)
+            get_cache().invalidate_tags(['items:1'])
+            render_template_string(self.TEMPLATE, item_id=1, render=render)
+            assert len(calls) == 2
+    
+    def test_error_render_is_not_cached(self, client, app, monkeypatch):
+        """Test the empty venues page rendered after a database error is not served later."""
+        from app.services import VenueService
+        from app.exceptions import DatabaseException
+        app.config['FRAGMENT_CACHE_ENABLED'] = True
+        with app.app_context():
+            db.session.add(Venue(name='Listed Venue', city='Test City', state='TC', address='1 Main St'))
+            db.session.commit()
+            
+            def fail(self):
+                raise DatabaseException('database is down')
+            monkeypatch.setattr(VenueService, 'get_areas', fail)
+            assert b'Listed Venue' not in client.get('/venues/').data
+            monkeypatch.undo()
+            
+            assert b'Listed Venue' in client.get('/venues/').data
+    
+    def test_list_key_follows_the_data(self, client, app):
+        """Test a change the tag invalidation missed still misses the shows fragment."""
+        app.config['FRAGMENT_CACHE_ENABLED'] = True
+        with app.app_context():
+            artist = Artist(name='Listed Artist', city='Test City', state='TC')
+            venue = Venue(name='Listed Venue', city='Test City', state='TC', address='1 Main St')
+            db.session.add_all([artist, venue])
+            db.session.flush()
+            db.session.add(Show(artist_id=artist.id, venue_id=venue.id, start_time=datetime.utcnow() + timedelta(days=1)))
+            db.session.commit()
+            assert b'Listed Artist' in client.get('/shows/').data
+            
+            # Raw SQL bypasses the ORM invalidation hooks
+            db.session.execute(db.text(
+                "UPDATE artists SET name = 'Renamed Artist', updated_at = :now"
+            ), {'now': datetime.utcnow() + timedelta(seconds=1)})
+            db.session.commit()
+            assert b'Renamed Artist' in client.get('/shows/').data
+    
+    def test_disabled_in_testing_config(self, app):
+        """Test the block renders its body every time when disabled."""
+        from flask import render_template_string
+        render, calls = self._renderer()
+        with app.test_request_context():
+            render_template_string(self.TEMPLATE, item_id=1, render=render)
+            render_template_string(self.TEMPLATE, item_id=1, render=render)
+            assert len(calls) == 2
+
+
+class TestPagePublisher:
+    """Test cases for pre-rendered artist and venue pages."""
+    
+    @pytest.fixture
+    def publisher(self, app, tmp_path):
+        from app.cache import init_page_publisher
+        app.config['PAGE_PUBLISHING_ENABLED'] = True
+        app.config['PAGE_PUBLISH_DIR'] = str(tmp_path / 'published')
+        return init_page_publisher(app)
+    
+    def _artist(self, name='Published Artist'):
+        artist = Artist(name=name, city='Test City', state='TC')
+        artist.genres.append(Genre.query.filter_by(name='Jazz').first() or Genre(name='Jazz'))
+        db.session.add(artist)
+        db.session.commit()
+        return artist
+    
+    def test_published_page_is_served_without_rendering(self, client, app, publisher):
+        """Test the route returns the stored file once published."""
+        with app.app_context():
+            artist_id = self._artist().id
+            publisher.wait()
+            assert publisher.publish('artists', artist_id) is True
+            
+            response = client.get(f'/artists/{artist_id}')
+            assert response.status_code == 200
+            assert b'Published Artist' in response.data
+            assert publisher.stats()['served'] == 1
+    
+    def test_published_page_carries_its_stored_last_modified(self, client, app, publisher, monkeypatch):
+        """Test the stamp stored with the page answers If-Modified-Since without a query."""
+        from app.services import ArtistService
+        with app.app_context():
+            an_hour_ago = datetime.utcnow() - timedelta(hours=1)
+            artist = Artist(name='Dated Artist', city='Test City', state='TC', created_at=an_hour_ago)
+            db.session.add(artist)
+            db.session.commit()
+            publisher.wait()
+            assert publisher.publish('artists', artist.id) is True
+            
+            monkeypatch.setattr(ArtistService, 'get_last_modified', lambda self, artist_id: pytest.fail('queried'))
+            response = client.get(f'/artists/{artist.id}')
+            assert response.last_modified == an_hour_ago.replace(microsecond=0, tzinfo=timezone.utc)
+            response = client.get(f'/artists/{artist.id}', headers={'If-Modified-Since': response.headers['Last-Modified']})
+            assert response.status_code == 304
+            assert publisher.stats()['served'] == 2
+    
+    def test_missing_page_falls_back_to_live_rendering(self, client, app, publisher):
+        """Test a miss renders the page live."""
+        with app.app_context():
+            artist_id = self._artist().id
+            publisher.wait()
+            publisher.unpublish('artists', artist_id)
+            
+            response = client.get(f'/artists/{artist_id}')
+            assert response.status_code == 200
+            assert publisher.stats()['misses'] == 1
+    
+    def test_commit_republishes_changed_page(self, app, publisher):
+        """Test an edit replaces the published file in the background."""
+        with app.app_context():
+            artist = self._artist()
+            publisher.wait()
+            
+            artist.name = 'Renamed Artist'
+            db.session.commit()
+            publisher.wait()
+            
+            assert b'Renamed Artist' in publisher.read('artists', artist.id).html
+    
+    def test_page_expires_when_its_next_show_starts(self, app, publisher, monkeypatch):
+        """Test a page listing an upcoming show is dropped once that show starts."""
+        with app.app_context():
+            artist = self._artist()
+            venue = Venue(name='Published Venue', city='Test City', state='TC', address='1 Main St')
+            db.session.add(venue)
+            db.session.flush()
+            start_time = datetime.utcnow() + timedelta(days=3)
+            db.session.add(Show(artist_id=artist.id, venue_id=venue.id, start_time=start_time))
+            db.session.commit()
+            publisher.wait()
+            
+            html = publisher.read('artists', artist.id).html
+            assert b'Published Venue' in html
+            assert not html.startswith(b'<!-- fyyur:expires')
+            
+            monkeypatch.setattr('app.cache.pages.time.time', lambda: start_time.timestamp() + 86400)
+            assert publisher.read('artists', artist.id) is None
+            assert publisher.stats()['expired'] == 1
+            publisher.wait()
+    
+    def test_publish_all_in_process(self, app, publisher):
+        """Test the bulk rebuild renders every artist and venue."""
+        from app.cache import publish_all
+        with app.app_context():
+            self._artist('First')
+            self._artist('Second')
+            publisher.wait()
+            
+            assert publish_all(app, 'testing', workers=1) == 2
+
+
+class TestDocumentStore:
+    """Test cases for the artist/venue read-model documents."""
+    
+    @pytest.fixture
+    def store(self, app):
+        from app.cache import init_document_store
+        app.config['READ_MODEL_ENABLED'] = True
+        return init_document_store(app)
+    
+    def _artist(self, name='Document Artist'):
+        artist = Artist(name=name, city='Test City', state='TC', image_link='https://example.com/a.png')
+        artist.genres.append(Genre.query.filter_by(name='Jazz').first() or Genre(name='Jazz'))
+        db.session.add(artist)
+        db.session.commit()
+        return artist
+    
+    def test_stored_document_matches_live_body(self, client, app, store):
+        """Test the API serves the stored bytes, identical to the live response."""
+        with app.app_context():
+            artist_id = self._artist().id
+            store.wait()
+            document = store.read('artists', artist_id)
+            assert document.version == 1
+            
+            response = client.get(f'/artists/api/{artist_id}')
+            assert response.status_code == 200
+            assert response.headers['X-Document-Version'] == '1'
+            assert 'Accept' in response.vary
+            assert response.data == document.body
+            assert response.get_json()['image_link'] == 'https://example.com/a.png'
+            
+            app.extensions['document_store'] = None
+            assert client.get(f'/artists/api/{artist_id}').data == document.body
+    
+    def test_commit_rebuilds_document_with_new_version(self, app, store):
+        """Test an edit re-renders the document in the background."""
+        with app.app_context():
+            artist = self._artist()
+            store.wait()
+            
+            artist.name = 'Renamed Artist'
+            db.session.commit()
+            store.wait()
+            
+            document = store.read('artists', artist.id)
+            assert document.version == 2
+            assert b'Renamed Artist' in document.body
+    
+    def test_deleted_entity_loses_its_document(self, app, store):
+        """Test deleting an entity removes its document."""
+        with app.app_context():
+            artist = self._artist()
+            artist_id = artist.id
+            store.wait()
+            
+            db.session.delete(artist)
+            db.session.commit()
+            store.wait()
+            
+            assert store.read('artists', artist_id) is None
+    
+    def test_rebuild_all(self, app, store):
+        """Test the bulk rebuild builds every artist and venue document."""
+        with app.app_context():
+            self._artist('First')
+            self._artist('Second')
+            store.wait()
+            
+            assert store.rebuild_all() == {'artists': 2, 'venues': 0}
+
+
+class TestNegativeCache:
+    """Test cases for the known-missing id cache."""
+    
+    @pytest.fixture
+    def negative(self, app, tmp_path):
+        from app.cache import init_cache, init_negative_cache
+        app.config.update(NEGATIVE_CACHE_ENABLED=True, CACHE_BACKEND='sqlite',
+                          SECRET_KEY='shared-secret', SECRET_KEY_IS_EPHEMERAL=False,
+                          CACHE_SQLITE_PATH=str(tmp_path / 'cache.sqlite3'))
+        init_cache(app)
+        return init_negative_cache(app)
+    
+    def test_requires_a_shared_backend(self, app):
+        """Test per-process memory caches get no negative cache (other workers would miss creations)."""
+        from app.cache import init_negative_cache
+        app.config['NEGATIVE_CACHE_ENABLED'] = True
+        assert app.config['CACHE_BACKEND'] == 'memory'
+        assert init_negative_cache(app) is None
+    
+    def test_repeat_misses_skip_the_query(self, client, app, negative):
+        """Test the second lookup of a missing id is answered from the cache."""
+        with app.app_context():
+            assert client.get('/artists/api/999').status_code == 404
+            assert client.get('/artists/api/999').status_code == 404
+            
+            stats = negative.stats()['artist']
+            assert stats['recorded'] == 1
+            # Both the Last-Modified lookup and the entity lookup were skipped
+            assert stats['absorbed'] == 2
+    
+    def _statements_during(self, action):
+        """SQL statements run while `action()` runs."""
+        from sqlalchemy import event
+        statements = []
+        def record(connection, cursor, statement, *args):
+            statements.append(statement)
+        event.listen(db.engine, 'before_cursor_execute', record)
+        try:
+            action()
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', record)
+        return statements
+    
+    def test_repeat_misses_skip_the_last_modified_query(self, client, app, negative):
+        """Test a known-missing id is answered without the Last-Modified lookup or any other query."""
+        with app.app_context():
+            assert client.get('/artists/api/999').status_code == 404
+            
+            def repeat():
+                assert client.get('/artists/api/999').status_code == 404
+                assert client.get('/artists/999').status_code == 302
+            assert self._statements_during(repeat) == []
+    
+    def test_document_store_skips_known_missing_ids(self, client, app, negative):
+        """Test the read-model lookup is not run for a known-missing id."""
+        from app.cache import init_document_store
+        app.config['READ_MODEL_ENABLED'] = True
+        init_document_store(app)
+        with app.app_context():
+            assert client.get('/venues/api/999').status_code == 404
+            
+            def repeat():
+                assert client.get('/venues/api/999').status_code == 404
+            assert self._statements_during(repeat) == []
+    
+    def test_creating_the_id_clears_it(self, app, negative):
+        """Test a created entity is no longer reported missing."""
+        from app.services import ShowService
+        from app.exceptions import ShowNotFoundException
+        with app.app_context():
+            with pytest.raises(ShowNotFoundException):
+                ShowService().get_show_response(1)
+            assert negative.is_missing('show', 1)
+            
+            from datetime import datetime, timedelta
+            artist = Artist(name='Neg Artist', city='Test City', state='TC')
+            venue = Venue(name='Neg Venue', city='Test City', state='TC', address='1 Main St')
+            db.session.add_all([artist, venue])
+            db.session.flush()
+            db.session.add(Show(artist_id=artist.id, venue_id=venue.id, start_time=datetime.utcnow() + timedelta(days=3)))
+            db.session.commit()
+            
+            assert not negative.is_missing('show', 1)
+            assert negative.stats()['show']['cleared'] == 1
+    
+    def test_entries_are_bounded_per_entity(self):
+        """Test each entity keeps at most max_entries ids."""
+        negative = NegativeCache(max_entries=2)
+        for entity_id in range(5):
+            negative.remember_missing('venue', entity_id)
+        negative.remember_missing('artist', 1)
+        
+        assert negative.stats()['venue']['size'] == 2
+        assert negative.is_missing('artist', 1)
+    
+    def test_shared_backend_invalidation_clears_everything(self, tmp_path):
+        """Test a write in another worker clears this worker's negative entries."""
+        path = str(tmp_path / 'cache.sqlite3')
+        negative = NegativeCache(backend=TieredCache(MemoryBackend(), SQLiteBackend(path, 'secret')), sync_interval=0)
+        negative.remember_missing('artist', 7)
+        
+        SQLiteBackend(path, 'secret').invalidate_tags(['artists:list'])
+        assert not negative.is_missing('artist', 7)
+
+
+class TestWarmUp:
+    """Test cases for the worker warm-up."""
+    
+    def test_warm_up_times_every_step(self, app):
+        """Test each step runs, is timed and primes the service caches."""
+        from app.warmup import WARMUP_STEPS, warm_up
+        
+        app.config['SERVICE_CACHE_ENABLED'] = True
+        report = warm_up(app)
+        
+        assert report['errors'] == {}
+        assert set(report['steps']) == {name for name, _ in WARMUP_STEPS}
+        assert report['steps']['templates']['items'] > 0
+        assert app.extensions['warmup'] is report
+        with app.app_context():
+            assert get_singleflight().stats()['executions'] >= 2
+    
+    def test_skipped_for_tests(self, app):
+        """Test create_app does not warm up under the testing config."""
+        assert 'warmup' not in app.extensions
@@ -1,8 +1,9 @@
 """
 Unit tests for controllers.
 """
+import json
 import pytest
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from app.models import db, Venue, Artist, Show, Genre
 from app.exceptions import (
     VenueNotFoundException, DuplicateVenueException, DatabaseException,
@@ -11,6 +12,28 @@ from app.exceptions import (
 )
 
 
+def decode_columnar(document):
+    """Reference decoder: rebuild /shows/api rows from the columnar encoding."""
+    assert (document['format'], document['version']) == ('columnar', 1)
+    shows, artists, venues = document['shows'], document['artists'], document['venues']
+    rows = []
+    for i in range(document['count']):
+        artist, venue = shows['artist'][i], shows['venue'][i]
+        rows.append({
+            'id': shows['id'][i],
+            'artist_id': artists['id'][artist],
+            'artist_name': artists['name'][artist],
+            'artist_image_link': artists['image_link'][artist],
+            'venue_id': venues['id'][venue],
+            'venue_name': venues['name'][venue],
+            'venue_image_link': venues['image_link'][venue],
+            'start_time': shows['start_time'][i],
+            'created_at': shows['created_at'][i],
+            'updated_at': shows['updated_at'][i]
+        })
+    return rows
+
+
 class TestMainController:
     """Test cases for main controller."""
     
@@ -35,6 +58,111 @@ class TestMainController:
             assert data['venues'] == 1
             assert data['artists'] == 1
             assert data['shows'] == 1
+    
+    def test_api_batch(self, client, app):
+        """Test batched API reads: one result per path, in order, with its own status."""
+        with app.app_context():
+            artist = Artist(name='Batched Artist', city='Test City', state='TC')
+            db.session.add(artist)
+            db.session.commit()
+            artist_id = artist.id
+            
+            paths = [f'/artists/api/{artist_id}', '/api/stats', '/artists/api/999',
+                     f'/artists/{artist_id}', 'artists/api', '/shows/api?fields=nope']
+            response = client.post('/api/batch', json={'requests': paths})
+            assert response.status_code == 200
+            
+            results = response.get_json()['responses']
+            assert [result['path'] for result in results] == paths
+            assert [result['status'] for result in results] == [200, 200, 404, 400, 400, 400]
+            assert results[0]['body'] == client.get(f'/artists/api/{artist_id}').get_json()
+            assert results[1]['body']['artists'] == 1
+            assert 'cannot be batched' in results[3]['body']['error']
+            assert 'nope' in results[5]['body']['error']
+    
+    def test_api_batch_limits(self, client, app):
+        """Test batch validation: body shape and the sub-request limit."""
+        with app.app_context():
+            assert client.post('/api/batch', json=['/api/stats']).status_code == 400
+            
+            app.config['BATCH_MAX_REQUESTS'] = 2
+            response = client.post('/api/batch', json={'requests': ['/api/stats'] * 3})
+            assert response.status_code == 400
+            assert 'at most 2' in response.get_json()['error']
+    
+    def test_api_changes(self, client, app):
+        """Test the change feed pages by cursor and reports deletes as tombstones."""
+        with app.app_context():
+            artist = Artist(name='Synced Artist', city='Test City', state='TC')
+            venue = Venue(name='Synced Venue', city='Test City', state='TC', address='1 Main St')
+            db.session.add_all([artist, venue])
+            db.session.commit()
+            artist_id, venue_id = artist.id, venue.id
+            
+            data = client.get('/api/changes?limit=1').get_json()
+            assert data['has_more'] is True
+            assert [(change['kind'], change['operation']) for change in data['changes']] == [('artists', 'created')]
+            assert data['changes'][0]['data'] == client.get('/artists/api').get_json()[0]
+            
+            data = client.get(f"/api/changes?since={data['cursor']}").get_json()
+            assert [(change['kind'], change['id']) for change in data['changes']] == [('venues', venue_id)]
+            assert data['has_more'] is False
+            cursor = data['cursor']
+            
+            assert client.get(f'/api/changes?since={cursor}').get_json() == {
+                'changes': [], 'cursor': cursor, 'has_more': False
+            }
+            
+            db.session.delete(artist)
+            db.session.commit()
+            changes = client.get(f'/api/changes?since={cursor}').get_json()['changes']
+            assert [(change['kind'], change['id'], change['operation'], change['data']) for change in changes] == [
+                ('artists', artist_id, 'deleted', None)
+            ]
+            
+            assert client.get('/api/changes?since=abc').status_code == 400
+    
+    def test_api_import(self, client, app):
+        """Test bulk imports report per-row errors and insert the valid rows in chunks."""
+        app.config['IMPORT_CHUNK_SIZE'] = 2
+        with app.app_context():
+            db.session.add(Genre(name='Jazz'))
+            db.session.commit()
+            
+            body = '\n'.join([
+                json.dumps({'name': 'Imported One', 'city': 'Recife', 'state': 'PE', 'genres': ['Jazz']}),
+                '{not json',
+                json.dumps({'name': 'imported one ', 'city': 'RECIFE', 'state': 'PE', 'genres': ['Jazz']}),
+                json.dumps({'name': 'Imported Two', 'city': 'Recife', 'state': 'PE', 'genres': ['Blues']}),
+                json.dumps({'name': 'Imported Three', 'city': 'Recife', 'state': 'P', 'genres': ['Jazz']}),
+                json.dumps({'name': 'Imported Four', 'city': 'Recife', 'state': 'PE', 'genres': ['Jazz', 'Jazz']}),
+            ])
+            response = client.post('/api/import?kind=artists', data=body, content_type='application/x-ndjson')
+            assert response.status_code == 200
+            summary = response.get_json()
+            assert (summary['imported'], summary['failed']) == (2, 4)
+            assert [error['line'] for error in summary['errors']] == [2, 3, 4, 5]
+            assert 'already exists' in summary['errors'][1]['error']
+            assert 'Invalid genres: Blues' in summary['errors'][2]['error']
+            assert summary['errors'][3]['error'].startswith('state:')
+            
+            artist = Artist.query.filter_by(name='Imported Four').one()
+            assert [genre.name for genre in artist.genres] == ['Jazz']
+            
+            csv_body = 'name,city,state,address,genres\n"Imported, Venue",Recife,PE,"Rua 1",Jazz\n'
+            response = client.post('/api/import?kind=venues&format=csv', data=csv_body, content_type='text/plain')
+            assert response.get_json()['imported'] == 1
+            venue = Venue.query.filter_by(name='Imported, Venue').one()
+            
+            start_time = (datetime.utcnow() + timedelta(days=7)).replace(microsecond=0).isoformat()
+            shows = '\n'.join(json.dumps({'artist_id': artist.id, 'venue_id': venue.id, 'start_time': start_time})
+                              for _ in range(2))
+            summary = client.post('/api/import?kind=shows', data=shows, content_type='application/x-ndjson').get_json()
+            assert (summary['imported'], summary['failed']) == (1, 1)
+            assert db.session.get(Artist, artist.id).num_upcoming_shows == 1
+            
+            assert client.post('/api/import?kind=genres', data='', content_type='text/csv').status_code == 400
+            assert client.post('/api/import?kind=artists', data='', content_type='text/plain').status_code == 400
 
 
 class TestVenueController:
@@ -124,6 +252,20 @@ class TestVenueController:
             })
             assert response.status_code == 302  # Redirect to show page
     
+    def test_edit_venue_keeps_zero_coordinates(self, client, app):
+        """Test a venue can be moved onto the equator and prime meridian."""
+        with app.app_context():
+            venue = Venue(name='Edited Venue', city='Test City', state='TC', address='1 Main St',
+                          latitude=10.0, longitude=20.0)
+            db.session.add(venue)
+            db.session.commit()
+            
+            response = client.post(f'/venues/{venue.id}/edit', data={'latitude': '0', 'longitude': '0.0'})
+            assert response.status_code == 302
+            
+            db.session.refresh(venue)
+            assert (venue.latitude, venue.longitude) == (0.0, 0.0)
+    
     def test_delete_venue(self, client, app, sample_venue):
         """Test delete venue."""
         with app.app_context():
@@ -146,6 +288,33 @@ class TestVenueController:
             assert len(data) == 1
             assert data[0]['name'] == 'Test Venue'
     
+    def test_api_nearby_venues(self, client, app):
+        """Test nearby venue search by distance."""
+        with app.app_context():
+            db.session.add_all([
+                Venue(name='SF Venue', city='San Francisco', state='CA', address='1 Market St',
+                      latitude=37.7749, longitude=-122.4194),
+                Venue(name='Oakland Venue', city='Oakland', state='CA', address='1 Broadway',
+                      latitude=37.8044, longitude=-122.2712),
+                Venue(name='LA Venue', city='Los Angeles', state='CA', address='1 Sunset Blvd',
+                      latitude=34.0522, longitude=-118.2437),
+                Venue(name='Nowhere Venue', city='San Francisco', state='CA', address='2 Market St'),
+            ])
+            db.session.commit()
+            
+            response = client.get('/venues/api/nearby?lat=37.78&lng=-122.41&radius=25')
+            assert response.status_code == 200
+            data = response.get_json()
+            assert [venue['name'] for venue in data] == ['SF Venue', 'Oakland Venue']
+            assert data[0]['distance_km'] < data[1]['distance_km']
+    
+    def test_api_nearby_venues_invalid_params(self, client, app):
+        """Test nearby venue search parameter validation."""
+        with app.app_context():
+            assert client.get('/venues/api/nearby?lat=37.78').status_code == 400
+            assert client.get('/venues/api/nearby?lat=99&lng=0').status_code == 400
+            assert client.get('/venues/api/nearby?lat=0&lng=0&radius=5000').status_code == 400
+    
     def test_api_show_venue(self, client, app, sample_venue):
         """Test API show venue."""
         with app.app_context():
@@ -271,6 +440,61 @@ class TestArtistController:
             assert len(data) == 1
             assert data[0]['name'] == 'Test Artist'
     
+    def test_api_list_artists_genre_filter(self, client, app):
+        """Test API list artists filtered by genre."""
+        with app.app_context():
+            jazz = Genre(name='Jazz')
+            artist = Artist(name='Jazz Artist', city='Test City', state='TC')
+            artist.genres = [jazz]
+            db.session.add_all([jazz, artist])
+            db.session.commit()
+            
+            response = client.get('/artists/api?genre=Jazz&genre=Blues')
+            assert [item['name'] for item in response.get_json()] == ['Jazz Artist']
+            
+            response = client.get('/artists/api?genre=Jazz&genre=Blues&match=all')
+            assert response.get_json() == []
+    
+    def test_api_list_artists_ndjson(self, client, app):
+        """Test NDJSON streaming yields the same artists as the JSON array."""
+        with app.app_context():
+            jazz = Genre(name='Jazz')
+            db.session.add_all([
+                Artist(name='Jazz Artist', city='Test City', state='TC', genres=[jazz]),
+                Artist(name='Plain Artist', city='Test City', state='TC')
+            ])
+            db.session.commit()
+            
+            response = client.get('/artists/api', headers={'Accept': 'application/x-ndjson'})
+            assert response.status_code == 200
+            assert response.is_streamed
+            assert response.mimetype == 'application/x-ndjson'
+            assert 'Accept' in response.headers['Vary']
+            lines = [json.loads(line) for line in response.data.splitlines()]
+            assert lines == client.get('/artists/api').get_json()
+            
+            response = client.get('/artists/api?genre=Jazz', headers={'Accept': 'application/x-ndjson'})
+            assert [json.loads(line)['name'] for line in response.data.splitlines()] == ['Jazz Artist']
+    
+    def test_api_artists_sparse_fields(self, client, app):
+        """Test ?fields= returns only the requested keys and rejects unknown ones."""
+        with app.app_context():
+            rock = Genre(name='Rock')
+            artist = Artist(name='Sparse Artist', city='Test City', state='TC', genres=[rock])
+            db.session.add(artist)
+            db.session.commit()
+            
+            response = client.get('/artists/api?fields=id,name&fields=genres')
+            assert response.status_code == 200
+            assert response.get_json() == [{'id': artist.id, 'name': 'Sparse Artist', 'genres': ['Rock']}]
+            
+            response = client.get(f'/artists/api/{artist.id}?fields=name,upcoming_shows_count')
+            assert response.get_json() == {'name': 'Sparse Artist', 'upcoming_shows_count': 0}
+            
+            response = client.get('/artists/api?fields=name,password')
+            assert response.status_code == 400
+            assert 'password' in response.get_json()['error']
+    
     def test_api_show_artist(self, client, app, sample_artist):
         """Test API show artist."""
         with app.app_context():
@@ -282,6 +506,32 @@ class TestArtistController:
             assert data['city'] == 'Test City'
             assert data['state'] == 'TC'
     
+    def test_api_show_artist_last_modified(self, client, app):
+        """Test Last-Modified on the artist API and page, and If-Modified-Since answered with 304."""
+        with app.app_context():
+            an_hour_ago = datetime.utcnow() - timedelta(hours=1)
+            artist = Artist(name='Dated Artist', city='Test City', state='TC', created_at=an_hour_ago)
+            venue = Venue(name='Dated Venue', city='Test City', state='TC', address='1 Main St',
+                          created_at=an_hour_ago)
+            db.session.add_all([artist, venue])
+            db.session.commit()
+            artist_id, venue_id = artist.id, venue.id
+            
+            response = client.get(f'/artists/api/{artist_id}')
+            stamp = response.headers['Last-Modified']
+            assert response.last_modified == an_hour_ago.replace(microsecond=0, tzinfo=timezone.utc)
+            for path in (f'/artists/api/{artist_id}', f'/artists/{artist_id}'):
+                response = client.get(path, headers={'If-Modified-Since': stamp})
+                assert response.status_code == 304
+            
+            # A new show changes the page; the change is too recent to vouch for with a date
+            db.session.add(Show(artist_id=artist_id, venue_id=venue_id, start_time=datetime.utcnow() + timedelta(days=1)))
+            db.session.commit()
+            response = client.get(f'/artists/api/{artist_id}', headers={'If-Modified-Since': stamp})
+            assert response.status_code == 200
+            assert response.get_json()['num_upcoming_shows'] == 1
+            assert 'Last-Modified' not in response.headers
+    
     def test_api_show_artist_not_found(self, client, app):
         """Test API show artist not found."""
         with app.app_context():
@@ -292,6 +542,68 @@ class TestArtistController:
 class TestShowController:
     """Test cases for show controller."""
     
+    def test_api_list_shows_ndjson(self, client, app):
+        """Test shows stream one JSON document per line."""
+        with app.app_context():
+            artist = Artist(name='Streaming Artist', city='Test City', state='TC')
+            venue = Venue(name='Streaming Venue', city='Test City', state='TC', address='1 Main St')
+            db.session.add_all([artist, venue])
+            db.session.flush()
+            db.session.add_all([
+                Show(artist_id=artist.id, venue_id=venue.id, start_time=datetime(2030, 1, day))
+                for day in range(1, 4)
+            ])
+            db.session.commit()
+            
+            response = client.get('/shows/api', headers={'Accept': 'application/x-ndjson'})
+            lines = [json.loads(line) for line in response.data.splitlines()]
+            assert [line['start_time'] for line in lines] == [f'2030-01-0{day}T00:00:00' for day in range(1, 4)]
+            assert lines[0]['venue_name'] == 'Streaming Venue'
+    
+    def test_api_list_shows_columnar(self, client, app):
+        """Test the columnar encoding decodes to the default rows and dedupes artists and venues."""
+        with app.app_context():
+            artists = [Artist(name=f'Columnar Artist {i}', city='Test City', state='TC',
+                              image_link=f'https://example.com/a{i}.jpg') for i in range(2)]
+            venue = Venue(name='Columnar Venue', city='Test City', state='TC', address='1 Main St')
+            db.session.add_all([*artists, venue])
+            db.session.flush()
+            db.session.add_all([
+                Show(artist_id=artists[day % 2].id, venue_id=venue.id, start_time=datetime(2030, 1, day + 1))
+                for day in range(5)
+            ])
+            db.session.commit()
+            
+            rows = sorted(client.get('/shows/api').get_json(), key=lambda row: row['id'])
+            response = client.get('/shows/api?format=columnar')
+            assert response.mimetype == 'application/vnd.fyyur.columnar+json'
+            document = response.get_json()
+            assert decode_columnar(document) == rows
+            assert len(document['artists']['id']) == 2
+            assert len(document['venues']['id']) == 1
+            
+            response = client.get('/shows/api', headers={'Accept': 'application/vnd.fyyur.columnar+json'})
+            assert decode_columnar(response.get_json()) == rows
+            assert client.get('/shows/api?format=columnar&fields=id').status_code == 400
+    
+    def test_api_shows_sparse_fields(self, client, app):
+        """Test show field selection reaches through to the artist and venue names."""
+        with app.app_context():
+            artist = Artist(name='Sparse Artist', city='Test City', state='TC')
+            venue = Venue(name='Sparse Venue', city='Test City', state='TC', address='1 Main St')
+            db.session.add_all([artist, venue])
+            db.session.flush()
+            show = Show(artist_id=artist.id, venue_id=venue.id, start_time=datetime(2030, 1, 1))
+            db.session.add(show)
+            db.session.commit()
+            
+            response = client.get('/shows/api?fields=artist_name,start_time')
+            assert response.get_json() == [{'artist_name': 'Sparse Artist', 'start_time': '2030-01-01T00:00:00'}]
+            
+            response = client.get(f'/shows/api/{show.id}?fields=venue_name')
+            assert response.get_json() == {'venue_name': 'Sparse Venue'}
+            assert client.get('/shows/api/upcoming?fields=nope').status_code == 400
+    
     def test_index(self, client, app, sample_show):
         """Test show index page."""
         with app.app_context():
@@ -367,6 +679,21 @@ class TestShowController:
             assert data['artist_id'] == sample_show.artist_id
             assert data['venue_id'] == sample_show.venue_id
     
+    def test_api_show_past_show(self, client, app):
+        """Test a show that already happened is still served."""
+        with app.app_context():
+            artist = Artist(name='Past Artist', city='Test City', state='TC')
+            venue = Venue(name='Past Venue', city='Test City', state='TC', address='1 Main St')
+            db.session.add_all([artist, venue])
+            db.session.flush()
+            show = Show(artist_id=artist.id, venue_id=venue.id, start_time=datetime(2020, 1, 1))
+            db.session.add(show)
+            db.session.commit()
+            
+            response = client.get(f'/shows/api/{show.id}')
+            assert response.status_code == 200
+            assert response.get_json()['start_time'] == '2020-01-01T00:00:00'
+    
     def test_api_show_show_not_found(self, client, app):
         """Test API show show not found."""
         with app.app_context():
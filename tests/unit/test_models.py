@@ -3,6 +3,7 @@ Unit tests for models.
 """
 import pytest  # pyright: ignore[reportMissingImports]
 from datetime import datetime, timedelta
+from app.utils.genres import genre_mask
 from app.models import db, Venue, Artist, Show, Genre
 from app.exceptions import DatabaseException
 
@@ -207,6 +208,23 @@ class TestArtistModel:
             assert any(genre.name == 'Rock' for genre in sample_artist.genres)
             assert any(genre.name == 'Jazz' for genre in sample_artist.genres)
     
+    def test_artist_genre_mask_sync(self, app):
+        """Test genre_mask follows additions and removals of genres."""
+        with app.app_context():
+            jazz = Genre(name='Jazz')
+            blues = Genre(name='Blues')
+            db.session.add_all([jazz, blues])
+            
+            artist = Artist(name='Mask Artist', city='Test City', state='TC')
+            artist.genres = [jazz, blues]
+            db.session.add(artist)
+            db.session.commit()
+            assert artist.genre_mask == genre_mask(['Jazz', 'Blues'])
+            
+            artist.genres.remove(jazz)
+            db.session.commit()
+            assert artist.genre_mask == genre_mask(['Blues'])
+    
     def test_artist_shows_relationship(self, app, sample_artist, sample_show):
         """Test artist shows relationship."""
         with app.app_context():
@@ -3,7 +3,7 @@ Unit tests for repositories.
 """
 import pytest
 from datetime import datetime, timedelta
-from app.models import db, Venue, Artist, Show, Genre
+from app.models import db, Venue, Artist, Show, Genre, ChangeLogEntry
 from app.repositories import VenueRepository, ArtistRepository, ShowRepository, GenreRepository
 from app.exceptions import DatabaseException, DuplicateVenueException, DuplicateArtistException
 
@@ -77,6 +77,49 @@ class TestVenueRepository:
             
             with pytest.raises(DuplicateVenueException):
                 venue_repository.create_with_genres(venue_data, genres)
+    
+    def test_lookup_keys_are_case_and_whitespace_insensitive(self, app, venue_repository, sample_venue):
+        """Test that name/city lookups match on normalized keys."""
+        with app.app_context():
+            venue = venue_repository.get_by_name_and_city('  test   VENUE ', 'TEST city')
+            assert venue is not None
+            assert venue.name == 'Test Venue'
+            
+            venues = venue_repository.get_by_city_state('test  city', 'tc')
+            assert len(venues) == 1
+    
+    def test_get_by_genres(self, app, venue_repository):
+        """Test bitmask genre filtering with OR and AND semantics."""
+        with app.app_context():
+            jazz = Genre(name='Jazz')
+            blues = Genre(name='Blues')
+            jazz_club = Venue(name='Jazz Club', city='Test City', state='TC', address='1 Main St')
+            jazz_club.genres = [jazz]
+            blues_bar = Venue(name='Blues Bar', city='Test City', state='TC', address='2 Main St')
+            blues_bar.genres = [jazz, blues]
+            db.session.add_all([jazz, blues, jazz_club, blues_bar])
+            db.session.commit()
+            
+            any_match = venue_repository.get_by_genres(['Jazz', 'Blues'])
+            assert {venue.name for venue in any_match} == {'Jazz Club', 'Blues Bar'}
+            
+            all_match = venue_repository.get_by_genres(['Jazz', 'Blues'], match_all=True)
+            assert [venue.name for venue in all_match] == ['Blues Bar']
+            
+            assert venue_repository.get_by_genres(['Jazz', 'Rock'], match_all=True) == []
+    
+    def test_duplicate_venue_detection_ignores_case(self, app, venue_repository, sample_venue):
+        """Test that a differently-cased venue name is still a duplicate."""
+        with app.app_context():
+            venue_data = {
+                'name': 'TEST VENUE',
+                'city': 'test city',
+                'state': 'TC',
+                'address': '123 Test St'
+            }
+            
+            with pytest.raises(DuplicateVenueException):
+                venue_repository.create_with_genres(venue_data, ['Rock'])
 
 
 class TestArtistRepository:
@@ -146,6 +189,17 @@ class TestArtistRepository:
             
             with pytest.raises(DuplicateArtistException):
                 artist_repository.create_with_genres(artist_data, genres)
+    
+    def test_lookup_keys_follow_updates(self, app, artist_repository, sample_artist):
+        """Test that normalized keys are maintained when fields change."""
+        with app.app_context():
+            artist_id = artist_repository.get_by_name_and_city('Test Artist', 'Test City').id
+            artist_repository.update_with_genres(artist_id, {'city': 'New   York'})
+            
+            artist = artist_repository.get_by_name_and_city('test artist', 'new york')
+            assert artist is not None
+            assert artist.city_key == 'new york'
+            assert artist_repository.get_by_name_and_city('Test Artist', 'Test City') is None
 
 
 class TestShowRepository:
@@ -232,6 +286,95 @@ class TestShowRepository:
             assert stats['total_shows'] == 1
             assert stats['upcoming_shows'] == 1
             assert stats['past_shows'] == 0
+    
+    def test_show_aggregates_follow_writes(self, app):
+        """Test artist and venue aggregates are refreshed when shows are flushed."""
+        with app.app_context():
+            artist = Artist(name='Aggregate Artist', city='Test City', state='TC')
+            venue = Venue(name='Aggregate Venue', city='Test City', state='TC', address='1 Main St')
+            db.session.add_all([artist, venue])
+            db.session.commit()
+            
+            start_time = datetime.utcnow() + timedelta(days=1)
+            show = Show(artist_id=artist.id, venue_id=venue.id, start_time=start_time)
+            db.session.add(show)
+            db.session.commit()
+            
+            assert artist.num_upcoming_shows == 1
+            assert artist.next_show_at == start_time
+            assert venue.num_upcoming_shows == 1
+            
+            db.session.delete(show)
+            db.session.commit()
+            
+            assert artist.num_upcoming_shows == 0
+            assert artist.next_show_at is None
+    
+    def test_sweep_aggregates_moves_started_shows_to_past(self, app, show_repository):
+        """Test the sweep recounts entities whose next show has started."""
+        with app.app_context():
+            artist = Artist(name='Sweep Artist', city='Test City', state='TC')
+            venue = Venue(name='Sweep Venue', city='Test City', state='TC', address='1 Main St')
+            db.session.add_all([artist, venue])
+            db.session.commit()
+            start_time = datetime.utcnow() + timedelta(days=1)
+            db.session.add(Show(artist_id=artist.id, venue_id=venue.id, start_time=start_time))
+            db.session.commit()
+            
+            assert show_repository.sweep_aggregates() == (set(), set())
+            assert show_repository.sweep_aggregates(now=start_time + timedelta(hours=1)) == ({artist.id}, {venue.id})
+            
+            assert artist.num_upcoming_shows == 0
+            assert artist.num_past_shows == 1
+            assert artist.next_show_at is None
+            assert artist.last_show_at == start_time
+    
+    def test_change_log_follows_writes(self, app):
+        """Test flushes log one compacted row per entity, with tombstones for deletes."""
+        with app.app_context():
+            def log():
+                return [(entry.kind, entry.entity_id, entry.operation)
+                        for entry in ChangeLogEntry.query.order_by(ChangeLogEntry.seq)]
+            
+            artist = Artist(name='Logged Artist', city='Test City', state='TC')
+            venue = Venue(name='Logged Venue', city='Test City', state='TC', address='1 Main St')
+            db.session.add_all([artist, venue])
+            db.session.flush()
+            artist.phone = '123-456-7890'
+            db.session.commit()
+            assert sorted(log()) == [('artists', artist.id, 'created'), ('venues', venue.id, 'created')]
+            
+            show = Show(artist_id=artist.id, venue_id=venue.id, start_time=datetime.utcnow() + timedelta(days=1))
+            db.session.add(show)
+            db.session.commit()
+            assert log() == [('artists', artist.id, 'updated'), ('shows', show.id, 'created'),
+                             ('venues', venue.id, 'updated')]
+            
+            artist.name = 'Rolled Back'
+            db.session.flush()
+            db.session.rollback()
+            assert len(log()) == 3
+            
+            artist_id, show_id = artist.id, show.id
+            db.session.delete(artist)
+            db.session.commit()
+            assert log()[-3:] == [('artists', artist_id, 'deleted'), ('shows', show_id, 'deleted'),
+                                  ('venues', venue.id, 'updated')]
+            assert len(log()) == 3
+    
+    def test_list_counts_read_aggregates(self, app, artist_repository, venue_repository):
+        """Test list queries read the materialized counts."""
+        with app.app_context():
+            artist = Artist(name='Listed Artist', city='Test City', state='TC')
+            venue = Venue(name='Listed Venue', city='Test City', state='TC', address='1 Main St')
+            db.session.add_all([artist, venue])
+            db.session.commit()
+            db.session.add(Show(artist_id=artist.id, venue_id=venue.id,
+                                start_time=datetime.utcnow() + timedelta(days=1)))
+            db.session.commit()
+            
+            assert artist_repository.get_all_with_counts()[0]['num_upcoming_shows'] == 1
+            assert venue_repository.get_all_with_counts()[0]['num_upcoming_shows'] == 1
 
 
 class TestGenreRepository:
@@ -7,7 +7,7 @@ from pydantic import ValidationError
 from app.schemas import (
     VenueCreate, VenueUpdate, VenueResponse, VenueListItem, VenueSearchResponse,
     ArtistCreate, ArtistUpdate, ArtistResponse, ArtistListItem, ArtistSearchResponse,
-    ShowCreate, ShowResponse, ShowListItem,
+    ShowCreate, ShowResponse, ShowListItem, ShowSummary,
     BaseSchema, TimestampMixin
 )
 
@@ -457,6 +457,37 @@ class TestShowSchemas:
         assert item.start_time == start_time
 
 
+class TestReadSchemas:
+    """Test cases for read-side response schemas."""
+    
+    def test_show_response_accepts_past_shows(self):
+        """Test historical shows are valid responses (only ShowCreate requires a future time)."""
+        now = datetime.utcnow()
+        show = ShowResponse(
+            id=1, artist_id=1, artist_name='Test Artist', venue_id=1, venue_name='Test Venue',
+            start_time=now - timedelta(days=30), created_at=now
+        )
+        assert show.start_time < now
+    
+    def test_read_models_take_stored_values(self):
+        """Test responses carry stored values as-is, without the write-side rules."""
+        now = datetime.utcnow()
+        artist = ArtistResponse(
+            id=1, name='Test Artist', city='Test City', state='TC', genres=['Not A Whitelisted Genre'],
+            website_link='https://testartist.com', created_at=now,
+            upcoming_shows=[{
+                'artist_id': 1, 'artist_name': 'Test Artist', 'venue_id': 2, 'venue_name': 'Test Venue',
+                'start_time': now
+            }]
+        )
+        assert artist.genres == ['Not A Whitelisted Genre']
+        assert isinstance(artist.upcoming_shows[0], ShowSummary)
+        
+        data = artist.model_dump(mode='json')
+        assert data['website_link'] == 'https://testartist.com'
+        assert data['upcoming_shows'][0]['start_time'] == now.isoformat()
+
+
 class TestSchemaValidation:
     """Test cases for schema validation."""
     
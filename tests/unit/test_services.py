@@ -102,6 +102,18 @@ class TestVenueService:
             assert areas[0]['city'] == 'Test City'
             assert areas[0]['state'] == 'TC'
     
+    def test_get_areas_groups_case_variants(self, app, venue_service, sample_venue):
+        """Test that city spellings differing only in case form one area."""
+        with app.app_context():
+            venue = Venue(name='Other Venue', city='TEST  CITY', state='TC', address='1 Main St')
+            db.session.add(venue)
+            db.session.commit()
+            
+            areas = venue_service.get_areas()
+            assert len(areas) == 1
+            assert areas[0]['venues'] == 2
+            assert len(venue_service.get_venues_by_area(areas[0]['city'], areas[0]['state'])) == 2
+    
     def test_delete_venue(self, app, venue_service, sample_venue):
         """Test deleting a venue."""
         with app.app_context():
@@ -201,6 +213,21 @@ class TestArtistService:
             assert len(artists) == 1
             assert artists[0].name == 'Test Artist'
     
+    def test_get_artists_by_genres(self, app, artist_service):
+        """Test filtering artists by genre through their genre masks."""
+        with app.app_context():
+            jazz = Genre(name='Jazz')
+            pop = Genre(name='Pop')
+            jazz_artist = Artist(name='Jazz Artist', city='Test City', state='TC')
+            jazz_artist.genres = [jazz]
+            pop_artist = Artist(name='Pop Artist', city='Test City', state='TC')
+            pop_artist.genres = [pop]
+            db.session.add_all([jazz, pop, jazz_artist, pop_artist])
+            db.session.commit()
+            
+            filtered = artist_service.get_artists_by_genres(['Jazz'])
+            assert [artist.name for artist in filtered] == ['Jazz Artist']
+    
     def test_get_artists_with_counts(self, app, artist_service, sample_artist):
         """Test getting artists with counts."""
         with app.app_context():
@@ -1,12 +1,15 @@
 """
 Unit tests for utilities.
 """
+import io
 import pytest
 from datetime import datetime, timedelta
+from app.utils.geo import grid_cell, grid_cell_ranges, haversine_km, haversine_many_km
 from app.utils import (
     validate_phone, validate_state_code, validate_genres,
-    format_datetime, format_phone, format_address,
-    VALID_GENRES, VALID_STATES, DEFAULT_PAGE_SIZE
+    format_datetime, format_phone, format_address, normalize_key,
+    VALID_GENRES, VALID_STATES, DEFAULT_PAGE_SIZE,
+    genre_mask, genres_from_mask
 )
 
 
@@ -184,6 +187,267 @@ class TestFormatters:
         
         result = format_address('Los Angeles', 'CA')
         assert result == 'Los Angeles, CA'
+    
+    def test_normalize_key(self):
+        """Test lookup key normalization."""
+        assert normalize_key('San Francisco') == 'san francisco'
+        assert normalize_key('  San   Francisco ') == 'san francisco'
+        assert normalize_key('CA') == 'ca'
+        assert normalize_key(None) is None
+
+
+class TestGenreMask:
+    """Test cases for genre bitmask helpers."""
+    
+    def test_genre_mask_round_trip(self):
+        """Test converting genre names to a mask and back."""
+        mask = genre_mask(['Jazz', 'Blues'])
+        assert mask != 0
+        assert sorted(genres_from_mask(mask)) == ['Blues', 'Jazz']
+    
+    def test_genre_mask_covers_valid_genres(self):
+        """Test every valid genre has its own bit and unknown genres have none."""
+        assert genre_mask(VALID_GENRES) == (1 << len(VALID_GENRES)) - 1
+        assert genre_mask(['Rock']) == 0
+
+
+class TestGeo:
+    """Test cases for geospatial helpers."""
+    
+    def test_haversine_known_distance(self):
+        """Test San Francisco to Los Angeles is about 559 km."""
+        distance = haversine_km(37.7749, -122.4194, 34.0522, -118.2437)
+        assert 555 < distance < 565
+        assert haversine_many_km(37.7749, -122.4194, [(37.7749, -122.4194)]) == [0.0]
+    
+    def test_grid_cell_requires_both_coordinates(self):
+        """Test grid cell is None without a full coordinate."""
+        assert grid_cell(None, -122.4) is None
+        assert grid_cell(37.7, None) is None
+        assert grid_cell(37.7749, -122.4194) == grid_cell(37.7701, -122.4101)
+    
+    def test_grid_cell_ranges_cover_nearby_points(self):
+        """Test the covering ranges include cells of points inside the radius."""
+        ranges = grid_cell_ranges(37.7749, -122.4194, 20)
+        oakland = grid_cell(37.8044, -122.2712)
+        assert any(first <= oakland <= last for first, last in ranges)
+        
+        los_angeles = grid_cell(34.0522, -118.2437)
+        assert not any(first <= los_angeles <= last for first, last in ranges)
+    
+    def test_grid_cell_ranges_wrap_antimeridian(self):
+        """Test searches crossing the antimeridian cover both sides."""
+        ranges = grid_cell_ranges(0.0, 179.99, 50)
+        east = grid_cell(0.0, -179.9)
+        west = grid_cell(0.0, 179.9)
+        assert any(first <= east <= last for first, last in ranges)
+        assert any(first <= west <= last for first, last in ranges)
+
+
+class TestFastJSONProvider:
+    """Test cases for the JSON provider."""
+    
+    @pytest.fixture(params=[True, False], ids=['orjson', 'stdlib'])
+    def provider(self, request, app):
+        from app.utils.json_provider import FastJSONProvider, orjson
+        if request.param and orjson is None:
+            pytest.skip('orjson not installed')
+        return FastJSONProvider(app, use_orjson=request.param)
+    
+    def test_encodes_datetimes_urls_and_models(self, provider):
+        """Test datetimes, Pydantic URLs and models are encoded natively."""
+        from pydantic import BaseModel, HttpUrl
+        
+        class Link(BaseModel):
+            url: HttpUrl
+        
+        link = Link(url='https://example.com/a')
+        payload = {'b': datetime(2026, 1, 2, 3, 4, 5), 'a': link.url, 'model': link}
+        assert provider.dumps(payload) == (
+            '{"b":"2026-01-02T03:04:05","a":"https://example.com/a","model":{"url":"https://example.com/a"}}'
+        )
+    
+    def test_backends_produce_identical_responses(self, app):
+        """Test orjson and the stdlib fallback write the same bytes."""
+        from app.utils.json_provider import FastJSONProvider, orjson
+        if orjson is None:
+            pytest.skip('orjson not installed')
+        
+        payload = [{'id': 1, 'name': 'Café', 'when': datetime(2026, 1, 2), 'tags': None, 2: 'x'}]
+        with app.app_context():
+            fast = FastJSONProvider(app).response(payload).get_data()
+            fallback = FastJSONProvider(app, use_orjson=False).response(payload).get_data()
+        assert fast == fallback
+        assert FastJSONProvider(app).loads(fast) == [
+            {'id': 1, 'name': 'Café', 'when': '2026-01-02T00:00:00', 'tags': None, '2': 'x'}
+        ]
+    
+    def test_app_uses_provider(self, app):
+        """Test jsonify goes through the fast provider."""
+        from flask import jsonify
+        from app.utils.json_provider import FastJSONProvider
+        
+        assert isinstance(app.json, FastJSONProvider)
+        with app.app_context():
+            assert jsonify(when=datetime(2026, 1, 2)).get_json() == {'when': '2026-01-02T00:00:00'}
+
+
+class TestMessagePack:
+    """Test cases for MessagePack negotiation."""
+    
+    @pytest.fixture(autouse=True)
+    def require_msgpack(self):
+        from app.utils.json_provider import msgpack
+        if msgpack is None:
+            pytest.skip('msgpack not installed')
+    
+    def test_packs_datetimes_as_timestamps(self, app):
+        """Test the msgpack encoder shares the JSON conversions but keeps datetimes as timestamps."""
+        import msgpack
+        from datetime import timezone
+        from pydantic import BaseModel, HttpUrl
+        
+        class Link(BaseModel):
+            url: HttpUrl
+            seen: datetime
+        
+        payload = {'when': datetime(2026, 1, 2, 3, 4, 5), 'link': Link(url='https://example.com/a', seen=datetime(2026, 1, 1))}
+        decoded = msgpack.unpackb(app.json.packb(payload), timestamp=3)
+        assert decoded == {
+            'when': datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+            'link': {'url': 'https://example.com/a', 'seen': datetime(2026, 1, 1, tzinfo=timezone.utc)}
+        }
+    
+    def test_negotiates_through_accept(self, client, app):
+        """Test jsonify answers in MessagePack only for clients preferring it."""
+        import msgpack
+        from app.models import db, Artist
+        with app.app_context():
+            db.session.add(Artist(name='Packed Artist', city='Test City', state='TC'))
+            db.session.commit()
+            
+            json_response = client.get('/artists/api')
+            assert json_response.mimetype == 'application/json'
+            assert 'Accept' in json_response.headers['Vary']
+            
+            response = client.get('/artists/api', headers={'Accept': 'application/msgpack'})
+            assert response.mimetype == 'application/msgpack'
+            rows = msgpack.unpackb(response.data, timestamp=3)
+            expected = json_response.get_json()
+            assert [row['name'] for row in rows] == [row['name'] for row in expected]
+            assert rows[0]['created_at'].replace(tzinfo=None).isoformat() == expected[0]['created_at']
+            
+            response = client.get('/artists/api/999', headers={'Accept': 'application/msgpack'})
+            assert response.status_code == 404
+            assert msgpack.unpackb(response.data) == {'error': 'Artist with ID 999 not found'}
+
+
+class TestCompression:
+    """Test cases for the response compression middleware."""
+    
+    @pytest.fixture
+    def compressed_app(self, app):
+        from app.utils import init_compression
+        app.config['COMPRESSION_ENABLED'] = True
+        app.config['COMPRESSION_MIN_SIZE'] = 200
+        init_compression(app)
+        return app
+    
+    def _shows(self, count):
+        from app.models import db, Artist, Venue, Show
+        artist = Artist(name='Compressed Artist', city='Test City', state='TC')
+        venue = Venue(name='Compressed Venue', city='Test City', state='TC', address='1 Main St')
+        db.session.add_all([artist, venue])
+        db.session.flush()
+        db.session.add_all([
+            Show(artist_id=artist.id, venue_id=venue.id, start_time=datetime(2030, 1, 1) + timedelta(days=day))
+            for day in range(count)
+        ])
+        db.session.commit()
+    
+    def test_negotiates_gzip_above_threshold(self, client, compressed_app):
+        """Test large JSON is gzipped for clients that accept it, and only for them."""
+        import gzip
+        with compressed_app.app_context():
+            self._shows(20)
+            plain = client.get('/shows/api')
+            assert 'Content-Encoding' not in plain.headers
+            assert 'Accept-Encoding' in plain.headers['Vary']
+            
+            response = client.get('/shows/api', headers={'Accept-Encoding': 'gzip, deflate'})
+            assert response.headers['Content-Encoding'] == 'gzip'
+            assert gzip.decompress(response.data) == plain.data
+            assert len(response.data) < len(plain.data)
+            
+            assert 'Content-Encoding' not in client.get(
+                '/shows/api', headers={'Accept-Encoding': 'gzip;q=0.5, identity'}
+            ).headers
+    
+    def test_small_and_binary_bodies_pass_through(self, client, compressed_app):
+        """Test bodies under the threshold and non-compressible types are not encoded."""
+        with compressed_app.app_context():
+            response = client.get('/api/stats', headers={'Accept-Encoding': 'gzip'})
+            assert len(response.data) < 200
+            assert 'Content-Encoding' not in response.headers
+            
+            response = client.get('/static/ico/favicon.png', headers={'Accept-Encoding': 'gzip'})
+            assert response.status_code == 200
+            assert 'Content-Encoding' not in response.headers
+    
+    def test_streams_ndjson_compressed(self, client, compressed_app):
+        """Test NDJSON streams are encoded chunk by chunk."""
+        import zlib
+        with compressed_app.app_context():
+            self._shows(3)
+            response = client.get('/shows/api', headers={
+                'Accept': 'application/x-ndjson', 'Accept-Encoding': 'gzip'
+            })
+            assert response.is_streamed
+            assert response.headers['Content-Encoding'] == 'gzip'
+            lines = zlib.decompress(response.data, 16 + zlib.MAX_WBITS).splitlines()
+            assert len(lines) == 3
+    
+    def test_encoded_responses_carry_weak_etags(self, client, compressed_app):
+        """Test compressed static files revalidate with their weak ETag."""
+        with compressed_app.app_context():
+            response = client.get('/static/css/main.css', headers={'Accept-Encoding': 'gzip'})
+            assert response.headers['Content-Encoding'] == 'gzip'
+            etag = response.headers['ETag']
+            assert etag.startswith('W/')
+            
+            response = client.get('/static/css/main.css', headers={'Accept-Encoding': 'gzip', 'If-None-Match': etag})
+            assert response.status_code == 304
+
+
+class TestIngest:
+    """Test cases for the streaming NDJSON/CSV import readers."""
+    
+    def test_ndjson_records(self):
+        """Test NDJSON lines are parsed one by one, across read blocks."""
+        from app.utils.ingest import iter_lines, iter_records
+        body = b'\xef\xbb\xbf{"name": "A\xc3\xa7a\xc3\xad"}\n\n[1]\n{oops\n{"name": "B"}'
+        
+        assert list(iter_lines(io.BytesIO(body), block_size=3)) == list(iter_lines(io.BytesIO(body)))
+        records = list(iter_records(io.BytesIO(body), 'ndjson'))
+        assert [(line, row) for line, row, _ in records] == [
+            (1, {'name': 'Açaí'}), (3, None), (4, None), (5, {'name': 'B'})
+        ]
+        assert records[1][2] == 'Expected a JSON object'
+        assert records[2][2].startswith('Invalid JSON')
+    
+    def test_csv_records(self):
+        """Test CSV rows keep their starting line, drop empty cells and split genres."""
+        from app.utils.ingest import iter_records
+        body = b'name,address,genres,phone\nA,"Rua\n2",Jazz; Pop,\n\nB,x\nC,Rua 3,Rock n Roll,123-456-7890\n'
+        
+        records = list(iter_records(io.BytesIO(body), 'csv'))
+        assert records == [
+            (2, {'name': 'A', 'address': 'Rua\n2', 'genres': ['Jazz', 'Pop']}, None),
+            (5, None, 'Expected 4 columns, got 2'),
+            (6, {'name': 'C', 'address': 'Rua 3', 'genres': ['Rock n Roll'], 'phone': '123-456-7890'}, None),
+        ]
+        with pytest.raises(ValueError):
+            iter_records(io.BytesIO(body), 'xml')
 
 
 class TestConstants: